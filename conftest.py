@@ -0,0 +1,10 @@
+import pytest
+from django.core.cache import caches
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # Cached choice lists must not leak between rolled back test cases
+    for cache in caches.all():
+        cache.clear()
+    yield
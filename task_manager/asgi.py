@@ -3,6 +3,9 @@ ASGI config for task_manager project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+The ASGI application serves the read-heavy pages with async views, see
+task_manager/urls_async.py, and opens a database connection per request.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -12,5 +15,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_manager.settings')
+os.environ.setdefault('ROOT_URLCONF', 'task_manager.urls_async')
+os.environ.setdefault('CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
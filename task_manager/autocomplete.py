@@ -0,0 +1,141 @@
+"""
+Server-side autocomplete.
+
+Lists of users and labels can grow to thousands of rows: instead of
+shipping all of them in every ``<select>``, the widgets below render
+only the selected options and the page fetches the rest from an
+``AutocompleteView`` as the user types.
+"""
+from django import forms
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.http import JsonResponse
+from django.views import View
+
+AUTOCOMPLETE_LIMIT = 20
+# Longer terms cannot match anything shorter than the columns anyway
+MAX_TERM_LENGTH = 150
+
+
+def prefix_q(field, prefix):
+    """
+    ``Q`` of the rows whose ``field`` starts with ``prefix``, ignoring
+    case, on a queryset aliased with ``with_lower()``.
+
+    LIKE cannot use an index on LOWER(field) on SQLite, nor on PostgreSQL
+    outside the C collation, so the prefix is matched as a range of the
+    lowered values that a plain index on the expression answers; the LIKE
+    only keeps the range exact under any collation.
+    """
+    prefix = prefix.lower()
+    lowered = f'{field}_lower'
+    condition = Q(**{
+        f'{lowered}__gte': prefix,
+        f'{lowered}__startswith': prefix,
+    })
+    last = ord(prefix[-1])
+    if last < 0x10FFFF:
+        condition &= Q(**{f'{lowered}__lt': prefix[:-1] + chr(last + 1)})
+    return condition
+
+
+def with_lower(queryset, *fields):
+    """Alias ``LOWER(field)`` of ``fields`` as ``<field>_lower``."""
+    return queryset.alias(**{
+        f'{field}_lower': Lower(field) for field in fields
+    })
+
+
+class AutocompleteView(LoginRequiredMixin, View):
+    """
+    ``{"results": [{"id": ..., "text": ...}], "more": bool}`` with at
+    most ``limit`` objects matching ``?q=``, in ``ordering``.
+    """
+
+    model = None
+    ordering = ['pk']
+    limit = AUTOCOMPLETE_LIMIT
+    use_replica = True
+
+    def get_queryset(self):
+        return self.model._default_manager.order_by(*self.ordering)
+
+    def search(self, queryset, term):
+        """The objects of ``queryset`` matching ``term``; all of them here."""
+        return queryset
+
+    def get_text(self, obj):
+        return str(obj)
+
+    def get(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+        term = request.GET.get('q', '').strip()[:MAX_TERM_LENGTH]
+        if term:
+            queryset = self.search(queryset, term)
+        objects = list(queryset[:self.limit + 1])
+        return JsonResponse({
+            'results': [
+                {'id': obj.pk, 'text': self.get_text(obj)}
+                for obj in objects[:self.limit]
+            ],
+            'more': len(objects) > self.limit,
+        })
+
+
+class AutocompleteMixin:
+    """
+    Render the selected choices only, with the URL the page fetches the
+    others from in ``data-autocomplete-url``.
+    """
+
+    # Objects the field cleaned, rendered without being fetched again
+    validated = ()
+
+    def __init__(self, url, attrs=None):
+        super().__init__(attrs)
+        self.url = url
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['attrs']['data-autocomplete-url'] = str(self.url)
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        choices = self.choices
+        self.choices = list(self.selected_choices(value))
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = choices
+
+    def selected_choices(self, value):
+        # self.choices is the ModelChoiceIterator of the field
+        field = self.choices.field
+        if field.empty_label is not None and not self.allow_multiple_selected:
+            yield ('', field.empty_label)
+        selected = [pk for pk in value if pk not in field.empty_values]
+        if not selected:
+            return
+        validated = {str(obj.pk): obj for obj in self.validated}
+        if all(str(pk) in validated for pk in selected):
+            objects = [validated[str(pk)] for pk in dict.fromkeys(selected)]
+        else:
+            try:
+                objects = list(
+                    self.choices.queryset.filter(pk__in=selected)
+                )
+            except (ValueError, ValidationError):
+                # Invalid data shown back with its error
+                return
+        for obj in objects:
+            yield self.choices.choice(obj)
+
+
+class AutocompleteSelect(AutocompleteMixin, forms.Select):
+    pass
+
+
+class AutocompleteSelectMultiple(AutocompleteMixin, forms.SelectMultiple):
+    pass
@@ -0,0 +1,160 @@
+from urllib.parse import parse_qs, unquote, urlparse
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.exceptions import ImproperlyConfigured
+
+CACHE_NAMESPACES = ('tasks', 'statuses', 'labels', 'users')
+
+BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'db': 'django.core.cache.backends.db.DatabaseCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'rediss': 'django.core.cache.backends.redis.RedisCache',
+    'dummy': 'django.core.cache.backends.dummy.DummyCache',
+}
+
+OPTION_PARAMS = {
+    'max_entries': ('MAX_ENTRIES', int),
+    'cull_frequency': ('CULL_FREQUENCY', int),
+}
+
+_MISSING = object()
+
+
+def parse_cache_url(url):
+    """
+    Build a CACHES entry from a URL, in the spirit of DATABASE_URL:
+
+        locmem://[name]          process local memory
+        file:///var/tmp/cache    directory shared by all local workers
+        db://cache_table         table created by ``createcachetable``
+        redis://host:6379/0      Redis or a compatible server (needs redis)
+        dummy://                 no caching at all
+
+    ``?timeout=``, ``?key_prefix=``, ``?max_entries=`` and
+    ``?cull_frequency=`` are supported by every backend.
+    """
+    parsed = urlparse(url)
+    scheme = parsed.scheme
+    if scheme not in BACKENDS:
+        raise ValueError(f'Unsupported cache URL scheme: {scheme!r}')
+
+    config = {'BACKEND': BACKENDS[scheme]}
+    if scheme in ('redis', 'rediss'):
+        config['LOCATION'] = parsed._replace(query='').geturl()
+    elif scheme == 'file':
+        config['LOCATION'] = unquote(parsed.netloc + parsed.path)
+    elif scheme in ('locmem', 'db'):
+        config['LOCATION'] = unquote(parsed.netloc + parsed.path.lstrip('/'))
+
+    params = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+    if 'timeout' in params:
+        timeout = params['timeout']
+        config['TIMEOUT'] = None if timeout == 'none' else int(timeout)
+    if 'key_prefix' in params:
+        config['KEY_PREFIX'] = params['key_prefix']
+    options = {
+        option: cast(params[param])
+        for param, (option, cast) in OPTION_PARAMS.items()
+        if param in params
+    }
+    if options:
+        config['OPTIONS'] = options
+    return config
+
+
+def check_shared(config, workers):
+    """
+    Refuse a process local cache for several worker processes: the
+    versions bumped by one worker would never reach the others, which
+    would go on serving stale choices and 304 responses.
+    """
+    if workers > 1 and config['BACKEND'] == BACKENDS['locmem']:
+        raise ImproperlyConfigured(
+            f'locmem:// caches are per process, set CACHE_URL to a cache '
+            f'shared by the {workers} workers of WEB_CONCURRENCY'
+        )
+    return config
+
+
+class NamespacedCache:
+    """
+    A view of a cache alias whose keys are prefixed with an app namespace,
+    counting hits and misses per namespace for ``manage.py cache_stats``.
+    """
+
+    def __init__(self, namespace, alias=DEFAULT_CACHE_ALIAS):
+        self.namespace = namespace
+        self.alias = alias
+
+    def __repr__(self):
+        return f'<NamespacedCache {self.namespace!r} on {self.alias!r}>'
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    def make_key(self, key):
+        return f'{self.namespace}:{key}'
+
+    def get(self, key, default=None, version=None):
+        value = self.backend.get(self.make_key(key), _MISSING, version=version)
+        record_access(self.namespace, value is not _MISSING, self.alias)
+        return default if value is _MISSING else value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.backend.set(self.make_key(key), value, timeout, version=version)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.backend.add(
+            self.make_key(key), value, timeout, version=version
+        )
+
+    def delete(self, key, version=None):
+        return self.backend.delete(self.make_key(key), version=version)
+
+    def incr(self, key, delta=1, version=None):
+        return self.backend.incr(self.make_key(key), delta, version=version)
+
+
+def get_cache(namespace):
+    if namespace not in CACHE_NAMESPACES:
+        raise ValueError(f'Unknown cache namespace: {namespace!r}')
+    return NamespacedCache(namespace)
+
+
+def _stats_key(namespace, outcome):
+    return f'cache_stats:{namespace}:{outcome}'
+
+
+def record_access(namespace, hit, alias=DEFAULT_CACHE_ALIAS):
+    if not getattr(settings, 'CACHE_STATS', False):
+        return
+    backend = caches[alias]
+    key = _stats_key(namespace, 'hits' if hit else 'misses')
+    try:
+        backend.incr(key)
+    except ValueError:
+        if not backend.add(key, 1, timeout=None):
+            backend.incr(key)
+
+
+def get_stats(alias=DEFAULT_CACHE_ALIAS):
+    backend = caches[alias]
+    stats = {}
+    for namespace in CACHE_NAMESPACES:
+        hits = backend.get(_stats_key(namespace, 'hits'), 0)
+        misses = backend.get(_stats_key(namespace, 'misses'), 0)
+        stats[namespace] = {'hits': hits, 'misses': misses}
+    return stats
+
+
+def reset_stats(alias=DEFAULT_CACHE_ALIAS):
+    caches[alias].delete_many([
+        _stats_key(namespace, outcome)
+        for namespace in CACHE_NAMESPACES
+        for outcome in ('hits', 'misses')
+    ])
@@ -0,0 +1,48 @@
+SQLITE_PRAGMAS = {
+    # Readers no longer block the writer, nor the writer the readers
+    'journal_mode': 'WAL',
+    # Safe with WAL: a power loss may only lose the last transactions
+    'synchronous': 'NORMAL',
+    # Wait for the write lock instead of failing with "database is locked"
+    'busy_timeout': 5000,
+    'mmap_size': 128 * 1024 * 1024,
+    # Negative: in KiB, per connection
+    'cache_size': -20000,
+    'temp_store': 'MEMORY',
+}
+
+
+def postgresql_options(statement_timeout_ms=None, pool=None):
+    """
+    OPTIONS of a PostgreSQL DATABASES entry. ``pool`` holds arguments of
+    the psycopg ``ConnectionPool`` (``min_size``, ``max_size``,
+    ``timeout``...) and turns pooling on; it needs psycopg 3 and
+    ``CONN_MAX_AGE=0``. Pooled connections are checked on checkout, as
+    Django skips ``CONN_HEALTH_CHECKS`` with a pool. The server aborts
+    statements running longer than ``statement_timeout_ms``.
+    """
+    options = {}
+    if statement_timeout_ms:
+        options['options'] = f'-c statement_timeout={statement_timeout_ms}'
+    if pool:
+        from psycopg_pool import ConnectionPool
+
+        options['pool'] = {'check': ConnectionPool.check_connection, **pool}
+    return options
+
+
+def sqlite_options(**pragmas):
+    """
+    OPTIONS of a SQLite DATABASES entry tuned for several concurrent
+    workers, applied on every new connection. Keyword arguments override
+    the values of ``SQLITE_PRAGMAS``.
+    """
+    pragmas = {**SQLITE_PRAGMAS, **pragmas}
+    return {
+        'init_command': ';'.join(
+            f'PRAGMA {name}={value}' for name, value in pragmas.items()
+        ),
+        # A transaction that reads first and writes later cannot wait for
+        # the write lock, SQLite fails it at once; take the lock upfront
+        'transaction_mode': 'IMMEDIATE',
+    }
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:40
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labels', '0002_label_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='label',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='label_name_lower_idx'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils.translation import gettext_lazy as _
 
 
@@ -13,6 +14,10 @@ class Label(models.Model):
         _('Created at'),
         auto_now_add=True
     )
+    updated_at = models.DateTimeField(
+        _('Updated at'),
+        auto_now=True
+    )
 
     def __str__(self):
         return self.name
@@ -20,4 +25,8 @@ class Label(models.Model):
     class Meta:
         verbose_name = _('Label')
         verbose_name_plural = _('Labels')
-        ordering = ['created_at']
\ No newline at end of file
+        ordering = ['created_at']
+        indexes = [
+            # Case-insensitive prefix search, see task_manager.autocomplete
+            models.Index(Lower('name'), name='label_name_lower_idx'),
+        ]
@@ -3,6 +3,9 @@ from django.test import TestCase
 from django.urls import reverse
 
 from task_manager.labels.models import Label
+from task_manager.labels.views import LabelAutocompleteView
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
 
 User = get_user_model()
 
@@ -101,4 +104,72 @@ class LabelIntegrationTest(TestCase):
             reverse('label_delete', kwargs={'pk': label.pk})
         )
         self.assertEqual(response.status_code, 302)
-        self.assertFalse(Label.objects.filter(pk=label.pk).exists())
\ No newline at end of file
+        self.assertFalse(Label.objects.filter(pk=label.pk).exists())
+
+
+class LabelUsageTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='user', password='pass')
+        status = Status.objects.create(name='New')
+        self.used = Label.objects.create(name='Used')
+        self.unused = Label.objects.create(name='Unused')
+        for index in range(2):
+            task = Task.objects.create(
+                name=f'Task {index}',
+                status=status,
+                author=self.user
+            )
+            task.labels.add(self.used)
+        self.client.force_login(self.user)
+
+    def test_index_shows_task_counts(self):
+        """Тест числа задач по меткам"""
+        response = self.client.get(reverse('labels_index'))
+        counts = {
+            label.name: label.tasks_count
+            for label in response.context['labels']
+        }
+        self.assertEqual(counts, {'Used': 2, 'Unused': 0})
+
+    def test_delete_in_use_uses_annotated_count(self):
+        """Тест отказа в удалении используемой метки без обхода связей"""
+        url = reverse('label_delete', args=[self.used.id])
+        with self.assertNumQueries(3):
+            response = self.client.post(url)
+        self.assertRedirects(response, reverse('labels_index'))
+        self.assertTrue(Label.objects.filter(id=self.used.id).exists())
+
+        self.client.post(reverse('label_delete', args=[self.unused.id]))
+        self.assertFalse(Label.objects.filter(id=self.unused.id).exists())
+
+
+class LabelAutocompleteTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='user')
+        for name in ('bug', 'Backend', 'UI', 'blocker'):
+            Label.objects.create(name=name)
+        self.client.force_login(self.user)
+
+    def autocomplete(self, **params):
+        response = self.client.get(reverse('labels_autocomplete'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_prefix_ignores_case(self):
+        """Тест поиска меток по началу названия без учета регистра"""
+        data = self.autocomplete(q='B')
+        self.assertEqual(
+            [result['text'] for result in data['results']],
+            ['Backend', 'blocker', 'bug']
+        )
+        self.assertFalse(data['more'])
+        data = self.autocomplete(q='bu')
+        self.assertEqual(data['results'], [
+            {'id': Label.objects.get(name='bug').pk, 'text': 'bug'}
+        ])
+
+    def test_search_uses_lower_index(self):
+        """Тест что поиск по началу названия использует индекс"""
+        view = LabelAutocompleteView()
+        labels = view.search(view.get_queryset(), 'Bu')
+        self.assertIn('label_name_lower_idx', labels[:21].explain())
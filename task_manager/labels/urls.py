@@ -7,6 +7,11 @@ from task_manager.labels import views
 urlpatterns = [
     path('', views.LabelListView.as_view(), name='labels_index'),
     path('create/', views.LabelCreateView.as_view(), name='label_create'),
+    path(
+        'autocomplete/',
+        views.LabelAutocompleteView.as_view(),
+        name='labels_autocomplete'
+        ),
     path(
         '<int:pk>/update/',
         views.LabelUpdateView.as_view(),
@@ -1,22 +1,51 @@
-from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
-from django.shortcuts import redirect
+from django.db.models import Count
+from django.db.models.functions import Lower
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
+from task_manager.autocomplete import AutocompleteView, prefix_q, with_lower
 from task_manager.labels.forms import LabelForm
 from task_manager.labels.models import Label
+from task_manager.mixins import (
+    AsyncListMixin,
+    ConditionalGetMixin,
+    ObjectCacheMixin,
+    ProtectedDeleteMixin,
+)
+from task_manager.tasks.models import Task
 
 LABELS_URL = reverse_lazy('labels_index')
 
 
-class LabelListView(LoginRequiredMixin, ListView):
+class LabelListView(LoginRequiredMixin, ConditionalGetMixin, ListView):
     model = Label
     template_name = 'labels/index.html'
     context_object_name = 'labels'
     ordering = ['created_at']
+    use_replica = True
+    # The task counts shown change with the tasks
+    freshness_models = (Label, Task)
+
+    def get_queryset(self):
+        return super().get_queryset().annotate(tasks_count=Count('tasks'))
+
+
+class AsyncLabelListView(AsyncListMixin, LabelListView):
+    pass
+
+
+class LabelAutocompleteView(AutocompleteView):
+    model = Label
+    ordering = [Lower('name')]
+
+    def get_queryset(self):
+        return super().get_queryset().only('name')
+
+    def search(self, queryset, term):
+        return with_lower(queryset, 'name').filter(prefix_q('name', term))
 
 
 class LabelCreateView(LoginRequiredMixin, SuccessMessageMixin, CreateView):
@@ -27,7 +56,12 @@ class LabelCreateView(LoginRequiredMixin, SuccessMessageMixin, CreateView):
     success_message = _('Label successfully created')
 
 
-class LabelUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
+class LabelUpdateView(
+    LoginRequiredMixin,
+    SuccessMessageMixin,
+    ObjectCacheMixin,
+    UpdateView
+    ):
     model = Label
     form_class = LabelForm
     template_name = 'labels/update.html'
@@ -51,21 +85,15 @@ class LabelUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
 #             )
 #             return redirect(LABELS_URL)
 
-class LabelDeleteView(LoginRequiredMixin, SuccessMessageMixin, DeleteView):
+class LabelDeleteView(
+    LoginRequiredMixin,
+    SuccessMessageMixin,
+    ObjectCacheMixin,
+    ProtectedDeleteMixin,
+    DeleteView
+    ):
     model = Label
     template_name = 'labels/delete.html'
     success_url = LABELS_URL
     success_message = _('Label successfully deleted')
-
-    def post(self, request, *args, **kwargs):
-
-        self.object = self.get_object()
-                
-        if self.object.tasks.exists():
-            messages.error(
-                request,
-                _('Cannot delete label because it is in use')
-            )
-            return redirect(self.success_url)
-        
-        return super().post(request, *args, **kwargs)
\ No newline at end of file
+    protected_message = _('Cannot delete label because it is in use')
\ No newline at end of file
@@ -0,0 +1,242 @@
+import asyncio
+import logging
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from task_manager.management.commands.benchmark_views import percentile
+
+User = get_user_model()
+
+SYNC_URLCONF = 'task_manager.urls'
+ASYNC_URLCONF = 'task_manager.urls_async'
+
+# Pages with an async view in task_manager.urls_async
+VIEWS = ('tasks_index', 'statuses_index', 'labels_index', 'users_index')
+
+HOST = 'localhost'
+
+
+class SlowQueries:
+    """Execute wrapper adding a fixed latency to every query."""
+
+    def __init__(self, delay_ms):
+        self.delay = delay_ms / 1000
+
+    def __call__(self, execute, sql, params, many, context):
+        time.sleep(self.delay)
+        return execute(sql, params, many, context)
+
+    def install(self, sender=None, connection=None, **kwargs):
+        # First in line: open execute_wrapper() blocks pop the last one
+        connection.execute_wrappers.insert(0, self)
+
+    def uninstall(self, connection):
+        if self in connection.execute_wrappers:
+            connection.execute_wrappers.remove(self)
+
+
+async def asgi_get(application, path, cookies):
+    """Send a GET request straight to an ASGI application."""
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': b'',
+        'root_path': '',
+        'headers': [
+            (b'host', HOST.encode()),
+            (b'cookie', cookies.encode()),
+        ],
+        'client': ('127.0.0.1', 0),
+        'server': (HOST, 80),
+    }
+    received = False
+
+    async def receive():
+        nonlocal received
+        if received:
+            # Django waits for a disconnect until the response is sent
+            await asyncio.Event().wait()
+        received = True
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    status = None
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+
+    await application(scope, receive, send)
+    return status
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the throughput of the sync views behind a fixed number of '
+        'workers with the async views of the ASGI application, under '
+        'concurrent requests whose queries are slowed down'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--username',
+            default='seed0',
+            help='User to log in as, created by seed_data by default',
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=200,
+            help='Requests per view and mode',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Sync workers, each serving one request at a time',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=20,
+            help='Requests in flight against the ASGI application',
+        )
+        parser.add_argument(
+            '--delay-ms',
+            type=float,
+            default=50,
+            help='Latency added to every SQL query',
+        )
+        parser.add_argument(
+            '--views',
+            nargs='+',
+            choices=VIEWS,
+            default=VIEWS,
+        )
+
+    def handle(self, *args, **options):
+        for option in ('requests', 'workers', 'concurrency'):
+            if options[option] <= 0:
+                raise CommandError(f'--{option} must be positive')
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(
+                f'User {options["username"]!r} does not exist, '
+                'run seed_data first'
+            )
+        client = Client(HTTP_HOST=HOST)
+        client.force_login(user)
+        cookies = '; '.join(
+            f'{name}={morsel.value}' for name, morsel in client.cookies.items()
+        )
+
+        slow_queries = SlowQueries(options['delay_ms'])
+        connection_created.connect(slow_queries.install)
+        for connection in connections.all(initialized_only=True):
+            slow_queries.install(connection=connection)
+        # Per-request log lines and the slowed down queries would drown
+        # the report
+        logging.disable(logging.WARNING)
+        try:
+            results = {}
+            for name in options['views']:
+                path = reverse(name)
+                results[name] = {
+                    'sync': self.run_sync(
+                        path, cookies, options['requests'], options['workers']
+                    ),
+                    'async': asyncio.run(self.run_async(
+                        path,
+                        cookies,
+                        options['requests'],
+                        options['concurrency'],
+                    )),
+                }
+        finally:
+            logging.disable(logging.NOTSET)
+            connection_created.disconnect(slow_queries.install)
+            for connection in connections.all(initialized_only=True):
+                slow_queries.uninstall(connection)
+        self.print_results(results)
+
+    def run_sync(self, path, cookies, count, workers):
+        timings, statuses = [], []
+        pending = iter(range(count))
+        lock = threading.Lock()
+
+        def work():
+            client = Client(HTTP_HOST=HOST, HTTP_COOKIE=cookies)
+            try:
+                while True:
+                    with lock:
+                        if next(pending, None) is None:
+                            return
+                    started = time.perf_counter()
+                    response = client.get(path)
+                    timings.append((time.perf_counter() - started) * 1000)
+                    statuses.append(response.status_code)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=work) for _ in range(workers)]
+        started = time.perf_counter()
+        with override_settings(ROOT_URLCONF=SYNC_URLCONF):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        return self.summarize(timings, statuses, time.perf_counter() - started)
+
+    async def run_async(self, path, cookies, count, concurrency):
+        application = ASGIHandler()
+        semaphore = asyncio.Semaphore(concurrency)
+        timings = []
+
+        async def request():
+            async with semaphore:
+                started = time.perf_counter()
+                status = await asgi_get(application, path, cookies)
+                timings.append((time.perf_counter() - started) * 1000)
+                return status
+
+        started = time.perf_counter()
+        with override_settings(ROOT_URLCONF=ASYNC_URLCONF):
+            statuses = await asyncio.gather(
+                *(request() for _ in range(count))
+            )
+        return self.summarize(timings, statuses, time.perf_counter() - started)
+
+    def summarize(self, timings, statuses, elapsed):
+        return {
+            'requests_per_s': round(len(timings) / elapsed, 1),
+            'p50_ms': round(percentile(timings, 50), 2),
+            'p95_ms': round(percentile(timings, 95), 2),
+            'errors': sum(status != 200 for status in statuses),
+        }
+
+    def print_results(self, results):
+        self.stdout.write(
+            f'{"view":<16}{"mode":>6}{"req/s":>9}{"p50 ms":>10}'
+            f'{"p95 ms":>10}{"errors":>8}'
+        )
+        for name, modes in results.items():
+            for mode, result in modes.items():
+                self.stdout.write(
+                    f'{name:<16}{mode:>6}{result["requests_per_s"]:>9.1f}'
+                    f'{result["p50_ms"]:>10.2f}{result["p95_ms"]:>10.2f}'
+                    f'{result["errors"]:>8}'
+                )
@@ -0,0 +1,230 @@
+import json
+import logging
+import math
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+
+User = get_user_model()
+
+DEFAULT_BASELINE = settings.BASE_DIR / 'benchmarks' / 'baseline.json'
+
+# Endpoints that only accept POST
+SKIPPED_VIEWS = {'logout', 'set_language', 'tasks_bulk'}
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    rank = math.ceil(percent / 100 * len(ordered)) - 1
+    return ordered[max(rank, 0)]
+
+
+def get_url_patterns(patterns=None):
+    """Yield the named URL patterns of the project, without the admin."""
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.app_name != 'admin':
+                yield from get_url_patterns(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield pattern
+
+
+class Command(BaseCommand):
+    help = (
+        'Request every page of the project as a seeded user and report '
+        'latency, query count and peak memory per view, compared with a '
+        'stored baseline'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--username',
+            default='seed0',
+            help='User to log in as, created by seed_data by default',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Timed requests per view',
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=2,
+            help='Untimed requests per view to fill the caches',
+        )
+        parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+        parser.add_argument(
+            '--save-baseline',
+            action='store_true',
+            help='Store the results as the new baseline',
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=0.2,
+            help='Allowed relative growth of latency and memory',
+        )
+
+    def handle(self, *args, **options):
+        if options['repeat'] <= 0:
+            raise CommandError('--repeat must be positive')
+        try:
+            self.user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(
+                f'User {options["username"]!r} does not exist, '
+                'run seed_data first'
+            )
+        self.client = Client(HTTP_HOST='localhost')
+        self.client.force_login(self.user)
+
+        # Per-request log lines would drown the report
+        logging.disable(logging.INFO)
+        try:
+            results = {
+                name: self.measure(url, options['warmup'], options['repeat'])
+                for name, url in self.get_urls()
+            }
+        finally:
+            logging.disable(logging.NOTSET)
+
+        report = {'dataset': self.get_dataset(), 'views': results}
+        self.print_results(results)
+        if options['save_baseline']:
+            self.save_baseline(options['baseline'], report)
+        elif options['baseline'].exists():
+            self.compare(options['baseline'], report, options['tolerance'])
+
+    def get_urls(self):
+        for pattern in get_url_patterns():
+            if pattern.name in SKIPPED_VIEWS:
+                continue
+            kwargs = {}
+            if 'pk' in pattern.pattern.converters:
+                kwargs['pk'] = self.get_sample_pk(pattern)
+            yield pattern.name, reverse(pattern.name, kwargs=kwargs)
+
+    def get_sample_pk(self, pattern):
+        model = pattern.callback.view_class.model
+        if model is User:
+            return self.user.pk
+        if model is Task:
+            # Only the author may open the delete page of a task
+            task = Task.objects.filter(author=self.user).first()
+            if task is not None:
+                return task.pk
+        obj = model.objects.order_by('pk').first()
+        if obj is None:
+            raise CommandError(
+                f'No {model._meta.verbose_name} to request, run seed_data'
+            )
+        return obj.pk
+
+    def request(self, url):
+        response = self.client.get(url)
+        if response.streaming:
+            b''.join(response.streaming_content)
+        return response
+
+    def measure(self, url, warmup, repeat):
+        for _ in range(warmup):
+            self.request(url)
+
+        timings, query_counts = [], []
+        for _ in range(repeat):
+            # The query log is reset when each request starts
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = self.request(url)
+                timings.append((time.perf_counter() - started) * 1000)
+            query_counts.append(len(queries))
+
+        # tracemalloc slows everything down, so memory gets its own request
+        tracemalloc.start()
+        try:
+            self.request(url)
+            _current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            'status': response.status_code,
+            'p50_ms': round(percentile(timings, 50), 2),
+            'p95_ms': round(percentile(timings, 95), 2),
+            'queries': max(query_counts),
+            'peak_kib': round(peak / 1024, 1),
+        }
+
+    def get_dataset(self):
+        return {
+            'users': User.objects.count(),
+            'statuses': Status.objects.count(),
+            'labels': Label.objects.count(),
+            'tasks': Task.objects.count(),
+        }
+
+    def print_results(self, results):
+        self.stdout.write(
+            f'{"view":<16}{"status":>7}{"p50 ms":>10}{"p95 ms":>10}'
+            f'{"queries":>9}{"peak KiB":>11}'
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name:<16}{result["status"]:>7}{result["p50_ms"]:>10.2f}'
+                f'{result["p95_ms"]:>10.2f}{result["queries"]:>9}'
+                f'{result["peak_kib"]:>11.1f}'
+            )
+
+    def save_baseline(self, path, report):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2) + '\n')
+        self.stdout.write(self.style.SUCCESS(f'Baseline saved to {path}'))
+
+    def compare(self, path, report, tolerance):
+        baseline = json.loads(path.read_text())
+        if baseline['dataset'] != report['dataset']:
+            self.stdout.write(self.style.WARNING(
+                f'The baseline was taken on a different data set: '
+                f'{baseline["dataset"]}'
+            ))
+
+        regressions = []
+        for name, result in report['views'].items():
+            previous = baseline['views'].get(name)
+            if previous is None:
+                continue
+            if result['queries'] > previous['queries']:
+                regressions.append(
+                    f'{name}: {result["queries"]} queries, '
+                    f'was {previous["queries"]}'
+                )
+            for metric in ('p95_ms', 'peak_kib'):
+                if result[metric] > previous[metric] * (1 + tolerance):
+                    regressions.append(
+                        f'{name}: {metric} {result[metric]}, '
+                        f'was {previous[metric]}'
+                    )
+
+        for regression in regressions:
+            self.stderr.write(regression)
+        if regressions:
+            raise CommandError(
+                f'{len(regressions)} regressions against {path}'
+            )
+        self.stdout.write(self.style.SUCCESS(f'No regressions against {path}'))
@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from task_manager.cache import get_stats, reset_stats
+
+
+class Command(BaseCommand):
+    help = 'Report cache hit/miss ratios per app namespace'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Reset the counters after reporting them',
+        )
+
+    def handle(self, *args, **options):
+        if not settings.CACHE_STATS:
+            self.stdout.write(self.style.WARNING(
+                'CACHE_STATS is disabled, counters are not updated'
+            ))
+        backend = settings.CACHES['default']['BACKEND']
+        if backend.endswith('LocMemCache'):
+            self.stdout.write(self.style.WARNING(
+                'The local memory cache is per process: only accesses made '
+                'by this command are visible'
+            ))
+
+        self.stdout.write(
+            f'{"namespace":<12}{"hits":>10}{"misses":>10}{"hit ratio":>12}'
+        )
+        for namespace, stats in get_stats().items():
+            total = stats['hits'] + stats['misses']
+            ratio = f'{stats["hits"] / total:.1%}' if total else '-'
+            self.stdout.write(
+                f'{namespace:<12}{stats["hits"]:>10}'
+                f'{stats["misses"]:>10}{ratio:>12}'
+            )
+
+        if options['reset']:
+            reset_stats()
+            self.stdout.write(self.style.SUCCESS('Counters reset'))
@@ -0,0 +1,201 @@
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks import counters, sort_keys
+from task_manager.tasks.choices import invalidate_choices
+from task_manager.tasks.dashboard import delta_users, invalidate_dashboards
+from task_manager.tasks.models import Task
+
+User = get_user_model()
+
+Through = Task.labels.through
+
+SEED_PASSWORD = 'password'
+
+# Share of tasks with 0, 1, 2, ... labels
+LABEL_FAN_OUT = [15, 35, 25, 13, 7, 3, 2]
+
+# Share of tasks without an executor
+UNASSIGNED_RATIO = 0.2
+
+
+def popularity(count):
+    """Zipf-like weights: a few items are used far more than the rest."""
+    return [1 / (rank + 1) for rank in range(count)]
+
+
+def weighted_sample(rng, population, weights, k):
+    chosen = set()
+    while len(chosen) < min(k, len(population)):
+        chosen.update(rng.choices(population, weights, k=k - len(chosen)))
+    return chosen
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate users, statuses, labels and tasks for load testing. '
+        'The same --seed always produces the same data set'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--statuses', type=int, default=10)
+        parser.add_argument('--labels', type=int, default=50)
+        parser.add_argument('--tasks', type=int, default=10000)
+        parser.add_argument(
+            '--max-labels',
+            type=int,
+            default=len(LABEL_FAN_OUT) - 1,
+            help='Most labels attached to a single task',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--prefix',
+            default='seed',
+            help='Prefix of generated user, status and label names',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Tasks inserted per transaction',
+        )
+
+    def handle(self, *args, **options):
+        for option in ('users', 'statuses', 'labels'):
+            if options[option] <= 0:
+                raise CommandError(f'--{option} must be positive')
+        if options['batch_size'] <= 0:
+            raise CommandError('--batch-size must be positive')
+        if not 0 <= options['max_labels'] < len(LABEL_FAN_OUT):
+            raise CommandError(
+                f'--max-labels must be between 0 and {len(LABEL_FAN_OUT) - 1}'
+            )
+
+        self.verbosity = options['verbosity']
+        started = time.perf_counter()
+        rng = random.Random(options['seed'])
+        prefix = options['prefix']
+
+        user_ids = self.create_users(prefix, options['users'])
+        status_ids = self.create_named(
+            Status, f'{prefix} status', options['statuses']
+        )
+        label_ids = self.create_named(
+            Label, f'{prefix} label', options['labels']
+        )
+        created, links = self.create_tasks(
+            rng,
+            options['tasks'],
+            user_ids,
+            status_ids,
+            label_ids,
+            options['max_labels'],
+            options['batch_size'],
+        )
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {len(user_ids)} users, {len(status_ids)} statuses, '
+            f'{len(label_ids)} labels, {created} tasks with {links} labels '
+            f'in {elapsed:.2f}s'
+        ))
+
+    def create_users(self, prefix, count):
+        password = make_password(SEED_PASSWORD)
+        usernames = [f'{prefix}{index}' for index in range(count)]
+        User.objects.bulk_create(
+            [
+                User(
+                    username=username,
+                    first_name=f'First{index}',
+                    last_name=f'Last{index}',
+                    password=password,
+                )
+                for index, username in enumerate(usernames)
+            ],
+            ignore_conflicts=True,
+        )
+        invalidate_choices(User)
+        return self.ids_by_name(User, 'username', usernames)
+
+    def create_named(self, model, prefix, count):
+        names = [f'{prefix} {index}' for index in range(count)]
+        model.objects.bulk_create(
+            [model(name=name) for name in names],
+            ignore_conflicts=True,
+        )
+        invalidate_choices(model)
+        return self.ids_by_name(model, 'name', names)
+
+    def ids_by_name(self, model, field, names):
+        ids = dict(
+            model.objects.filter(**{f'{field}__in': names})
+            .values_list(field, 'id')
+        )
+        # Keep the generation order so that --seed stays deterministic
+        return [ids[name] for name in names]
+
+    def create_tasks(
+        self,
+        rng,
+        count,
+        user_ids,
+        status_ids,
+        label_ids,
+        max_labels,
+        batch_size
+    ):
+        user_weights = popularity(len(user_ids))
+        status_weights = popularity(len(status_ids))
+        label_weights = popularity(len(label_ids))
+        fan_out = LABEL_FAN_OUT[:max_labels + 1]
+
+        created = links = 0
+        while created < count:
+            size = min(batch_size, count - created)
+            tasks, task_labels = [], []
+            for index in range(created, created + size):
+                executor_id = None
+                if rng.random() >= UNASSIGNED_RATIO:
+                    executor_id = rng.choices(user_ids, user_weights)[0]
+                tasks.append(Task(
+                    name=f'Task {index}',
+                    description=f'Generated task {index}',
+                    status_id=rng.choices(status_ids, status_weights)[0],
+                    author_id=rng.choices(user_ids, user_weights)[0],
+                    executor_id=executor_id,
+                ))
+                labels_count = rng.choices(range(len(fan_out)), fan_out)[0]
+                task_labels.append(weighted_sample(
+                    rng, label_ids, label_weights, labels_count
+                ))
+
+            with transaction.atomic():
+                sort_keys.fill(tasks)
+                Task.objects.bulk_create(tasks)
+                through = [
+                    Through(task_id=task.id, label_id=label_id)
+                    for task, labels in zip(tasks, task_labels)
+                    for label_id in sorted(labels)
+                ]
+                Through.objects.bulk_create(through)
+                deltas = counters.task_deltas(tasks)
+                deltas.update(counters.label_deltas(
+                    link.label_id for link in through
+                ))
+                counters.apply_deltas(deltas)
+                invalidate_dashboards(delta_users(deltas))
+                invalidate_choices(Task)
+            created += size
+            links += len(through)
+            if self.verbosity > 1:
+                self.stdout.write(f'{created}/{count} tasks')
+        return created, links
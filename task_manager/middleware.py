@@ -0,0 +1,308 @@
+import logging
+import time
+import traceback
+from contextvars import ContextVar
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from task_manager.routers import (
+    REPLICA_PIN_COOKIE,
+    has_replica,
+    replica_reads,
+    set_replica_reads,
+)
+
+logger = logging.getLogger('task_manager.requests')
+sql_logger = logging.getLogger('task_manager.sql')
+
+SLOW_QUERY_LOG_LIMIT = 10
+
+# Requests that do not write
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+PROJECT_DIR = str(Path(__file__).resolve().parent)
+
+# The RequestTiming of the request being served. A context variable
+# rather than an execute_wrapper() block: under ASGI the queries run in
+# threads other than the middleware's, with their own connections.
+_request_timing = ContextVar('request_timing', default=None)
+
+
+def _elapsed_ms(started):
+    return (time.perf_counter() - started) * 1000
+
+
+def get_pool_stats():
+    """
+    Checkouts and total wait in ms so far of the connection pools of this
+    process, or None without pools. The pools are shared by the threads
+    of the process, so per-request differences are exact only while the
+    process serves one request at a time.
+    """
+    pools = [
+        connection.pool for connection in connections.all()
+        if getattr(connection, 'pool', None) is not None
+    ]
+    if not pools:
+        return None
+    checkouts = wait_ms = 0
+    for pool in pools:
+        stats = pool.get_stats()
+        checkouts += stats.get('requests_num', 0)
+        wait_ms += stats.get('requests_wait_ms', 0)
+    return checkouts, wait_ms
+
+
+def timed_execute(execute, sql, params, many, context):
+    timing = _request_timing.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    return timing(execute, sql, params, many, context)
+
+
+def install_timing(connection):
+    if timed_execute not in connection.execute_wrappers:
+        connection.execute_wrappers.append(timed_execute)
+
+
+@receiver(connection_created)
+def connection_opened(sender, connection, **kwargs):
+    install_timing(connection)
+
+
+def get_query_origin():
+    """Return the innermost project frame that led to the query."""
+    for frame in reversed(traceback.extract_stack()):
+        if frame.filename == __file__:
+            continue
+        if frame.filename.startswith(PROJECT_DIR):
+            path = Path(frame.filename).relative_to(PROJECT_DIR)
+            return f'{path}:{frame.lineno} in {frame.name}'
+    return 'unknown'
+
+
+class RequestTiming:
+    def __init__(self, slow_query_ms):
+        self.slow_query_ms = slow_query_ms
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_ms = 0.0
+        self.slow_queries = []
+        self.view_started = None
+        self.view_ms = None
+        self.render_started = None
+        self.render_ms = None
+        self.pool_stats = get_pool_stats()
+        self.pool_checkouts = None
+        self.pool_wait_ms = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = _elapsed_ms(started)
+            self.queries += 1
+            self.sql_ms += duration
+            slow_query_ms = self.slow_query_ms
+            if slow_query_ms is not None and duration >= slow_query_ms:
+                self.slow_queries.append(
+                    (duration, sql, get_query_origin())
+                )
+
+    def finish_pool_stats(self):
+        if self.pool_stats is None:
+            return
+        checkouts, wait_ms = get_pool_stats()
+        self.pool_checkouts = checkouts - self.pool_stats[0]
+        self.pool_wait_ms = wait_ms - self.pool_stats[1]
+
+    def server_timing(self, total_ms):
+        metrics = [
+            f'db;desc="{self.queries} queries";dur={self.sql_ms:.1f}',
+        ]
+        if self.pool_checkouts is not None:
+            metrics.append(
+                f'pool;desc="{self.pool_checkouts} checkouts";'
+                f'dur={self.pool_wait_ms:.1f}'
+            )
+        if self.view_ms is not None:
+            metrics.append(f'view;dur={self.view_ms:.1f}')
+        if self.render_ms is not None:
+            metrics.append(f'render;dur={self.render_ms:.1f}')
+        metrics.append(f'total;dur={total_ms:.1f}')
+        return ', '.join(metrics)
+
+
+class ServerTimingMiddleware:
+    """
+    Count the SQL queries of a request and time them together with the
+    view and the template rendering. The numbers are sent back in the
+    ``Server-Timing`` header and logged under the URL name; queries slower
+    than ``SLOW_QUERY_THRESHOLD_MS`` are logged with the code that ran them.
+    With pooled database connections, the pool checkouts and the time spent
+    waiting for a connection are reported too.
+
+    Queries run while a streaming response is consumed are not counted.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        # Connections opened from now on are covered by connection_opened
+        for connection in connections.all(initialized_only=True):
+            install_timing(connection)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        timing = self.start(request)
+        token = _request_timing.set(timing)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_timing.reset(token)
+        return self.finish(request, response, timing)
+
+    async def __acall__(self, request):
+        timing = self.start(request)
+        token = _request_timing.set(timing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_timing.reset(token)
+        return self.finish(request, response, timing)
+
+    def start(self, request):
+        timing = RequestTiming(settings.SLOW_QUERY_THRESHOLD_MS)
+        request.timing = timing
+        return timing
+
+    def finish(self, request, response, timing):
+        if timing.view_started is not None and timing.view_ms is None:
+            timing.view_ms = _elapsed_ms(timing.view_started)
+        timing.finish_pool_stats()
+        total_ms = _elapsed_ms(timing.started)
+        response['Server-Timing'] = timing.server_timing(total_ms)
+        self.log(request, response, timing, total_ms)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.timing.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        timing = request.timing
+        timing.view_ms = _elapsed_ms(timing.view_started)
+        timing.render_started = time.perf_counter()
+        response.add_post_render_callback(self.rendered(timing))
+        return response
+
+    def rendered(self, timing):
+        def callback(response):
+            timing.render_ms = _elapsed_ms(timing.render_started)
+        return callback
+
+    def log(self, request, response, timing, total_ms):
+        match = request.resolver_match
+        url_name = match.url_name if match else None
+        extra = {
+            'url_name': url_name,
+            'method': request.method,
+            'status_code': response.status_code,
+            'queries': timing.queries,
+            'sql_ms': round(timing.sql_ms, 1),
+            'view_ms': round(timing.view_ms or 0, 1),
+            'render_ms': round(timing.render_ms or 0, 1),
+            'total_ms': round(total_ms, 1),
+        }
+        if timing.pool_checkouts is not None:
+            extra['pool_checkouts'] = timing.pool_checkouts
+            extra['pool_wait_ms'] = round(timing.pool_wait_ms, 1)
+        logger.info(
+            '%s %s %s queries=%d sql_ms=%.1f view_ms=%.1f render_ms=%.1f '
+            'total_ms=%.1f',
+            url_name,
+            request.method,
+            response.status_code,
+            timing.queries,
+            timing.sql_ms,
+            timing.view_ms or 0,
+            timing.render_ms or 0,
+            total_ms,
+            extra=extra,
+        )
+        slowest = sorted(timing.slow_queries, reverse=True)
+        for duration, sql, origin in slowest[:SLOW_QUERY_LOG_LIMIT]:
+            sql_logger.warning(
+                '%s slow query %.1fms at %s: %s',
+                url_name,
+                duration,
+                origin,
+                sql,
+                extra={
+                    'url_name': url_name,
+                    'duration_ms': round(duration, 1),
+                    'origin': origin,
+                },
+            )
+
+
+class ReplicaMiddleware:
+    """
+    Route the reads of views with ``use_replica = True`` to the read
+    replica, see task_manager/routers.py. A request that may write, with
+    a method outside ``SAFE_METHODS``, keeps its user on the primary for
+    ``REPLICA_PIN_SECONDS`` with a cookie, longer than the replica takes
+    to catch up.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with replica_reads(False):
+            response = self.get_response(request)
+        return self.pin(request, response)
+
+    async def __acall__(self, request):
+        with replica_reads(False):
+            response = await self.get_response(request)
+        return self.pin(request, response)
+
+    def pin(self, request, response):
+        if request.method not in SAFE_METHODS and has_replica():
+            response.set_cookie(
+                REPLICA_PIN_COOKIE,
+                '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        if (
+            getattr(view_class, 'use_replica', False)
+            and REPLICA_PIN_COOKIE not in request.COOKIES
+        ):
+            # Undone by replica_reads() in __call__ or __acall__
+            set_replica_reads(True)
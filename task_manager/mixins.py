@@ -0,0 +1,231 @@
+import hashlib
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.messages import get_messages
+from django.db.models import BooleanField, Count, ExpressionWrapper, Q
+from django.http import Http404
+from django.shortcuts import redirect
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import http_date, quote_etag
+from django.utils.translation import get_language
+from django.utils.translation import gettext as _
+from django.views import View
+
+from task_manager.routers import reads_replica
+from task_manager.tasks.choices import get_choices_version, replica_may_lag
+
+
+class ConditionalGetMixin:
+    """
+    Answer GET with 304 Not Modified while the data shown on the page is
+    unchanged for the current user, language and query string.
+
+    Freshness is the version of each of ``freshness_models``, whose rows
+    the page shows, bumped on commit of every change to them (see
+    ``task_manager.tasks.choices``): a cache read whatever the size of
+    the tables. Views may add values of their own in ``get_freshness()``,
+    such as the ``updated_at`` of the object of a detail page.
+
+    The versions are bumped on commit to the primary: a page read from a
+    replica gets no validators until the replica has had time to catch
+    up, or its old rows would be answered with 304 under the new version.
+    """
+
+    freshness_models = ()
+
+    def get_freshness(self):
+        return {}
+
+    def get_last_modified(self, freshness):
+        return max(
+            (
+                value for value in freshness.values()
+                if isinstance(value, datetime)
+            ),
+            default=None,
+        )
+
+    def get_etag(self, freshness):
+        request = self.request
+        parts = [
+            *(freshness[key] for key in sorted(freshness)),
+            *(get_choices_version(model) for model in self.freshness_models),
+            request.user.pk,
+            get_language(),
+            request.GET.urlencode(),
+            # Forms on the page embed a token derived from the CSRF secret
+            request.META.get('CSRF_COOKIE'),
+        ]
+        data = '|'.join(str(part) for part in parts)
+        return quote_etag(hashlib.md5(data.encode()).hexdigest())
+
+    def has_pending_messages(self):
+        return len(get_messages(self.request)) > 0
+
+    def is_conditional(self):
+        if self.has_pending_messages():
+            return False
+        return not (reads_replica() and any(
+            replica_may_lag(model) for model in self.freshness_models
+        ))
+
+    def get(self, request, *args, **kwargs):
+        if not self.is_conditional():
+            return super().get(request, *args, **kwargs)
+
+        freshness = self.get_freshness()
+        etag = self.get_etag(freshness)
+        # If-Modified-Since alone cannot tell users or languages apart,
+        # so only the ETag is used to validate the request
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        return self.add_validators(response, freshness, etag)
+
+    def add_validators(self, response, freshness, etag):
+        response['ETag'] = etag
+        last_modified = self.get_last_modified(freshness)
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ['Cookie', 'Accept-Language'])
+        return response
+
+
+class ObjectCacheMixin:
+    """
+    Fetch the object of a single object view once per request, shared by
+    permission checks, ``get()`` and ``post()``. With ``owner_field`` set,
+    the fetch also annotates ``is_owner``, whether that field points to
+    the current user, so checking ownership costs no query of its own.
+    """
+
+    owner_field = None
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.owner_field is None:
+            return queryset
+        return queryset.annotate(is_owner=ExpressionWrapper(
+            Q(**{self.owner_field: self.request.user.pk}),
+            output_field=BooleanField(),
+        ))
+
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, '_object'):
+            self._object = super().get_object()
+        return self._object
+
+
+class ProtectedDeleteMixin:
+    """
+    Refuse to delete an object that tasks still use. The task count is
+    annotated on the query that loads the object, so nothing else is
+    fetched to find out.
+    """
+
+    protected_message = None
+
+    def get_queryset(self):
+        return super().get_queryset().annotate(tasks_count=Count('tasks'))
+
+    def form_valid(self, form):
+        if self.object.tasks_count:
+            messages.error(self.request, self.protected_message)
+            return redirect(self.get_success_url())
+        return super().form_valid(form)
+
+
+class AsyncViewMixin:
+    """
+    Serve GET of a generic view from an async handler, for the ASGI
+    application. The page data is loaded with the async ORM in
+    ``aget_context_data``; form validation and cache lookups, which may
+    hit the database, go through ``sync_to_async``. Everything else is
+    configured as on the sync view it is mixed into, including
+    ``LoginRequiredMixin`` and ``ConditionalGetMixin``.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        # The lazy request.user would query the database from the event
+        # loop; resolve it once for the view and the templates
+        request.user = await request.auser()
+        if (
+            isinstance(self, LoginRequiredMixin)
+            and not request.user.is_authenticated
+        ):
+            return await sync_to_async(self.handle_no_permission)()
+        return await View.dispatch(self, request, *args, **kwargs)
+
+    async def get(self, request, *args, **kwargs):
+        conditional = isinstance(self, ConditionalGetMixin)
+        if conditional:
+            conditional = await sync_to_async(self.is_conditional)()
+        if not conditional:
+            return self.render_to_response(await self.aget_context_data())
+
+        freshness = await self.aget_freshness()
+        etag = await sync_to_async(self.get_etag)(freshness)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = self.render_to_response(await self.aget_context_data())
+        return self.add_validators(response, freshness, etag)
+
+    async def aget_freshness(self):
+        return await sync_to_async(self.get_freshness)()
+
+    async def aget_context_data(self):
+        # The base context, for views with nothing to load up front
+        return await sync_to_async(self.get_context_data)()
+
+
+class AsyncListMixin(AsyncViewMixin):
+    def get_object_list(self):
+        """The queryset to list, built without querying the database."""
+        return self.get_queryset()
+
+    async def aget_context_data(self):
+        queryset = await sync_to_async(self.get_object_list)()
+        page_size = self.get_paginate_by(queryset)
+        if page_size:
+            # Keyset pagination only; paginate_queryset() then hands over
+            # the page fetched here
+            self.paginated = await self.apaginate_queryset(
+                queryset, page_size
+            )
+            self.object_list = queryset
+        else:
+            self.object_list = [obj async for obj in queryset]
+        return self.get_context_data(object_list=self.object_list)
+
+
+class AsyncDetailMixin(AsyncViewMixin):
+    async def aget_object(self):
+        if hasattr(self, '_object'):
+            return self._object
+        queryset = self.get_queryset()
+        try:
+            self._object = await queryset.aget(
+                pk=self.kwargs[self.pk_url_kwarg]
+            )
+        except queryset.model.DoesNotExist:
+            raise Http404(
+                _('No %(verbose_name)s found matching the query')
+                % {'verbose_name': queryset.model._meta.verbose_name}
+            )
+        return self._object
+
+    async def aget_context_data(self):
+        self.object = await self.aget_object()
+        return self.get_context_data(object=self.object)
@@ -0,0 +1,261 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import connections
+from django.db.models import Q
+from django.http import Http404
+from django.utils.translation import gettext_lazy as _
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def reverse_ordering(ordering):
+    return [
+        name[1:] if name.startswith('-') else f'-{name}' for name in ordering
+    ]
+
+
+class KeysetPage:
+    def __init__(
+        self,
+        object_list,
+        paginator,
+        next_cursor=None,
+        previous_cursor=None
+    ):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<KeysetPage of {len(self.object_list)} items>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by seeking past the last seen row instead of using
+    OFFSET, so every page costs the same index range scan.
+
+    ``ordering`` is a list of field names (``-`` prefix for descending)
+    that must end with a unique column, e.g. ``['created_at', 'id']``.
+    Nullable columns are fine: their NULLs are sought where the backend
+    sorts them.
+    """
+
+    def __init__(self, queryset, per_page, ordering):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.keys = [
+            (name.lstrip('-'), name.startswith('-')) for name in ordering
+        ]
+
+    def page(self, after=None, before=None):
+        queryset, backward = self._seek_queryset(after, before)
+        rows = list(queryset[:self.per_page + 1])
+        return self._paginate(rows, backward, has_previous=bool(after))
+
+    async def apage(self, after=None, before=None):
+        queryset, backward = self._seek_queryset(after, before)
+        rows = [row async for row in queryset[:self.per_page + 1]]
+        return self._paginate(rows, backward, has_previous=bool(after))
+
+    def _seek_queryset(self, after, before):
+        values, backward = None, False
+        if after:
+            values = self.decode_cursor(after)
+        elif before:
+            values, backward = self.decode_cursor(before), True
+        queryset = self.queryset.order_by(*self._ordering(reverse=backward))
+        if values is not None:
+            queryset = queryset.filter(self._seek(values, reverse=backward))
+        return queryset, backward
+
+    def _paginate(self, rows, backward, has_previous):
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backward:
+            return self._make_page(rows[::-1], True, has_more)
+        return self._make_page(rows, has_more, has_previous)
+
+    def _make_page(self, rows, has_next, has_previous):
+        return KeysetPage(
+            rows,
+            self,
+            next_cursor=self.encode_cursor(rows[-1])
+            if rows and has_next else None,
+            previous_cursor=self.encode_cursor(rows[0])
+            if rows and has_previous else None,
+        )
+
+    def _ordering(self, reverse=False):
+        return [
+            f'-{name}' if descending != reverse else name
+            for name, descending in self.keys
+        ]
+
+    def _seek(self, values, reverse):
+        nulls_largest = connections[
+            self.queryset.db
+        ].features.nulls_order_largest
+        condition = Q()
+        for index, (name, descending) in enumerate(self.keys):
+            term = self._past(
+                name, values[index], descending == reverse, nulls_largest
+            )
+            if term is None:
+                continue
+            for prev, (prev_name, _descending) in enumerate(self.keys[:index]):
+                term &= Q(**{prev_name: values[prev]})
+            condition |= term
+        return condition
+
+    def _past(self, name, value, ascending, nulls_largest):
+        """Rows past ``value`` in the scan order, ``None`` if none can be."""
+        # NULLs come in the order the backend sorts them, as the index does
+        nulls_last = nulls_largest == ascending
+        if value is None:
+            return None if nulls_last else Q(**{f'{name}__isnull': False})
+        term = Q(**{f'{name}__{"gt" if ascending else "lt"}': value})
+        if nulls_last and getattr(self._field(name), 'null', False):
+            term |= Q(**{f'{name}__isnull': True})
+        return term
+
+    def encode_cursor(self, obj):
+        values = [
+            self._encode_value(obj, name) for name, _descending in self.keys
+        ]
+        payload = json.dumps(values, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+    def _encode_value(self, obj, name):
+        if not self._is_model_field(name):
+            return getattr(obj, name)
+        field = self._field(name)
+        if field.value_from_object(obj) is None:
+            return None
+        return field.value_to_string(obj)
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded))
+            if len(values) != len(self.keys):
+                raise InvalidCursor(cursor)
+            return [
+                None if value is None else self._field(name).to_python(value)
+                for (name, _descending), value in zip(self.keys, values)
+            ]
+        except (binascii.Error, TypeError, ValueError, ValidationError):
+            raise InvalidCursor(cursor)
+
+    def _is_model_field(self, name):
+        return name not in self.queryset.query.annotations
+
+    def _field(self, name):
+        annotation = self.queryset.query.annotations.get(name)
+        if annotation is not None:
+            return annotation.output_field
+        try:
+            return self.queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            raise InvalidCursor(name)
+
+
+class KeysetPaginationMixin:
+    """
+    Drop-in replacement for ``MultipleObjectMixin.paginate_queryset``
+    that navigates with ``?after=`` / ``?before=`` cursors.
+    """
+
+    paginate_by = 50
+    keyset_ordering = ['id']
+    # Orderings picked with ?sort=<name>, ?sort=-<name> reverses them
+    keyset_sorts = {}
+    # The name of keyset_ordering in keyset_sorts, if it is one of them
+    default_sort = None
+    # A page already fetched by apaginate_queryset()
+    paginated = None
+
+    def get_sort(self):
+        """The ``?sort=`` of the request, ``None`` if missing or unknown."""
+        sort = self.request.GET.get('sort', '')
+        if sort.removeprefix('-') in self.keyset_sorts:
+            return sort
+        return None
+
+    def get_keyset_ordering(self, queryset):
+        sort = self.get_sort()
+        if sort is None:
+            return self.keyset_ordering
+        ordering = self.keyset_sorts[sort.removeprefix('-')]
+        if sort.startswith('-'):
+            # Every column reversed: the same index, scanned backwards
+            return reverse_ordering(ordering)
+        return ordering
+
+    def get_sort_links(self, sort):
+        """``?sort=`` of each column header, toggling the current one."""
+        return {
+            name: f'-{name}' if sort == name else name
+            for name in self.keyset_sorts
+        }
+
+    def get_context_data(self, **kwargs):
+        sort = self.get_sort() or self.default_sort
+        kwargs.setdefault('sort', sort)
+        kwargs.setdefault('sort_links', self.get_sort_links(sort))
+        return super().get_context_data(**kwargs)
+
+    def get_keyset_paginator(self, queryset, page_size):
+        return KeysetPaginator(
+            queryset,
+            page_size,
+            self.get_keyset_ordering(queryset)
+        )
+
+    def get_cursors(self):
+        return {
+            'after': self.request.GET.get('after'),
+            'before': self.request.GET.get('before'),
+        }
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.paginated is not None:
+            return self.paginated
+        paginator = self.get_keyset_paginator(queryset, page_size)
+        try:
+            page = paginator.page(**self.get_cursors())
+        except InvalidCursor:
+            raise Http404(_('Invalid page cursor'))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    async def apaginate_queryset(self, queryset, page_size):
+        paginator = self.get_keyset_paginator(queryset, page_size)
+        try:
+            page = await paginator.apage(**self.get_cursors())
+        except InvalidCursor:
+            raise Http404(_('Invalid page cursor'))
+        return paginator, page, page.object_list, page.has_other_pages()
@@ -0,0 +1,72 @@
+"""
+Read replica routing.
+
+With ``REPLICA_DATABASE_URL`` set, the views flagged with
+``use_replica = True`` read the data of the project apps from the
+``replica`` database; everything else, writes included, goes to
+``default``. ``ReplicaMiddleware`` turns the routing on for those views
+and keeps a user who has just written on the primary for
+``REPLICA_PIN_SECONDS``, so they never read a replica that has not caught
+up with their own changes yet.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_DB_ALIAS = 'replica'
+REPLICA_PIN_COOKIE = 'use_primary'
+
+# Sessions, permissions and content types stay on the primary
+REPLICA_APPS = frozenset(('users', 'statuses', 'labels', 'tasks'))
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+def has_replica():
+    return REPLICA_DB_ALIAS in connections.settings
+
+
+def reads_replica():
+    """Whether the reads of the current view go to the replica."""
+    return _replica_reads.get() and has_replica()
+
+
+def set_replica_reads(enabled):
+    return _replica_reads.set(enabled)
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    token = set_replica_reads(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label not in REPLICA_APPS or not has_replica():
+            return None
+        # Explicit outside the views, or Django would follow rows fetched
+        # from the replica back to it
+        return REPLICA_DB_ALIAS if _replica_reads.get() else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        if has_replica():
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both databases hold the same rows
+        databases = {DEFAULT_DB_ALIAS, REPLICA_DB_ALIAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema from the primary
+        if db == REPLICA_DB_ALIAS:
+            return False
+        return None
@@ -16,6 +16,10 @@ import dj_database_url
 from django.utils.translation import gettext_lazy as _
 from dotenv import load_dotenv
 
+from task_manager.cache import check_shared, parse_cache_url
+from task_manager.db import postgresql_options, sqlite_options
+from task_manager.routers import REPLICA_DB_ALIAS
+
 load_dotenv()
 
 
@@ -54,12 +58,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'task_manager.middleware.ServerTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'task_manager.middleware.ReplicaMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -67,7 +73,8 @@ MIDDLEWARE = [
     
 ]
 
-ROOT_URLCONF = 'task_manager.urls'
+# asgi.py switches to task_manager.urls_async, with async read views
+ROOT_URLCONF = os.getenv('ROOT_URLCONF', 'task_manager.urls')
 
 TEMPLATES = [
     {
@@ -108,15 +115,117 @@ WSGI_APPLICATION = 'task_manager.wsgi.application'
 
 DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{BASE_DIR / 'db.sqlite3'}")
 
-if DATABASE_URL.startswith("sqlite"):
-    DATABASES = {
-        "default": dj_database_url.parse(DATABASE_URL, conn_max_age=600)
-    }
-else:
-    DATABASES = {
-        "default": dj_database_url.parse(DATABASE_URL, conn_max_age=600, ssl_require=not DEBUG)
-    }
+# Persistent connections are per thread; asgi.py turns them off because
+# ASGI runs the queries of every request in a new thread
+CONN_MAX_AGE = int(os.getenv('CONN_MAX_AGE', 600))
+
+# Opt-in SQLite profile for several gunicorn workers: WAL journal, busy
+# timeout and bigger caches on every new connection, see task_manager/db.py
+SQLITE_TUNING = os.getenv('SQLITE_TUNING', 'False') == 'True'
+
+# PostgreSQL: DATABASE_POOL=True keeps a psycopg connection pool per process
+# instead of a persistent connection per thread. Connections are checked
+# before use either way (by Django without the pool, by the pool on
+# checkout with it), so one broken by a database restart does not fail a
+# request. Statements longer than DATABASE_STATEMENT_TIMEOUT_MS are
+# aborted; empty disables the limit.
+DATABASE_POOL = os.getenv('DATABASE_POOL', 'False') == 'True'
+DATABASE_POOL_MIN_SIZE = int(os.getenv('DATABASE_POOL_MIN_SIZE', 2))
+DATABASE_POOL_MAX_SIZE = int(os.getenv('DATABASE_POOL_MAX_SIZE', 10))
+# Seconds a request waits for a free connection before failing
+DATABASE_POOL_TIMEOUT = float(os.getenv('DATABASE_POOL_TIMEOUT', 10))
+DATABASE_STATEMENT_TIMEOUT_MS = os.getenv('DATABASE_STATEMENT_TIMEOUT_MS', '')
+DATABASE_STATEMENT_TIMEOUT_MS = (
+    int(DATABASE_STATEMENT_TIMEOUT_MS) if DATABASE_STATEMENT_TIMEOUT_MS else None
+)
+
+
+
+def _database(url):
+    if url.startswith("sqlite"):
+        database = dj_database_url.parse(url, conn_max_age=CONN_MAX_AGE)
+        if SQLITE_TUNING:
+            database["OPTIONS"] = sqlite_options()
+        return database
+    database = dj_database_url.parse(
+        url,
+        # Pooled connections go back to the pool after every request
+        conn_max_age=0 if DATABASE_POOL else CONN_MAX_AGE,
+        # Django ignores health checks with a pool, which checks itself
+        conn_health_checks=not DATABASE_POOL,
+        ssl_require=not DEBUG,
+    )
+    database["OPTIONS"].update(postgresql_options(
+        statement_timeout_ms=DATABASE_STATEMENT_TIMEOUT_MS,
+        pool={
+            "min_size": DATABASE_POOL_MIN_SIZE,
+            "max_size": DATABASE_POOL_MAX_SIZE,
+            "timeout": DATABASE_POOL_TIMEOUT,
+        } if DATABASE_POOL else None,
+    ))
+    return database
+
+
+DATABASES = {
+    "default": _database(DATABASE_URL),
+}
+
+# Optional read replica of the primary database for the list and detail
+# pages, see task_manager/routers.py. After a write, a user reads from the
+# primary for REPLICA_PIN_SECONDS, which must exceed the replication lag.
+REPLICA_DATABASE_URL = os.getenv('REPLICA_DATABASE_URL', '')
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', 5))
+
+if REPLICA_DATABASE_URL:
+    DATABASES[REPLICA_DB_ALIAS] = _database(REPLICA_DATABASE_URL)
+    # Tests point it at the test database of the primary
+    DATABASES[REPLICA_DB_ALIAS]["TEST"] = {"MIRROR": "default"}
+
+DATABASE_ROUTERS = ['task_manager.routers.ReplicaRouter']
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# locmem:// keeps one cache per process, fine for runserver only: with
+# WEB_CONCURRENCY above 1 (the worker count of gunicorn and uvicorn) use
+# file:///path, db://table or redis://host:port/db, shared by the workers.
+# CACHE_STATS counts hits and misses, at the cost of a write per read.
+
+WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', 1))
+
+CACHE_URL = os.getenv('CACHE_URL', 'locmem://task-manager')
+
+CACHES = {
+    'default': check_shared(parse_cache_url(CACHE_URL), WEB_CONCURRENCY),
+}
+
+CACHE_STATS = os.getenv('CACHE_STATS', 'False') == 'True'
+
+
+# Request instrumentation
+# ServerTimingMiddleware logs every request to task_manager.requests and the
+# queries slower than this threshold to task_manager.sql; empty disables it.
+
+SLOW_QUERY_THRESHOLD_MS = os.getenv('SLOW_QUERY_THRESHOLD_MS', '100')
+SLOW_QUERY_THRESHOLD_MS = (
+    float(SLOW_QUERY_THRESHOLD_MS) if SLOW_QUERY_THRESHOLD_MS else None
+)
 
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'task_manager': {
+            'handlers': ['console'],
+            'level': os.getenv('LOG_LEVEL', 'INFO'),
+        },
+    },
+}
 
 
 # Password validation
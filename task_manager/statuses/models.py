@@ -13,6 +13,10 @@ class Status(models.Model):
         _('Created at'),
         auto_now_add=True
     )
+    updated_at = models.DateTimeField(
+        _('Updated at'),
+        auto_now=True
+    )
 
     def __str__(self):
         return self.name
@@ -3,6 +3,7 @@ from django.test import Client, TestCase
 from django.urls import reverse
 
 from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
 
 User = get_user_model()
 
@@ -133,4 +134,88 @@ class StatusModelTest(TestCase):
         statuses = Status.objects.all()
         self.assertEqual(statuses[0], status1)
         self.assertEqual(statuses[1], status2)
-        self.assertEqual(statuses[2], status3)
\ No newline at end of file
+        self.assertEqual(statuses[2], status3)
+
+
+class StatusConditionalGetTest(TestCase):
+    def test_not_modified_until_status_changes(self):
+        """Тест ответа 304 до изменения статусов"""
+        user = User.objects.create_user(username='user', password='pass')
+        status = Status.objects.create(name='New')
+        self.client.force_login(user)
+        url = reverse('statuses_index')
+        self.client.get(url)
+        etag = self.client.get(url)['ETag']
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        status.name = 'Renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            status.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Renamed')
+
+    def test_not_modified_until_tasks_change(self):
+        """Тест что ETag списка статусов зависит от задач"""
+        user = User.objects.create_user(username='user', password='pass')
+        status = Status.objects.create(name='New')
+        self.client.force_login(user)
+        url = reverse('statuses_index')
+        self.client.get(url)
+        etag = self.client.get(url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(name='Task', status=status, author=user)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class StatusUsageTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='user', password='pass')
+        self.used = Status.objects.create(name='Used')
+        self.unused = Status.objects.create(name='Unused')
+        for index in range(3):
+            Task.objects.create(
+                name=f'Task {index}',
+                status=self.used,
+                author=self.user
+            )
+        self.client.force_login(self.user)
+
+    def test_index_shows_task_counts(self):
+        """Тест числа задач по статусам в одном запросе"""
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('statuses_index'))
+        counts = {
+            status.name: status.tasks_count
+            for status in response.context['statuses']
+        }
+        self.assertEqual(counts, {'Used': 3, 'Unused': 0})
+
+    def test_delete_page_warns_when_in_use(self):
+        """Тест предупреждения на странице удаления используемого статуса"""
+        response = self.client.get(
+            reverse('status_delete', args=[self.used.id])
+        )
+        self.assertContains(response, 'alert-warning')
+        response = self.client.get(
+            reverse('status_delete', args=[self.unused.id])
+        )
+        self.assertNotContains(response, 'alert-warning')
+
+    def test_delete_in_use_uses_annotated_count(self):
+        """Тест отказа в удалении используемого статуса без обхода связей"""
+        url = reverse('status_delete', args=[self.used.id])
+        # Session, user and the status with its task count
+        with self.assertNumQueries(3):
+            response = self.client.post(url)
+        self.assertRedirects(response, reverse('statuses_index'))
+        self.assertTrue(Status.objects.filter(id=self.used.id).exists())
+
+        response = self.client.post(
+            reverse('status_delete', args=[self.unused.id])
+        )
+        self.assertFalse(Status.objects.filter(id=self.unused.id).exists())
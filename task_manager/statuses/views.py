@@ -2,22 +2,40 @@ from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
 from django.db import models
+from django.db.models import Count
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
+from task_manager.mixins import (
+    AsyncListMixin,
+    ConditionalGetMixin,
+    ObjectCacheMixin,
+    ProtectedDeleteMixin,
+)
 from task_manager.statuses.forms import StatusForm
 from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
 
 STATUSES_URL = reverse_lazy('statuses_index')
 
 
-class StatusListView(LoginRequiredMixin, ListView):
+class StatusListView(LoginRequiredMixin, ConditionalGetMixin, ListView):
     model = Status
     template_name = 'statuses/index.html'
     context_object_name = 'statuses'
     ordering = ['created_at']
+    use_replica = True
+    # The task counts shown change with the tasks
+    freshness_models = (Status, Task)
+
+    def get_queryset(self):
+        return super().get_queryset().annotate(tasks_count=Count('tasks'))
+
+
+class AsyncStatusListView(AsyncListMixin, StatusListView):
+    pass
 
 
 class StatusCreateView(LoginRequiredMixin, SuccessMessageMixin, CreateView):
@@ -28,7 +46,12 @@ class StatusCreateView(LoginRequiredMixin, SuccessMessageMixin, CreateView):
     success_message = _('Status successfully created')
 
 
-class StatusUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
+class StatusUpdateView(
+    LoginRequiredMixin,
+    SuccessMessageMixin,
+    ObjectCacheMixin,
+    UpdateView
+    ):
     model = Status
     form_class = StatusForm
     template_name = 'statuses/update.html'
@@ -36,11 +59,18 @@ class StatusUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
     success_message = _('Status successfully updated')
 
 
-class StatusDeleteView(LoginRequiredMixin, SuccessMessageMixin, DeleteView):
+class StatusDeleteView(
+    LoginRequiredMixin,
+    SuccessMessageMixin,
+    ObjectCacheMixin,
+    ProtectedDeleteMixin,
+    DeleteView
+    ):
     model = Status
     template_name = 'statuses/delete.html'
     success_url = STATUSES_URL
     success_message = _('Status successfully deleted')
+    protected_message = _('Cannot delete status because it is in use')
 
     def form_valid(self, form):
         try:
@@ -4,4 +4,6 @@ from django.apps import AppConfig
 class TasksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'task_manager.tasks'
-    
+
+    def ready(self):
+        from task_manager.tasks import signals  # noqa: F401
@@ -0,0 +1,110 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from task_manager.tasks import counters, sort_keys
+from task_manager.tasks.choices import invalidate_choices
+from task_manager.tasks.dashboard import (
+    delta_users,
+    invalidate_dashboards,
+    queryset_users,
+)
+from task_manager.tasks.models import Task, TaskCounter
+
+Through = Task.labels.through
+
+
+def lock_ids(tasks):
+    return list(tasks.select_for_update().values_list('id', flat=True))
+
+
+def touch(task_ids):
+    # Label changes bypass Task.save(), keep updated_at in step by hand
+    invalidate_choices(Task)
+    return Task.objects.filter(id__in=task_ids).update(
+        updated_at=timezone.now()
+    )
+
+
+def label_links(task_ids, labels):
+    return Counter(dict(
+        Through.objects.filter(task_id__in=task_ids, label__in=labels)
+        .values('label_id').order_by().annotate(total=Count('id'))
+        .values_list('label_id', 'total')
+    ))
+
+
+def set_field(tasks, kind, value):
+    field = counters.COUNTED_FIELDS[kind]
+    with transaction.atomic():
+        tasks = Task.objects.filter(id__in=lock_ids(tasks))
+        deltas = counters.queryset_deltas(
+            tasks, -1, fields={kind: field}, labels=False
+        )
+        users = queryset_users(tasks)
+        updated = tasks.update(**{
+            field: value.pk if value else None,
+            sort_keys.KEY_FIELDS[field]: str(value) if value else None,
+            'updated_at': timezone.now(),
+        })
+        deltas[kind, value.pk if value else None] += updated
+        counters.apply_deltas(deltas)
+        invalidate_choices(Task)
+    if kind == TaskCounter.EXECUTOR and value:
+        users.add(value.pk)
+    invalidate_dashboards(users)
+    return updated
+
+
+def set_status(tasks, status):
+    return set_field(tasks, TaskCounter.STATUS, status)
+
+
+def set_executor(tasks, executor):
+    return set_field(tasks, TaskCounter.EXECUTOR, executor)
+
+
+def add_labels(tasks, labels):
+    with transaction.atomic():
+        task_ids = lock_ids(tasks)
+        existing = label_links(task_ids, labels)
+        Through.objects.bulk_create(
+            [
+                Through(task_id=task_id, label_id=label.id)
+                for task_id in task_ids
+                for label in labels
+            ],
+            ignore_conflicts=True,
+        )
+        counters.apply_deltas(Counter({
+            (TaskCounter.LABEL, label.id): len(task_ids) - existing[label.id]
+            for label in labels
+        }))
+        return touch(task_ids)
+
+
+def remove_labels(tasks, labels):
+    with transaction.atomic(), counters.suspended():
+        task_ids = lock_ids(tasks)
+        removed = label_links(task_ids, labels)
+        Through.objects.filter(
+            task_id__in=task_ids, label__in=labels
+        ).delete()
+        counters.apply_deltas(Counter({
+            (TaskCounter.LABEL, label_id): -total
+            for label_id, total in removed.items()
+        }))
+        return touch(task_ids)
+
+
+def delete(tasks):
+    with transaction.atomic(), counters.suspended():
+        tasks = Task.objects.filter(id__in=lock_ids(tasks))
+        deltas = counters.queryset_deltas(tasks, -1)
+        _total, deleted = tasks.delete()
+        counters.apply_deltas(deltas)
+        invalidate_choices(Task)
+    invalidate_dashboards(delta_users(deltas))
+    return deleted.get(Task._meta.label, 0)
@@ -0,0 +1,224 @@
+import hashlib
+import time
+
+from django import forms
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django_filters import ModelChoiceFilter, ModelMultipleChoiceFilter
+from django_filters import fields as filter_fields
+
+from task_manager.cache import get_cache
+from task_manager.routers import REPLICA_DB_ALIAS, has_replica
+
+CHOICES_TIMEOUT = 60 * 60
+
+
+def _cache(model):
+    return get_cache(model._meta.app_label)
+
+
+def _version_key(model):
+    return f'choices:{model._meta.model_name}:version'
+
+
+def _changed_key(model):
+    return f'choices:{model._meta.model_name}:changed'
+
+
+def get_choices_version(model):
+    """
+    The version of the rows of ``model``, bumped by ``invalidate_choices``
+    on every change: it keys the cached choice lists, and the ETags of
+    the pages that show the rows.
+    """
+    cache = _cache(model)
+    key = _version_key(model)
+    version = cache.get(key)
+    if version is None:
+        # A fresh version never matches entries left over from a lost key
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_choices(model):
+    """
+    Bump the choice version of ``model`` once the current transaction
+    commits: bumped earlier, a concurrent reader could cache the rows
+    before the change under the new version.
+    """
+    def bump():
+        try:
+            _cache(model).incr(_version_key(model))
+        except ValueError:
+            get_choices_version(model)
+        if has_replica():
+            _cache(model).set(
+                _changed_key(model), True, settings.REPLICA_PIN_SECONDS
+            )
+
+    transaction.on_commit(bump)
+
+
+def replica_may_lag(model):
+    """
+    Whether the replica may not have caught up with the change that
+    bumped the version of ``model`` last: a page read from it would not
+    match that version yet.
+    """
+    return has_replica() and _cache(model).get(_changed_key(model)) is True
+
+
+def get_choices(queryset):
+    """
+    ``(pk, label)`` of the objects of ``queryset``, cached until the
+    choice version of its model changes. Only the labels are cached,
+    never the objects and whatever else their rows hold.
+    """
+    model = queryset.model
+    cache = _cache(model)
+    sql = hashlib.md5(str(queryset.query).encode()).hexdigest()
+    database = queryset.db
+    key = f'choices:{model._meta.model_name}:{database}:{sql}'
+    version = get_choices_version(model)
+    choices = cache.get(key, version=version)
+    if choices is None:
+        choices = [(obj.pk, str(obj)) for obj in queryset]
+        timeout = CHOICES_TIMEOUT
+        if database == REPLICA_DB_ALIAS:
+            # The replica may not have caught up with the change that
+            # bumped the version yet
+            timeout = settings.REPLICA_PIN_SECONDS
+        cache.set(key, choices, timeout, version=version)
+    return choices
+
+
+def instance_from_pk(queryset, pk):
+    """
+    An object of ``queryset`` known by its primary key alone; its other
+    fields are deferred and load on first access.
+    """
+    model = queryset.model
+    return model.from_db(queryset.db, [model._meta.pk.attname], [pk])
+
+
+class CachedModelChoiceIterator(forms.models.ModelChoiceIterator):
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        for pk, label in get_choices(self.queryset):
+            yield (
+                forms.models.ModelChoiceIteratorValue(
+                    pk, instance_from_pk(self.queryset, pk)
+                ),
+                self.field.label_with_facets(pk, label),
+            )
+
+    def __len__(self):
+        empty = 1 if self.field.empty_label is not None else 0
+        return len(get_choices(self.queryset)) + empty
+
+    def __bool__(self):
+        return (
+            self.field.empty_label is not None
+            or bool(get_choices(self.queryset))
+        )
+
+
+class FacetLabelMixin:
+    """
+    Show ``facet_counts[pk]``, when set, after the label of each option.
+    """
+
+    facet_counts = None
+
+    def label_from_instance(self, obj):
+        return self.label_with_facets(
+            obj.pk, super().label_from_instance(obj)
+        )
+
+    def label_with_facets(self, pk, label):
+        if self.facet_counts is None:
+            return label
+        return f'{label} ({self.facet_counts.get(pk, 0)})'
+
+
+class CachedModelChoiceField(FacetLabelMixin, forms.ModelChoiceField):
+    iterator = CachedModelChoiceIterator
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        if isinstance(value, self.queryset.model):
+            value = value.pk
+        for pk, _label in get_choices(self.queryset):
+            if str(pk) == str(value):
+                return instance_from_pk(self.queryset, pk)
+        raise ValidationError(
+            self.error_messages['invalid_choice'],
+            code='invalid_choice',
+        )
+
+
+class CachedFilterChoiceIterator(
+    filter_fields.ModelChoiceIterator,
+    CachedModelChoiceIterator
+):
+    pass
+
+
+class CachedFilterChoiceField(
+    filter_fields.ModelChoiceField,
+    CachedModelChoiceField
+):
+    iterator = CachedFilterChoiceIterator
+
+
+class CachedModelChoiceFilter(ModelChoiceFilter):
+    field_class = CachedFilterChoiceField
+
+
+class AutocompleteChoiceField(FacetLabelMixin, forms.ModelChoiceField):
+    """
+    For choices too many to list: one query validates the selected
+    object, which the widget, an ``AutocompleteSelect``, renders alone.
+    """
+
+    def clean(self, value):
+        obj = super().clean(value)
+        self.widget.validated = [] if obj is None else [obj]
+        return obj
+
+
+class AutocompleteMultipleChoiceField(
+    FacetLabelMixin,
+    forms.ModelMultipleChoiceField
+):
+    def clean(self, value):
+        objects = super().clean(value)
+        # Fetched by the validation already
+        self.widget.validated = list(objects)
+        return objects
+
+
+class AutocompleteFilterChoiceField(
+    filter_fields.ModelChoiceField,
+    AutocompleteChoiceField
+):
+    pass
+
+
+class AutocompleteChoiceFilter(ModelChoiceFilter):
+    field_class = AutocompleteFilterChoiceField
+
+
+class AutocompleteFilterMultipleChoiceField(
+    filter_fields.ModelMultipleChoiceField,
+    AutocompleteMultipleChoiceField
+):
+    pass
+
+
+class AutocompleteMultipleChoiceFilter(ModelMultipleChoiceFilter):
+    field_class = AutocompleteFilterMultipleChoiceField
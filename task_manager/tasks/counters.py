@@ -0,0 +1,146 @@
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from task_manager.tasks.models import Task, TaskCounter
+
+Through = Task.labels.through
+
+# Task foreign keys with a counter, by counter kind
+COUNTED_FIELDS = {
+    TaskCounter.STATUS: 'status_id',
+    TaskCounter.AUTHOR: 'author_id',
+    TaskCounter.EXECUTOR: 'executor_id',
+}
+
+_state = threading.local()
+
+
+@contextmanager
+def suspended():
+    """
+    Mute the signal handlers while a bulk operation applies its own
+    grouped deltas with ``apply_deltas``.
+    """
+    previous = is_suspended()
+    _state.suspended = True
+    try:
+        yield
+    finally:
+        _state.suspended = previous
+
+
+def is_suspended():
+    return getattr(_state, 'suspended', False)
+
+
+def get_counts(kind):
+    return dict(
+        TaskCounter.objects.filter(kind=kind)
+        .values_list('object_id', 'count')
+    )
+
+
+def get_count(kind, object_id):
+    counter = TaskCounter.objects.filter(
+        kind=kind, object_id=object_id
+    ).values_list('count', flat=True).first()
+    return counter or 0
+
+
+def annotate_count(queryset, kind, name):
+    """
+    Annotate ``name`` with the counter of ``kind`` of each row: one lookup
+    of the unique (kind, object_id) index per row, none of the tasks.
+    """
+    counter = TaskCounter.objects.filter(
+        kind=kind, object_id=OuterRef('pk')
+    ).values('count')[:1]
+    return queryset.annotate(**{name: Coalesce(Subquery(counter), 0)})
+
+
+def apply_deltas(deltas):
+    """Add ``{(kind, object_id): delta}`` to the counters."""
+    deltas = sorted(
+        (key, delta) for key, delta in deltas.items()
+        if key[1] is not None and delta
+    )
+    with transaction.atomic(savepoint=False):
+        for (kind, object_id), delta in deltas:
+            counters = TaskCounter.objects.filter(
+                kind=kind, object_id=object_id
+            )
+            if counters.update(count=F('count') + delta):
+                continue
+            try:
+                with transaction.atomic():
+                    TaskCounter.objects.create(
+                        kind=kind, object_id=object_id, count=delta
+                    )
+            except IntegrityError:
+                # Created concurrently since the update above
+                counters.update(count=F('count') + delta)
+
+
+def task_deltas(tasks, sign=1):
+    deltas = Counter()
+    for task in tasks:
+        for kind, field in COUNTED_FIELDS.items():
+            deltas[kind, getattr(task, field)] += sign
+    return deltas
+
+
+def label_deltas(label_ids, sign=1):
+    deltas = Counter()
+    for label_id in label_ids:
+        deltas[TaskCounter.LABEL, label_id] += sign
+    return deltas
+
+
+def queryset_deltas(tasks, sign=1, fields=COUNTED_FIELDS, labels=True):
+    """Grouped counts of ``tasks``, one query per counter kind."""
+    deltas = Counter()
+    for kind, field in fields.items():
+        rows = tasks.order_by().values(field).annotate(total=Count('id'))
+        for row in rows:
+            deltas[kind, row[field]] += sign * row['total']
+    if labels:
+        rows = Through.objects.filter(task__in=tasks.values('id')).values(
+            'label_id'
+        ).order_by().annotate(total=Count('id'))
+        for row in rows:
+            deltas[TaskCounter.LABEL, row['label_id']] += sign * row['total']
+    return deltas
+
+
+def compute_counts(chunk_size):
+    """
+    Recount every counter from the tasks table, reading it in id ranges
+    of ``chunk_size`` so that no single query scans the whole table.
+    """
+    counts = Counter()
+    last_id = 0
+    while True:
+        ids = list(
+            Task.objects.filter(id__gt=last_id).order_by('id')
+            .values_list('id', flat=True)[:chunk_size]
+        )
+        if not ids:
+            return counts
+        chunk = Task.objects.filter(id__gte=ids[0], id__lte=ids[-1])
+        counts.update(queryset_deltas(chunk))
+        last_id = ids[-1]
+
+
+def save_counts(counts):
+    with transaction.atomic():
+        TaskCounter.objects.all().delete()
+        TaskCounter.objects.bulk_create([
+            TaskCounter(kind=kind, object_id=object_id, count=count)
+            for (kind, object_id), count in counts.items()
+            if object_id is not None and count
+        ])
@@ -0,0 +1,119 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, Q
+
+from task_manager.cache import get_cache
+from task_manager.statuses.models import Status
+from task_manager.tasks.choices import get_choices, get_choices_version
+from task_manager.tasks.models import Task, TaskCounter
+
+User = get_user_model()
+
+DASHBOARD_TIMEOUT = 60 * 60
+RECENT_TASKS_COUNT = 10
+
+
+def _version_key(user_id):
+    return f'dashboard:{user_id}:version'
+
+
+def get_dashboard_version(user_id):
+    cache = get_cache('tasks')
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # A fresh version never matches entries left over from a lost key
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_dashboards(user_ids):
+    """
+    Bump the dashboard versions of ``user_ids`` once the current
+    transaction commits, as ``invalidate_choices`` does.
+    """
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+
+    def bump():
+        cache = get_cache('tasks')
+        for user_id in user_ids:
+            try:
+                cache.incr(_version_key(user_id))
+            except ValueError:
+                # Nothing is cached under a missing version
+                pass
+
+    if user_ids:
+        transaction.on_commit(bump)
+
+
+def delta_users(deltas):
+    """The authors and executors touched by counter ``deltas``."""
+    return {
+        object_id for kind, object_id in deltas
+        if kind in (TaskCounter.AUTHOR, TaskCounter.EXECUTOR)
+    }
+
+
+def queryset_users(tasks):
+    users = set()
+    for author_id, executor_id in tasks.order_by().values_list(
+        'author_id', 'executor_id'
+    ).distinct():
+        users.update((author_id, executor_id))
+    return users
+
+
+def build_dashboard(user):
+    """
+    Count the tasks ``user`` executes and authors per status in one
+    grouped query, and load the latest of those tasks in another.
+    """
+    own = Task.objects.filter(Q(executor=user) | Q(author=user))
+    rows = {
+        row['status_id']: row
+        for row in own.order_by().values('status_id').annotate(
+            assigned=Count('id', filter=Q(executor=user)),
+            authored=Count('id', filter=Q(author=user)),
+        )
+    }
+    by_status = [
+        {
+            'status': Status(pk=pk, name=name),
+            'assigned': rows[pk]['assigned'],
+            'authored': rows[pk]['authored'],
+        }
+        for pk, name in get_choices(Status.objects.all())
+        if pk in rows
+    ]
+    recent = list(
+        own.select_related('status', 'author', 'executor')
+        .order_by('-created_at', '-id')[:RECENT_TASKS_COUNT]
+    )
+    return {
+        'by_status': by_status,
+        'assigned': sum(row['assigned'] for row in by_status),
+        'authored': sum(row['authored'] for row in by_status),
+        'recent': recent,
+    }
+
+
+def get_dashboard(user):
+    """
+    The dashboard of ``user``, cached until a task they author or
+    execute changes, or a status or user is renamed.
+    """
+    cache = get_cache('tasks')
+    key = (
+        f'dashboard:{user.pk}:{get_choices_version(Status)}:'
+        f'{get_choices_version(User)}'
+    )
+    version = get_dashboard_version(user.pk)
+    dashboard = cache.get(key, version=version)
+    if dashboard is None:
+        dashboard = build_dashboard(user)
+        cache.set(key, dashboard, DASHBOARD_TIMEOUT, version=version)
+    return dashboard
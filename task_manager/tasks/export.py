@@ -0,0 +1,56 @@
+import csv
+import json
+
+EXPORT_FIELDS = [
+    'id',
+    'name',
+    'description',
+    'status',
+    'author',
+    'executor',
+    'labels',
+    'created_at',
+]
+
+LABELS_SEPARATOR = ', '
+
+EXPORT_CHUNK_SIZE = 500
+
+
+def serialize_task(task):
+    return {
+        'id': task.id,
+        'name': task.name,
+        'description': task.description,
+        'status': task.status.name,
+        'author': task.author.username,
+        'executor': task.executor.username if task.executor else None,
+        'labels': [label.name for label in task.labels.all()],
+        'created_at': task.created_at.isoformat(),
+    }
+
+
+class Echo:
+    # csv.writer only needs write(); hand each line back to the generator
+    def write(self, value):
+        return value
+
+
+def stream_csv(tasks):
+    writer = csv.DictWriter(Echo(), fieldnames=EXPORT_FIELDS)
+    yield writer.writeheader()
+    for task in tasks:
+        row = serialize_task(task)
+        row['labels'] = LABELS_SEPARATOR.join(row['labels'])
+        yield writer.writerow(row)
+
+
+def stream_jsonl(tasks):
+    for task in tasks:
+        yield json.dumps(serialize_task(task), ensure_ascii=False) + '\n'
+
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv; charset=utf-8', stream_csv),
+    'jsonl': ('application/jsonl; charset=utf-8', stream_jsonl),
+}
@@ -0,0 +1,105 @@
+from collections import defaultdict
+
+from django.db.models import Count, Model, Q
+
+from task_manager.autocomplete import AutocompleteMixin
+from task_manager.tasks.models import TaskCounter
+
+# Filter fields with counts next to their options: the counter kind and
+# the value to group the tasks by
+FACETS = {
+    'status': (TaskCounter.STATUS, 'status_id'),
+    'executor': (TaskCounter.EXECUTOR, 'executor_id'),
+    'labels': (TaskCounter.LABEL, 'labels'),
+}
+
+# Fields that only refine another filter, ignored together with it
+DEPENDENT_FILTERS = {
+    'labels': {'labels_match'},
+}
+
+
+def get_active_filters(filterset):
+    return {
+        name: value
+        for name, value in filterset.form.cleaned_data.items()
+        # An empty multiple choice cleans to an empty queryset
+        if value
+    }
+
+
+def get_facet_options(filterset, name, active):
+    """
+    Primary keys of the options of ``name`` the form renders, ``None``
+    for all of them: autocomplete widgets render the selected ones only.
+    """
+    if not isinstance(filterset.form.fields[name].widget, AutocompleteMixin):
+        return None
+    value = active.get(name, ())
+    if isinstance(value, Model):
+        value = [value]
+    return {obj.pk for obj in value}
+
+
+def filter_without(filterset, active, excluded):
+    # Only grouped values are read, nothing to prefetch
+    tasks = filterset.queryset.prefetch_related(None)
+    for name, value in active.items():
+        if name not in excluded:
+            tasks = filterset.filters[name].filter(tasks, value)
+    return tasks
+
+
+def count_by(tasks, field):
+    # A join for the labels: a subquery would lose the table name that
+    # the search conditions refer to
+    rows = tasks.order_by().values(field).annotate(total=Count('id'))
+    return {
+        row[field]: row['total'] for row in rows if row[field] is not None
+    }
+
+
+def get_facets(filterset):
+    """
+    ``{field: {object_id: count}}`` for the fields of ``FACETS``: how many
+    tasks each option would leave under the other active filters, its own
+    field ignored, for the options the form renders. Facets with no other
+    active filter are read from the task counters, all of them in one
+    query; each of the others costs one grouped query, so the total never
+    depends on the number of options.
+    """
+    active = get_active_filters(filterset)
+    facets = {}
+    unfiltered = {}
+    for name, (_kind, field) in FACETS.items():
+        options = get_facet_options(filterset, name, active)
+        if options is not None and not options:
+            facets[name] = {}
+            continue
+        excluded = {name, *DEPENDENT_FILTERS.get(name, ())}
+        if active.keys() - excluded:
+            tasks = filter_without(filterset, active, excluded)
+            if options is not None:
+                tasks = tasks.filter(**{f'{field}__in': options})
+            facets[name] = count_by(tasks, field)
+        else:
+            unfiltered[name] = options
+
+    if unfiltered:
+        kinds = {FACETS[name][0]: name for name in unfiltered}
+        condition = Q()
+        for kind, name in kinds.items():
+            options = unfiltered[name]
+            if options is None:
+                condition |= Q(kind=kind)
+            else:
+                condition |= Q(kind=kind, object_id__in=options)
+        counts = defaultdict(dict)
+        rows = TaskCounter.objects.filter(condition).values_list(
+            'kind', 'object_id', 'count'
+        )
+        for kind, object_id, count in rows:
+            counts[kind][object_id] = count
+        for kind, name in kinds.items():
+            facets[name] = counts[kind]
+    return facets
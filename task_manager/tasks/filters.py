@@ -1,32 +1,108 @@
 import django_filters
 from django import forms
 from django.contrib.auth import get_user_model
+from django.db.models import Count, Exists, OuterRef
 from django.utils.translation import gettext_lazy as _
 
+from task_manager.autocomplete import (
+    AutocompleteSelect,
+    AutocompleteSelectMultiple,
+)
 from task_manager.labels.models import Label
 from task_manager.statuses.models import Status
+from task_manager.tasks.choices import (
+    AutocompleteChoiceFilter,
+    AutocompleteMultipleChoiceFilter,
+    CachedModelChoiceFilter,
+)
+from task_manager.tasks.forms import (
+    LABELS_AUTOCOMPLETE_URL,
+    USERS_AUTOCOMPLETE_URL,
+)
 from task_manager.tasks.models import Task
+from task_manager.tasks.search import search_tasks
 
 User = get_user_model()
 
+LABELS_ANY = 'any'
+LABELS_ALL = 'all'
+
+# Keyset orderings of the task list columns, each one the leading columns
+# of an index of Task.Meta so a page of either direction is read straight
+# from the index; relations sort by the names the columns show, stored on
+# the task by task_manager.tasks.sort_keys
+TASK_SORTS = {
+    'name': ['name', 'id'],
+    'status': ['status_name', 'created_at', 'id'],
+    'executor': ['executor_name', 'created_at', 'id'],
+    'author': ['author_name', 'created_at', 'id'],
+    'created': ['created_at', 'id'],
+}
+
+
+def filter_tasks_by_labels(tasks, labels, match_all=False):
+    """
+    Tasks with any or, with ``match_all``, every one of ``labels``, using
+    one subquery over the task-label table instead of a join per label:
+    rows are never duplicated and nothing needs DISTINCT.
+
+    "Any" is an EXISTS answered by the (task_id, label_id) index, so a
+    page stops as soon as it is full. "All" groups the links of the
+    selected labels once and keeps the tasks that have all of them; an
+    EXISTS with the same grouping would be run again for every task.
+    """
+    label_ids = {label.pk for label in labels}
+    links = Task.labels.through.objects.filter(label_id__in=label_ids)
+    if not match_all:
+        return tasks.filter(Exists(links.filter(task_id=OuterRef('pk'))))
+    return tasks.filter(pk__in=links.values('task_id').annotate(
+        matched=Count('label_id')
+    ).filter(matched=len(label_ids)).values('task_id'))
+
 
 class TaskFilter(django_filters.FilterSet):
-    status = django_filters.ModelChoiceFilter(
+    search = django_filters.CharFilter(
+        method='filter_search',
+        label=_('Search'),
+        widget=forms.TextInput(
+            attrs={'class': 'form-control', 'type': 'search'}
+        )
+    )
+
+    status = CachedModelChoiceFilter(
         queryset=Status.objects.all(),
         label=_('Status'),
         widget=forms.Select(attrs={'class': 'form-control'})
     )
     
-    executor = django_filters.ModelChoiceFilter(
+    executor = AutocompleteChoiceFilter(
         queryset=User.objects.all(),
         label=_('Executor'),
-        widget=forms.Select(attrs={'class': 'form-control'})
+        widget=AutocompleteSelect(
+            USERS_AUTOCOMPLETE_URL,
+            attrs={'class': 'form-control'}
+        )
     )
     
-    labels = django_filters.ModelChoiceFilter(
+    labels = AutocompleteMultipleChoiceFilter(
         queryset=Label.objects.all(),
-        label=_('Label'),
-        widget=forms.Select(attrs={'class': 'form-control'})
+        method='filter_labels',
+        label=_('Labels'),
+        widget=AutocompleteSelectMultiple(
+            LABELS_AUTOCOMPLETE_URL,
+            attrs={'class': 'form-control'}
+        )
+    )
+
+    labels_match = django_filters.ChoiceFilter(
+        choices=[
+            (LABELS_ANY, _('Any of the labels')),
+            (LABELS_ALL, _('All of the labels')),
+        ],
+        method='filter_labels_match',
+        empty_label=None,
+        label=_('Labels match'),
+        widget=forms.Select(attrs={'class': 'form-control mt-2'})
     )
     
     self_tasks = django_filters.BooleanFilter(
@@ -39,6 +115,25 @@ class TaskFilter(django_filters.FilterSet):
         model = Task
         fields = ['status', 'executor', 'labels']
 
+    def set_facets(self, facets):
+        """Show the counts of ``get_facets()`` next to the options."""
+        for name, counts in facets.items():
+            self.form.fields[name].facet_counts = counts
+
+    def filter_search(self, queryset, name, value):
+        return search_tasks(queryset, value)
+
+    def filter_labels(self, queryset, name, value):
+        # No labels selected cleans to an empty queryset, not to None
+        if not value:
+            return queryset
+        match_all = self.form.cleaned_data.get('labels_match') == LABELS_ALL
+        return filter_tasks_by_labels(queryset, value, match_all=match_all)
+
+    def filter_labels_match(self, queryset, name, value):
+        # Applied by filter_labels
+        return queryset
+
     def filter_self_tasks(self, queryset, name, value):
         if value:
             return queryset.filter(author=self.request.user)
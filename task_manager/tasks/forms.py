@@ -1,11 +1,26 @@
 from django import forms
 from django.contrib.auth import get_user_model
+from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 
+from task_manager.autocomplete import (
+    AutocompleteSelect,
+    AutocompleteSelectMultiple,
+)
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.choices import (
+    AutocompleteChoiceField,
+    AutocompleteMultipleChoiceField,
+    CachedModelChoiceField,
+)
 from task_manager.tasks.models import Task
 
 User = get_user_model()
 
+USERS_AUTOCOMPLETE_URL = reverse_lazy('users_autocomplete')
+LABELS_AUTOCOMPLETE_URL = reverse_lazy('labels_autocomplete')
+
 
 class TaskForm(forms.ModelForm):
     class Meta:
@@ -18,6 +33,11 @@ class TaskForm(forms.ModelForm):
             'executor': _('Executor'),
             'labels': _('Labels'),
         }
+        field_classes = {
+            'status': CachedModelChoiceField,
+            'executor': AutocompleteChoiceField,
+            'labels': AutocompleteMultipleChoiceField,
+        }
         widgets = {
             'name': forms.TextInput(attrs={'class': 'form-control'}),
             'description': forms.Textarea(attrs={
@@ -25,8 +45,14 @@ class TaskForm(forms.ModelForm):
                 'rows': 4
             }),
             'status': forms.Select(attrs={'class': 'form-control'}),
-            'executor': forms.Select(attrs={'class': 'form-control'}),
-            'labels': forms.SelectMultiple(attrs={'class': 'form-control'}),
+            'executor': AutocompleteSelect(
+                USERS_AUTOCOMPLETE_URL,
+                attrs={'class': 'form-control'}
+            ),
+            'labels': AutocompleteSelectMultiple(
+                LABELS_AUTOCOMPLETE_URL,
+                attrs={'class': 'form-control'}
+            ),
         }
 
     def __init__(self, *args, **kwargs):
@@ -34,4 +60,77 @@ class TaskForm(forms.ModelForm):
         self.fields['executor'].queryset = User.objects.all()
         self.fields['executor'].required = False
         self.fields['executor'].empty_label = _('Not assigned')
-        self.fields['labels'].required = False
\ No newline at end of file
+        self.fields['labels'].required = False
+
+
+class TaskIdsField(forms.Field):
+    widget = forms.MultipleHiddenInput
+
+    def to_python(self, value):
+        if not value:
+            return []
+        try:
+            return sorted({int(pk) for pk in value})
+        except (TypeError, ValueError):
+            raise forms.ValidationError(
+                _('Select tasks from the list'),
+                code='invalid',
+            )
+
+
+class TaskBulkActionForm(forms.Form):
+    SET_STATUS = 'set_status'
+    SET_EXECUTOR = 'set_executor'
+    ADD_LABELS = 'add_labels'
+    REMOVE_LABELS = 'remove_labels'
+    DELETE = 'delete'
+
+    tasks = TaskIdsField(
+        error_messages={'required': _('Select tasks from the list')}
+    )
+    action = forms.ChoiceField(
+        label=_('Action'),
+        choices=[
+            (SET_STATUS, _('Change status')),
+            (SET_EXECUTOR, _('Change executor')),
+            (ADD_LABELS, _('Add labels')),
+            (REMOVE_LABELS, _('Remove labels')),
+            (DELETE, _('Delete')),
+        ],
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+    status = CachedModelChoiceField(
+        queryset=Status.objects.all(),
+        label=_('Status'),
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+    executor = AutocompleteChoiceField(
+        queryset=User.objects.all(),
+        label=_('Executor'),
+        required=False,
+        empty_label=_('Not assigned'),
+        widget=AutocompleteSelect(
+            USERS_AUTOCOMPLETE_URL,
+            attrs={'class': 'form-control'}
+        )
+    )
+    labels = AutocompleteMultipleChoiceField(
+        queryset=Label.objects.all(),
+        label=_('Labels'),
+        required=False,
+        widget=AutocompleteSelectMultiple(
+            LABELS_AUTOCOMPLETE_URL,
+            attrs={'class': 'form-control'}
+        )
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        action = cleaned_data.get('action')
+        if action == self.SET_STATUS and not cleaned_data.get('status'):
+            self.add_error('status', _('Choose a status'))
+        if action in (self.ADD_LABELS, self.REMOVE_LABELS) \
+                and not cleaned_data.get('labels'):
+            self.add_error('labels', _('Choose labels'))
+        return cleaned_data
@@ -0,0 +1,122 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+
+from task_manager.labels.models import Label
+from task_manager.management.commands.benchmark_views import percentile
+from task_manager.tasks.filters import filter_tasks_by_labels
+from task_manager.tasks.models import Task
+
+MATCHES = ('any', 'all')
+
+
+def join_labels(tasks, labels, match_all=False):
+    """The join per label the label filter used to be built on."""
+    if not match_all:
+        return tasks.filter(labels__in=labels).distinct()
+    for label in labels:
+        tasks = tasks.filter(labels=label)
+    return tasks
+
+
+STRATEGIES = {
+    'subquery': filter_tasks_by_labels,
+    'join': join_labels,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Time the first page and the count of the task list filtered by '
+        'a growing number of labels, with the subqueries of TaskFilter and '
+        'with the joins they replace'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--label-counts',
+            type=int,
+            nargs='+',
+            default=[1, 2, 4, 8],
+            help='Numbers of selected labels, the most used first',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Timed runs per combination',
+        )
+        parser.add_argument('--page-size', type=int, default=50)
+        parser.add_argument(
+            '--strategies',
+            nargs='+',
+            choices=STRATEGIES,
+            default=list(STRATEGIES),
+        )
+
+    def handle(self, *args, **options):
+        if options['repeat'] <= 0:
+            raise CommandError('--repeat must be positive')
+        label_counts = sorted(set(options['label_counts']))
+        if label_counts[0] <= 0:
+            raise CommandError('--label-counts must be positive')
+        # The most used labels match the most tasks, the worst case
+        labels = list(
+            Label.objects.annotate(used=Count('tasks'))
+            .order_by('-used', 'pk')[:label_counts[-1]]
+        )
+        if len(labels) < label_counts[-1]:
+            raise CommandError(
+                f'Only {len(labels)} labels exist, run seed_data with more'
+            )
+
+        self.stdout.write(
+            f'{Task.objects.count()} tasks, {Label.objects.count()} labels'
+        )
+        self.stdout.write(
+            f'{"match":<6}{"labels":>7}{"strategy":>10}{"rows":>8}'
+            f'{"page p50":>10}{"page p95":>10}{"count p50":>11}'
+            f'{"count p95":>11}'
+        )
+        for match in MATCHES:
+            for count in label_counts:
+                for strategy in options['strategies']:
+                    tasks = STRATEGIES[strategy](
+                        Task.objects.all(),
+                        labels[:count],
+                        match_all=match == 'all',
+                    )
+                    self.report(
+                        match,
+                        count,
+                        strategy,
+                        self.measure(
+                            tasks, options['page_size'], options['repeat']
+                        ),
+                    )
+
+    def measure(self, tasks, page_size, repeat):
+        page = tasks.order_by('created_at', 'id')[:page_size]
+        page_timings, count_timings = [], []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            list(page.all())
+            page_timings.append((time.perf_counter() - started) * 1000)
+            started = time.perf_counter()
+            rows = tasks.count()
+            count_timings.append((time.perf_counter() - started) * 1000)
+        return {
+            'rows': rows,
+            'page_p50_ms': percentile(page_timings, 50),
+            'page_p95_ms': percentile(page_timings, 95),
+            'count_p50_ms': percentile(count_timings, 50),
+            'count_p95_ms': percentile(count_timings, 95),
+        }
+
+    def report(self, match, count, strategy, result):
+        self.stdout.write(
+            f'{match:<6}{count:>7}{strategy:>10}{result["rows"]:>8}'
+            f'{result["page_p50_ms"]:>10.2f}{result["page_p95_ms"]:>10.2f}'
+            f'{result["count_p50_ms"]:>11.2f}{result["count_p95_ms"]:>11.2f}'
+        )
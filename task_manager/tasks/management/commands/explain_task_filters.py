@@ -0,0 +1,168 @@
+from itertools import combinations
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+
+from task_manager.pagination import reverse_ordering
+from task_manager.tasks.filters import LABELS_ALL, TASK_SORTS, TaskFilter
+from task_manager.tasks.models import Task
+
+User = get_user_model()
+
+FILTERS = ['status', 'executor', 'labels', 'labels_match', 'self_tasks']
+
+FULL_SCAN_MARKERS = {
+    'sqlite': lambda line, table: (
+        f'SCAN {table}' in line and 'USING' not in line
+    ),
+    'postgresql': lambda line, table: f'Seq Scan on {table}' in line,
+}
+
+SORT_MARKERS = {
+    'sqlite': 'USE TEMP B-TREE FOR ORDER BY',
+    'postgresql': 'Sort Key:',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Print EXPLAIN output of the task list query for every '
+        'combination of TaskFilter fields'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=50,
+            help='LIMIT of the explained page query',
+        )
+        parser.add_argument(
+            '--sort',
+            choices=[*TASK_SORTS, *(f'-{name}' for name in TASK_SORTS)],
+            default='created',
+            help='Column the page is sorted by, "-" prefix for descending',
+        )
+        parser.add_argument(
+            '--analyze',
+            action='store_true',
+            help='Run EXPLAIN ANALYZE (PostgreSQL only)',
+        )
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Exit with an error if any combination scans a full table',
+        )
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        if vendor not in FULL_SCAN_MARKERS:
+            raise CommandError(f'Unsupported database backend: {vendor}')
+        values = self.get_sample_values()
+        if values is None:
+            raise CommandError('There are no tasks to explain')
+
+        if options['analyze'] and vendor != 'postgresql':
+            raise CommandError('--analyze requires PostgreSQL')
+        explain_options = (
+            {'analyze': True, 'buffers': True} if options['analyze'] else {}
+        )
+
+        ordering = TASK_SORTS[options['sort'].removeprefix('-')]
+        if options['sort'].startswith('-'):
+            ordering = reverse_ordering(ordering)
+
+        full_scans = []
+        for combination in self.get_combinations():
+            plan = self.explain(
+                combination,
+                values,
+                ordering,
+                options['page_size'],
+                explain_options,
+            )
+            if self.report(vendor, combination, plan):
+                full_scans.append(', '.join(combination))
+
+        if full_scans and options['check']:
+            raise CommandError(
+                'Full table scans in: ' + '; '.join(full_scans)
+            )
+        if not full_scans:
+            self.stdout.write(self.style.SUCCESS(
+                'Every filter combination is served by an index'
+            ))
+
+    def explain(
+        self, combination, values, ordering, page_size, explain_options
+    ):
+        filterset = TaskFilter(
+            data={name: values[name] for name in combination},
+            queryset=Task.objects.all(),
+            request=SimpleNamespace(user=values['user']),
+        )
+        if not filterset.is_valid():
+            raise CommandError(filterset.errors.as_text())
+        queryset = filterset.qs.order_by(*ordering)
+        return queryset[:page_size].explain(**explain_options)
+
+    def report(self, vendor, combination, plan):
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            ', '.join(combination) or 'no filters'
+        ))
+        self.stdout.write(plan)
+        scanned = self.get_full_scans(vendor, plan)
+        if scanned:
+            self.stdout.write(self.style.WARNING(
+                f'Full scan of {", ".join(scanned)}'
+            ))
+        if SORT_MARKERS[vendor] in plan:
+            self.stdout.write(self.style.NOTICE(
+                'Matching rows are sorted before LIMIT is applied'
+            ))
+        self.stdout.write('')
+        return bool(scanned)
+
+    def get_combinations(self):
+        for size in range(len(FILTERS) + 1):
+            yield from combinations(FILTERS, size)
+
+    def get_sample_values(self):
+        # Explain with the most common values, the worst case for selectivity
+        top = {}
+        for field in ('status', 'executor', 'author'):
+            row = (
+                Task.objects.exclude(**{f'{field}__isnull': True})
+                .values(field)
+                .annotate(total=Count('id'))
+                .order_by('-total')
+                .first()
+            )
+            top[field] = row[field] if row else None
+        if top['status'] is None:
+            return None
+        label = (
+            Task.labels.through.objects.values('label')
+            .annotate(total=Count('id'))
+            .order_by('-total')
+            .first()
+        )
+        return {
+            'status': top['status'],
+            'executor': top['executor'] or top['author'],
+            'labels': [label['label']] if label else [],
+            'labels_match': LABELS_ALL,
+            'self_tasks': True,
+            'user': User.objects.get(pk=top['author']),
+        }
+
+    def get_full_scans(self, vendor, plan):
+        is_full_scan = FULL_SCAN_MARKERS[vendor]
+        tables = [Task._meta.db_table, Task.labels.through._meta.db_table]
+        return [
+            table for table in tables
+            if any(is_full_scan(line, table) for line in plan.splitlines())
+        ]
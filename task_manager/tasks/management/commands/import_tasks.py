@@ -0,0 +1,277 @@
+import csv
+import json
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks import counters, sort_keys
+from task_manager.tasks.choices import invalidate_choices
+from task_manager.tasks.dashboard import delta_users, invalidate_dashboards
+from task_manager.tasks.export import LABELS_SEPARATOR
+from task_manager.tasks.models import Task
+
+User = get_user_model()
+
+Through = Task.labels.through
+
+
+TEXT_FIELDS = ('name', 'description', 'status', 'author', 'executor')
+
+
+class RowError(Exception):
+    pass
+
+
+def read_csv(stream):
+    yield from csv.DictReader(stream)
+
+
+def read_jsonl(stream):
+    """
+    The objects of the lines of ``stream``; a line that is not one comes
+    as a ``RowError``, reported and skipped like any invalid row.
+    """
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as error:
+            yield RowError(f'line {number}: invalid JSON, {error.msg}')
+            continue
+        if not isinstance(row, dict):
+            yield RowError(f'line {number}: not a JSON object')
+            continue
+        invalid = invalid_fields(row)
+        if invalid:
+            yield RowError(
+                f'line {number}: invalid {", ".join(invalid)}, expected '
+                'strings'
+            )
+            continue
+        yield row
+
+
+def invalid_fields(row):
+    """
+    The imported fields of a JSON ``row`` that are not a string or null,
+    nor a list of strings for the labels.
+    """
+    invalid = [
+        field for field in TEXT_FIELDS
+        if not isinstance(row.get(field), (str, type(None)))
+    ]
+    labels = row.get('labels')
+    if isinstance(labels, list):
+        valid = all(isinstance(name, str) for name in labels)
+    else:
+        valid = isinstance(labels, (str, type(None)))
+    if not valid:
+        invalid.append('labels')
+    return invalid
+
+
+READERS = {
+    'csv': read_csv,
+    'jsonl': read_jsonl,
+}
+
+
+def split_labels(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(LABELS_SEPARATOR.strip())
+    return [name.strip() for name in value if name.strip()]
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        'Bulk import tasks from a CSV or JSONL file with the columns of '
+        'the task export: name, description, status, author, executor, '
+        'labels'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import, "-" for stdin')
+        parser.add_argument(
+            '--format',
+            choices=sorted(READERS),
+            help='Input format, guessed from the file extension by default',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows inserted per transaction',
+        )
+        parser.add_argument(
+            '--create-missing',
+            action='store_true',
+            help='Create statuses and labels that do not exist yet',
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] <= 0:
+            raise CommandError('--batch-size must be positive')
+        input_format = options['format'] or Path(options['path']).suffix[1:]
+        if input_format not in READERS:
+            raise CommandError(
+                'Cannot guess the input format, pass --format'
+            )
+        self.create_missing = options['create_missing']
+        self.verbosity = options['verbosity']
+
+        if options['path'] == '-':
+            self.import_stream(sys.stdin, input_format, options['batch_size'])
+            return
+        try:
+            with open(options['path'], newline='', encoding='utf-8') as f:
+                self.import_stream(f, input_format, options['batch_size'])
+        except OSError as error:
+            raise CommandError(error)
+
+    def import_stream(self, stream, input_format, batch_size):
+        started = time.perf_counter()
+        imported = skipped = 0
+        rows = enumerate(READERS[input_format](stream), start=1)
+        for batch in chunked(rows, batch_size):
+            batch_started = time.perf_counter()
+            created, errors = self.import_batch(batch)
+            imported += created
+            skipped += len(errors)
+            for line, error in errors:
+                self.stderr.write(f'Row {line}: {error}')
+            if self.verbosity > 1:
+                elapsed = time.perf_counter() - batch_started
+                self.stdout.write(
+                    f'{imported} tasks imported, last batch at '
+                    f'{created / elapsed:.0f} rows/s'
+                )
+
+        elapsed = time.perf_counter() - started
+        rate = imported / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {imported} tasks, skipped {skipped} rows in '
+            f'{elapsed:.2f}s ({rate:.0f} rows/s)'
+        ))
+
+    def import_batch(self, batch):
+        # Lines the reader could not parse are errors already
+        errors = [
+            (line, row) for line, row in batch if isinstance(row, RowError)
+        ]
+        batch = [
+            (line, row) for line, row in batch
+            if not isinstance(row, RowError)
+        ]
+        statuses = self.resolve(
+            Status, {row.get('status') for _line, row in batch}
+        )
+        labels = self.resolve(Label, {
+            name for _line, row in batch
+            for name in split_labels(row.get('labels'))
+        })
+        # The id and the full name, the sort key, of each username
+        users = {
+            username: (user_id, full_name)
+            for username, user_id, full_name in User.objects.filter(
+                username__in={
+                    row.get(field) for _line, row in batch
+                    for field in ('author', 'executor')
+                }
+            ).annotate(
+                full_name=sort_keys.full_name()
+            ).values_list('username', 'id', 'full_name')
+        }
+
+        tasks, task_labels = [], []
+        for line, row in batch:
+            try:
+                task = self.build_task(row, statuses, users)
+                label_ids = self.build_labels(row, labels)
+            except RowError as error:
+                errors.append((line, error))
+                continue
+            tasks.append(task)
+            task_labels.append(label_ids)
+
+        with transaction.atomic():
+            Task.objects.bulk_create(tasks)
+            through = Through.objects.bulk_create([
+                Through(task_id=task.id, label_id=label_id)
+                for task, label_ids in zip(tasks, task_labels)
+                for label_id in label_ids
+            ])
+            # bulk_create sends no signals, count the whole batch at once
+            deltas = counters.task_deltas(tasks)
+            deltas.update(counters.label_deltas(
+                link.label_id for link in through
+            ))
+            counters.apply_deltas(deltas)
+            invalidate_dashboards(delta_users(deltas))
+            invalidate_choices(Task)
+        return len(tasks), sorted(errors, key=lambda error: error[0])
+
+    def build_task(self, row, statuses, users):
+        name = (row.get('name') or '').strip()
+        if not name:
+            raise RowError('name is required')
+        status = statuses.get(row.get('status'))
+        if status is None:
+            raise RowError(f'unknown status {row.get("status")!r}')
+        author = users.get(row.get('author'))
+        if author is None:
+            raise RowError(f'unknown author {row.get("author")!r}')
+        executor = (None, None)
+        if row.get('executor'):
+            executor = users.get(row['executor'])
+            if executor is None:
+                raise RowError(f'unknown executor {row["executor"]!r}')
+        return Task(
+            name=name[:Task._meta.get_field('name').max_length],
+            description=row.get('description') or '',
+            status_id=status,
+            author_id=author[0],
+            executor_id=executor[0],
+            status_name=row['status'],
+            author_name=author[1],
+            executor_name=executor[1],
+        )
+
+    def build_labels(self, row, labels):
+        names = split_labels(row.get('labels'))
+        missing = [name for name in names if name not in labels]
+        if missing:
+            raise RowError(f'unknown labels {", ".join(missing)}')
+        return {labels[name] for name in names}
+
+    def resolve(self, model, names):
+        names = {name for name in names if name}
+        found = dict(
+            model.objects.filter(name__in=names).values_list('name', 'id')
+        )
+        missing = names - found.keys()
+        if missing and self.create_missing:
+            model.objects.bulk_create(
+                [model(name=name) for name in missing],
+                ignore_conflicts=True,
+            )
+            invalidate_choices(model)
+            found.update(
+                model.objects.filter(name__in=missing).values_list('name', 'id')
+            )
+        return found
@@ -0,0 +1,70 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.tasks import counters
+from task_manager.tasks.models import TaskCounter
+
+
+class Command(BaseCommand):
+    help = (
+        'Recount the tasks per status, author, executor and label and '
+        'replace the task counters. Tasks changed while it runs may be '
+        'miscounted, so run it when the site is quiet'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=10000,
+            help='Tasks aggregated per query',
+        )
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report counters that differ, fail if any does',
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] <= 0:
+            raise CommandError('--chunk-size must be positive')
+        started = time.perf_counter()
+        expected = {
+            key: count
+            for key, count in counters.compute_counts(
+                options['chunk_size']
+            ).items()
+            if key[1] is not None and count
+        }
+
+        if options['check']:
+            self.check(expected)
+            return
+
+        counters.save_counts(expected)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {len(expected)} task counters in {elapsed:.2f}s'
+        ))
+
+    def check(self, expected):
+        stored = {
+            (kind, object_id): count
+            for kind, object_id, count in TaskCounter.objects.exclude(
+                count=0
+            ).values_list('kind', 'object_id', 'count')
+        }
+        wrong = sorted(
+            key for key in expected.keys() | stored.keys()
+            if expected.get(key, 0) != stored.get(key, 0)
+        )
+        for kind, object_id in wrong:
+            self.stderr.write(
+                f'{kind} {object_id}: stored '
+                f'{stored.get((kind, object_id), 0)}, '
+                f'actual {expected.get((kind, object_id), 0)}'
+            )
+        if wrong:
+            raise CommandError(f'{len(wrong)} task counters are wrong')
+        self.stdout.write(self.style.SUCCESS('Task counters are correct'))
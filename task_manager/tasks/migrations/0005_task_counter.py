@@ -0,0 +1,56 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:41
+
+from django.db import migrations, models
+from django.db.models import Count
+
+COUNTED_FIELDS = {
+    'status': 'status_id',
+    'author': 'author_id',
+    'executor': 'executor_id',
+}
+
+
+def fill_counters(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    TaskCounter = apps.get_model('tasks', 'TaskCounter')
+    Through = Task.labels.through
+    counters = []
+    for kind, field in COUNTED_FIELDS.items():
+        rows = Task.objects.exclude(**{field: None}).order_by().values(
+            field
+        ).annotate(total=Count('id'))
+        counters += [
+            TaskCounter(kind=kind, object_id=row[field], count=row['total'])
+            for row in rows
+        ]
+    rows = Through.objects.order_by().values('label_id').annotate(
+        total=Count('id')
+    )
+    counters += [
+        TaskCounter(kind='label', object_id=row['label_id'], count=row['total'])
+        for row in rows
+    ]
+    TaskCounter.objects.bulk_create(counters, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_task_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('status', 'Status'), ('author', 'Author'), ('executor', 'Executor'), ('label', 'Label')], max_length=16)),
+                ('object_id', models.BigIntegerField()),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='task_counter_unique')],
+            },
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
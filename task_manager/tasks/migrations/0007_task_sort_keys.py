@@ -0,0 +1,78 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:57
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Concat
+
+
+def fill_sort_keys(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    Status = apps.get_model('statuses', 'Status')
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    full_names = User.objects.annotate(
+        full_name=Concat('first_name', Value(' '), 'last_name')
+    )
+    Task.objects.update(
+        status_name=Subquery(
+            Status.objects.filter(pk=OuterRef('status_id'))
+            .values('name')[:1]
+        ),
+        author_name=Subquery(
+            full_names.filter(pk=OuterRef('author_id'))
+            .values('full_name')[:1]
+        ),
+        executor_name=Subquery(
+            full_names.filter(pk=OuterRef('executor_id'))
+            .values('full_name')[:1]
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labels', '0003_lower_indexes'),
+        ('statuses', '0002_status_updated_at'),
+        ('tasks', '0006_task_sort_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_executor_created_idx',
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='author_name',
+            field=models.CharField(editable=False, max_length=301, null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='executor_name',
+            field=models.CharField(editable=False, max_length=301, null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='status_name',
+            field=models.CharField(editable=False, max_length=100, null=True),
+        ),
+        migrations.RunPython(fill_sort_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('executor__isnull', False)), fields=['executor', 'created_at', 'id'], name='task_executor_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status_name', 'created_at', 'id'], name='task_status_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['author_name', 'created_at', 'id'], name='task_author_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['executor_name', 'created_at', 'id'], name='task_executor_name_idx'),
+        ),
+    ]
@@ -1,5 +1,5 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 
 # from task_manager.statuses.models import Status
@@ -47,11 +47,99 @@ class Task(models.Model):
         _('Created at'),
         auto_now_add=True
     )
+    updated_at = models.DateTimeField(
+        _('Updated at'),
+        auto_now=True
+    )
+    # The status and user names shown in the task list, kept by
+    # task_manager.tasks.sort_keys to sort it. Nullable, so adding them
+    # did not rebuild tasks_task on SQLite, which drops its triggers
+    status_name = models.CharField(max_length=100, null=True, editable=False)
+    author_name = models.CharField(max_length=301, null=True, editable=False)
+    executor_name = models.CharField(
+        max_length=301,
+        null=True,
+        editable=False
+    )
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # Task counters are updated by post_save, in the same transaction
+        with transaction.atomic(using=kwargs.get('using'), savepoint=False):
+            super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = _('Task')
         verbose_name_plural = _('Tasks')
-        ordering = ['created_at']
\ No newline at end of file
+        ordering = ['created_at']
+        indexes = [
+            models.Index(
+                fields=['created_at', 'id'],
+                name='task_created_idx'
+            ),
+            models.Index(
+                fields=['status', 'created_at', 'id'],
+                name='task_status_created_idx'
+            ),
+            models.Index(
+                fields=['author', 'created_at', 'id'],
+                name='task_author_created_idx'
+            ),
+            models.Index(
+                fields=['executor', 'created_at', 'id'],
+                name='task_executor_created_idx',
+                condition=models.Q(executor__isnull=False)
+            ),
+            models.Index(
+                fields=['name', 'id'],
+                name='task_name_idx'
+            ),
+            models.Index(
+                fields=['status_name', 'created_at', 'id'],
+                name='task_status_name_idx'
+            ),
+            models.Index(
+                fields=['author_name', 'created_at', 'id'],
+                name='task_author_name_idx'
+            ),
+            models.Index(
+                fields=['executor_name', 'created_at', 'id'],
+                name='task_executor_name_idx'
+            ),
+        ]
+
+
+class TaskCounter(models.Model):
+    """
+    Number of tasks per status, author, executor and label, kept up to
+    date by task_manager.tasks.counters so that reading it never scans
+    the tasks table.
+    """
+
+    STATUS = 'status'
+    AUTHOR = 'author'
+    EXECUTOR = 'executor'
+    LABEL = 'label'
+    KIND_CHOICES = [
+        (STATUS, _('Status')),
+        (AUTHOR, _('Author')),
+        (EXECUTOR, _('Executor')),
+        (LABEL, _('Label')),
+    ]
+
+    kind = models.CharField(max_length=16, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.kind} {self.object_id}: {self.count}'
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['kind', 'object_id'],
+                name='task_counter_unique'
+            ),
+        ]
@@ -0,0 +1,96 @@
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+SEARCH_RANK = 'search_rank'
+
+# Only letters and digits reach the database query, everything else
+# separates terms, so user input can never break the query syntax
+TERM_RE = re.compile(r'[^\W_]+')
+MAX_TERMS = 10
+
+# Created by migration tasks/0004_task_search_index, which holds its own
+# copy of the SQL.
+# SQLite drops the triggers when a migration rebuilds tasks_task: such a
+# migration must create them again.
+
+# PostgreSQL: a generated tsvector column with a GIN index
+SEARCH_CONFIG = 'simple'
+SEARCH_VECTOR = 'search_vector'
+SEARCH_INDEX = 'tasks_task_search_idx'
+
+# SQLite: an FTS5 index over tasks_task kept in sync by triggers
+FTS_TABLE = 'tasks_task_fts'
+
+
+def get_terms(query):
+    return TERM_RE.findall(query or '')[:MAX_TERMS]
+
+
+def search_postgresql(queryset, terms, table):
+    tsquery = ' & '.join(f'{term}:*' for term in terms)
+    params = [SEARCH_CONFIG, tsquery]
+    matches = RawSQL(
+        f'{table}.{SEARCH_VECTOR} @@ to_tsquery(%s::regconfig, %s)',
+        params,
+        output_field=BooleanField(),
+    )
+    # ts_rank() is a real, loaded as its shortest float4 decimal: as a
+    # double it round-trips exactly through the keyset cursors
+    rank = RawSQL(
+        f'ts_rank({table}.{SEARCH_VECTOR}, '
+        f'to_tsquery(%s::regconfig, %s))::float8',
+        params,
+        output_field=FloatField(),
+    )
+    return queryset.filter(matches).annotate(**{SEARCH_RANK: rank})
+
+
+def search_sqlite(queryset, terms, table):
+    match = ' '.join(f'"{term}"*' for term in terms)
+    matches = RawSQL(
+        f'{table}."id" IN (SELECT rowid FROM {FTS_TABLE} '
+        f'WHERE {FTS_TABLE} MATCH %s)',
+        [match],
+        output_field=BooleanField(),
+    )
+    # bm25() is lower for better matches; a name hit weighs ten times more
+    rank = RawSQL(
+        f'(SELECT -bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} '
+        f'WHERE {FTS_TABLE} MATCH %s AND rowid = {table}."id")',
+        [match],
+        output_field=FloatField(),
+    )
+    return queryset.filter(matches).annotate(**{SEARCH_RANK: rank})
+
+
+def search_contains(queryset, terms, table):
+    for term in terms:
+        queryset = queryset.filter(
+            Q(name__icontains=term) | Q(description__icontains=term)
+        )
+    return queryset.annotate(
+        **{SEARCH_RANK: Value(0.0, output_field=FloatField())}
+    )
+
+
+BACKENDS = {
+    'postgresql': search_postgresql,
+    'sqlite': search_sqlite,
+}
+
+
+def search_tasks(queryset, query):
+    """
+    Keep the tasks matching every term of ``query`` as a word prefix in
+    the name or the description, annotated with ``search_rank``.
+    """
+    terms = get_terms(query)
+    if not terms:
+        return queryset
+    connection = connections[queryset.db]
+    table = connection.ops.quote_name(queryset.model._meta.db_table)
+    search = BACKENDS.get(connection.vendor, search_contains)
+    return search(queryset, terms, table)
@@ -0,0 +1,159 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks import counters, sort_keys
+from task_manager.tasks.choices import invalidate_choices
+from task_manager.tasks.dashboard import delta_users, invalidate_dashboards
+from task_manager.tasks.models import Task, TaskCounter
+
+User = get_user_model()
+
+
+@receiver([post_save, post_delete], sender=Status)
+@receiver([post_save, post_delete], sender=Label)
+@receiver([post_save, post_delete], sender=User)
+def invalidate_choice_cache(sender, update_fields=None, **kwargs):
+    # Logging in only touches last_login, which no choice list displays
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    invalidate_choices(sender)
+
+
+@receiver(post_save, sender=Status)
+def rename_status(sender, instance, created, raw=False, **kwargs):
+    if not (created or raw):
+        sort_keys.rename_status(instance)
+
+
+@receiver(post_save, sender=User)
+def rename_user(
+    sender,
+    instance,
+    created,
+    raw=False,
+    update_fields=None,
+    **kwargs
+):
+    if created or raw:
+        return
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    sort_keys.rename_user(instance)
+
+
+@receiver(pre_save, sender=Task)
+def task_saving(sender, instance, raw=False, **kwargs):
+    # The counted fields as stored, read under a row lock inside the save
+    # transaction (see Task.save()): whatever the instance went through
+    # since it was loaded, the deltas are taken from the database
+    instance._counted = None
+    if raw or counters.is_suspended() or instance._state.adding:
+        return
+    instance._counted = (
+        Task.objects.select_for_update()
+        .filter(pk=instance.pk)
+        .values(*counters.COUNTED_FIELDS.values())
+        .first()
+    )
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, created, raw=False, **kwargs):
+    if raw or counters.is_suspended():
+        return
+    deltas = counters.task_deltas([instance])
+    if not created and instance._counted is not None:
+        for kind, field in counters.COUNTED_FIELDS.items():
+            deltas[kind, instance._counted[field]] -= 1
+    counters.apply_deltas(deltas)
+    # Zero deltas still name the users whose task was edited
+    invalidate_dashboards(delta_users(deltas))
+    invalidate_choices(Task)
+
+
+@receiver(post_save, sender=Task)
+def refresh_sort_keys(sender, instance, raw=False, **kwargs):
+    # Even with its relations unchanged, the instance may have written
+    # back keys loaded before a status or user was renamed
+    if not raw:
+        sort_keys.refresh(Task.objects.filter(pk=instance.pk))
+
+
+@receiver(pre_delete, sender=Task)
+def task_deleting(sender, instance, **kwargs):
+    # The label links are gone by post_delete, and deleting them sends
+    # no signal
+    if not counters.is_suspended():
+        instance._label_ids = list(
+            instance.labels.through.objects.filter(task_id=instance.pk)
+            .values_list('label_id', flat=True)
+        )
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, **kwargs):
+    if counters.is_suspended():
+        return
+    deltas = counters.task_deltas([instance], sign=-1)
+    deltas.update(counters.label_deltas(instance._label_ids, sign=-1))
+    counters.apply_deltas(deltas)
+    invalidate_dashboards(delta_users(deltas))
+    invalidate_choices(Task)
+
+
+def linked_label_deltas(instance, reverse, pk_set):
+    """Negative label deltas for the links about to be removed."""
+    links = Task.labels.through.objects.all()
+    if reverse:
+        links = links.filter(label_id=instance.pk)
+        if pk_set is not None:
+            links = links.filter(task_id__in=pk_set)
+        return counters.label_deltas([instance.pk] * links.count(), -1)
+    links = links.filter(task_id=instance.pk)
+    if pk_set is not None:
+        links = links.filter(label_id__in=pk_set)
+    return counters.label_deltas(
+        links.values_list('label_id', flat=True), -1
+    )
+
+
+@receiver(m2m_changed, sender=Task.labels.through)
+def task_labels_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if counters.is_suspended():
+        return
+    if action.startswith('post_'):
+        invalidate_choices(Task)
+    if action in ('pre_remove', 'pre_clear'):
+        # Only the links that exist are removed, whatever pk_set holds
+        instance._label_deltas = linked_label_deltas(
+            instance, reverse, pk_set
+        )
+    elif action in ('post_remove', 'post_clear'):
+        counters.apply_deltas(instance._label_deltas)
+    elif action == 'post_add' and pk_set:
+        if reverse:
+            deltas = counters.label_deltas([instance.pk] * len(pk_set))
+        else:
+            deltas = counters.label_deltas(pk_set)
+        counters.apply_deltas(deltas)
+
+
+@receiver(post_delete, sender=Status)
+@receiver(post_delete, sender=Label)
+@receiver(post_delete, sender=User)
+def delete_counter(sender, instance, **kwargs):
+    kind = {
+        Status: TaskCounter.STATUS,
+        Label: TaskCounter.LABEL,
+    }.get(sender)
+    kinds = [kind] if kind else [TaskCounter.AUTHOR, TaskCounter.EXECUTOR]
+    TaskCounter.objects.filter(kind__in=kinds, object_id=instance.pk).delete()
@@ -0,0 +1,83 @@
+"""
+Sort keys of the task list: the status name and the full names of the
+author and executor, as the columns show them, stored on each task so
+that sorting by them reads an index of tasks_task instead of joining the
+related tables for every row of the list.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Concat
+
+from task_manager.statuses.models import Status
+
+User = get_user_model()
+
+# The sort key of each foreign key of a task, its related object as shown
+KEY_FIELDS = {
+    'status_id': 'status_name',
+    'author_id': 'author_name',
+    'executor_id': 'executor_name',
+}
+
+
+def full_name():
+    """``str()`` of a user, as an expression over their name fields."""
+    return Concat('first_name', Value(' '), 'last_name')
+
+
+def key_expressions():
+    """The sort keys of a task, as subqueries of its own row."""
+    full_names = User.objects.annotate(full_name=full_name())
+    return {
+        'status_name': Subquery(
+            Status.objects.filter(pk=OuterRef('status_id'))
+            .values('name')[:1]
+        ),
+        'author_name': Subquery(
+            full_names.filter(pk=OuterRef('author_id'))
+            .values('full_name')[:1]
+        ),
+        'executor_name': Subquery(
+            full_names.filter(pk=OuterRef('executor_id'))
+            .values('full_name')[:1]
+        ),
+    }
+
+
+def refresh(tasks):
+    """Take the sort keys of saved ``tasks`` from their relations."""
+    return tasks.update(**key_expressions())
+
+
+def rename_status(status):
+    status.tasks.exclude(status_name=status.name).update(
+        status_name=status.name
+    )
+
+
+def rename_user(user):
+    name = str(user)
+    for relation, key in (
+        (user.authored_tasks, 'author_name'),
+        (user.assigned_tasks, 'executor_name'),
+    ):
+        relation.exclude(**{key: name}).update(**{key: name})
+
+
+def fill(tasks):
+    """Set the sort keys of unsaved ``tasks``, for ``bulk_create()``."""
+    status_names = dict(
+        Status.objects.filter(pk__in={task.status_id for task in tasks})
+        .values_list('pk', 'name')
+    )
+    user_ids = {task.author_id for task in tasks}
+    user_ids.update(task.executor_id for task in tasks)
+    user_names = dict(
+        User.objects.filter(pk__in=user_ids - {None})
+        .annotate(full_name=full_name())
+        .values_list('pk', 'full_name')
+    )
+    for task in tasks:
+        task.status_name = status_names.get(task.status_id)
+        task.author_name = user_names.get(task.author_id)
+        task.executor_name = user_names.get(task.executor_id)
@@ -1,11 +1,37 @@
+import csv
+import json
+import os
+import re
+import tempfile
+from io import StringIO
+from types import SimpleNamespace
+from unittest import skipUnless
+
+from asgiref.sync import async_to_sync
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
 from task_manager.labels.models import Label
 from task_manager.statuses.models import Status
-from task_manager.tasks.models import Task
+from task_manager.tasks import bulk, counters
+from task_manager.tasks.choices import get_choices, get_choices_version
+from task_manager.tasks.dashboard import get_dashboard_version
+from task_manager.tasks.facets import get_facets
+from task_manager.tasks.filters import (
+    TASK_SORTS,
+    TaskFilter,
+    filter_tasks_by_labels,
+)
+from task_manager.tasks.forms import TaskForm
+from task_manager.tasks.models import Task, TaskCounter
+from task_manager.tasks.search import SEARCH_RANK, search_tasks
 
 User = get_user_model()
 
@@ -110,6 +136,24 @@ class TaskCRUDTest(TestCase):
         self.assertEqual(response.status_code, 302)
         self.assertFalse(Task.objects.filter(pk=task.pk).exists())
 
+    def test_task_delete_fetches_task_once(self):
+        """Тест что задача и проверка автора загружаются одним запросом"""
+        task = Task.objects.create(
+            name='Test Task',
+            status=self.status,
+            author=self.user1
+        )
+        url = reverse('task_delete', kwargs={'pk': task.pk})
+        self.client.force_login(self.user2)
+        # Session, user and the task
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertRedirects(response, reverse('tasks_index'))
+        self.client.force_login(self.user1)
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
     def test_task_fields(self):
         """Тест полей задачи"""
         task = Task.objects.create(
@@ -294,6 +338,66 @@ class TaskFilterTest(TestCase):
         self.assertNotContains(response, 'Task 2')
         self.assertContains(response, 'Task 3')
 
+    def filter_by_labels(self, labels, match=None):
+        self.client.force_login(self.user1)
+        params = {'labels': [label.id for label in labels]}
+        if match is not None:
+            params['labels_match'] = match
+        response = self.client.get(reverse('tasks_index'), params)
+        self.assertEqual(response.status_code, 200)
+        return [task.name for task in response.context['tasks']]
+
+    def test_filter_by_any_of_labels(self):
+        """Тест фильтрации по любой из нескольких меток"""
+        names = self.filter_by_labels([self.label_bug, self.label_feature])
+        # Task 3 has both labels and is listed once
+        self.assertEqual(names, ['Task 1', 'Task 2', 'Task 3'])
+        names = self.filter_by_labels(
+            [self.label_bug, self.label_feature], 'any'
+        )
+        self.assertEqual(names, ['Task 1', 'Task 2', 'Task 3'])
+
+    def test_filter_by_all_labels(self):
+        """Тест фильтрации по всем выбранным меткам"""
+        names = self.filter_by_labels(
+            [self.label_bug, self.label_feature], 'all'
+        )
+        self.assertEqual(names, ['Task 3'])
+        names = self.filter_by_labels([self.label_bug], 'all')
+        self.assertEqual(names, ['Task 1', 'Task 3'])
+
+    def test_filter_by_labels_without_joins(self):
+        """Тест фильтрации по меткам подзапросом без соединений"""
+        labels = [self.label_bug, self.label_feature]
+        any_sql = str(filter_tasks_by_labels(Task.objects.all(), labels).query)
+        self.assertIn('EXISTS', any_sql)
+        all_sql = str(filter_tasks_by_labels(
+            Task.objects.all(), labels, match_all=True
+        ).query)
+        self.assertIn('HAVING', all_sql)
+        for sql in (any_sql, all_sql):
+            self.assertNotIn('JOIN', sql)
+            self.assertNotIn('DISTINCT', sql)
+
+    def test_benchmark_label_filters(self):
+        """Тест одинаковых результатов подзапросов и соединений"""
+        stdout = StringIO()
+        call_command(
+            'benchmark_label_filters',
+            label_counts=[1, 2],
+            repeat=1,
+            stdout=stdout,
+        )
+        rows = [line.split() for line in stdout.getvalue().splitlines()[2:]]
+        self.assertEqual(len(rows), 8)
+        found = {}
+        for match, labels, strategy, count, *_timings in rows:
+            found.setdefault((match, labels), set()).add(count)
+        self.assertEqual(found[('any', '2')], {'3'})
+        self.assertEqual(found[('all', '2')], {'1'})
+        for counts in found.values():
+            self.assertEqual(len(counts), 1)
+
     def test_filter_self_tasks(self):
         """Тест фильтрации только своих задач"""
         self.client.login(username='user1', password='password123')
@@ -340,4 +444,1532 @@ class TaskFilterTest(TestCase):
         self.assertContains(response, 'id_executor')
         self.assertContains(response, 'id_labels')
         self.assertContains(response, 'id_self_tasks')
-        self.assertContains(response, 'btn-primary')
\ No newline at end of file
+        self.assertContains(response, 'btn-primary')
+
+
+class TaskPaginationTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.status_new = Status.objects.create(name='New')
+        self.status_done = Status.objects.create(name='Done')
+        Task.objects.bulk_create([
+            Task(
+                name=f'Task {index:03}',
+                status=self.status_new if index % 2 else self.status_done,
+                author=self.user,
+            )
+            for index in range(120)
+        ])
+        self.client.force_login(self.user)
+
+    def get_names(self, response):
+        return [task.name for task in response.context['tasks']]
+
+    def test_pages_follow_cursors(self):
+        """Тест перехода по страницам через курсоры"""
+        response = self.client.get(reverse('tasks_index'))
+        page = response.context['page_obj']
+        first = self.get_names(response)
+        self.assertEqual(len(first), 50)
+        self.assertFalse(page.has_previous())
+        self.assertTrue(page.has_next())
+
+        response = self.client.get(
+            reverse('tasks_index'), {'after': page.next_cursor}
+        )
+        page = response.context['page_obj']
+        second = self.get_names(response)
+        self.assertEqual(len(second), 50)
+        self.assertFalse(set(first) & set(second))
+
+        response = self.client.get(
+            reverse('tasks_index'), {'after': page.next_cursor}
+        )
+        page = response.context['page_obj']
+        self.assertEqual(len(self.get_names(response)), 20)
+        self.assertFalse(page.has_next())
+
+        response = self.client.get(
+            reverse('tasks_index'), {'before': page.previous_cursor}
+        )
+        self.assertEqual(self.get_names(response), second)
+
+    def test_pagination_never_uses_offset(self):
+        """Тест что пагинация не использует OFFSET"""
+        response = self.client.get(reverse('tasks_index'))
+        cursor = response.context['page_obj'].next_cursor
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('tasks_index'), {'after': cursor})
+        for query in queries.captured_queries:
+            self.assertNotIn('OFFSET', query['sql'].upper())
+
+    def test_pagination_keeps_filters(self):
+        """Тест что пагинация сохраняет фильтры"""
+        response = self.client.get(
+            reverse('tasks_index'), {'status': self.status_new.id}
+        )
+        cursor = response.context['page_obj'].next_cursor
+        self.assertContains(response, f'status={self.status_new.id}')
+
+        response = self.client.get(
+            reverse('tasks_index'),
+            {'status': self.status_new.id, 'after': cursor}
+        )
+        tasks = response.context['tasks']
+        self.assertEqual(len(tasks), 10)
+        self.assertTrue(
+            all(task.status_id == self.status_new.id for task in tasks)
+        )
+
+    def test_invalid_cursor(self):
+        """Тест неверного курсора"""
+        response = self.client.get(
+            reverse('tasks_index'), {'after': 'not-a-cursor'}
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+class TaskSortTest(TestCase):
+    # The values the columns show, in the order of the ids of their rows
+    displayed = {
+        'name': lambda task: task.name,
+        'status': lambda task: task.status.name,
+        'executor': lambda task: task.executor and str(task.executor),
+        'author': lambda task: str(task.author),
+        'created': lambda task: task.created_at,
+    }
+
+    def setUp(self):
+        self.user1 = User.objects.create_user(
+            username='user1', first_name='Zoe', last_name='Adams'
+        )
+        self.user2 = User.objects.create_user(
+            username='user2', first_name='Amy', last_name='Young'
+        )
+        statuses = [
+            Status.objects.create(name=name) for name in ('New', 'Done')
+        ]
+        executors = [None, self.user1, self.user2]
+        for index in range(120):
+            Task.objects.create(
+                name=f'Task {index * 37 % 120:03}',
+                status=statuses[index % 2],
+                author=executors[index % 2 + 1],
+                executor=executors[index % 3],
+            )
+        self.client.force_login(self.user1)
+
+    def expected(self, name):
+        """Все задачи по возрастанию показанного значения колонки."""
+        nulls_largest = connection.features.nulls_order_largest
+        value = self.displayed[name]
+
+        def key(task):
+            shown = value(task)
+            return (
+                (shown is None) == nulls_largest,
+                shown or '',
+                task.created_at,
+                task.pk,
+            )
+        tasks = Task.objects.select_related('status', 'author', 'executor')
+        return [task.pk for task in sorted(tasks, key=key)]
+
+    def walk(self, sort):
+        """Все задачи страницами вперед, затем назад."""
+        forward, pages, params = [], [], {'sort': sort}
+        while True:
+            response = self.client.get(reverse('tasks_index'), params)
+            page = response.context['page_obj']
+            pages.append([task.pk for task in page])
+            forward.extend(pages[-1])
+            if not page.has_next():
+                break
+            params = {'sort': sort, 'after': page.next_cursor}
+        backward = [pages[-1]]
+        while page.has_previous():
+            response = self.client.get(
+                reverse('tasks_index'),
+                {'sort': sort, 'before': page.previous_cursor}
+            )
+            page = response.context['page_obj']
+            backward.insert(0, [task.pk for task in page])
+        return forward, pages, backward
+
+    def test_sort_by_every_column(self):
+        """Тест сортировки по показанным значениям каждой колонки"""
+        for name in TASK_SORTS:
+            ascending = self.expected(name)
+            sorts = ((name, ascending), (f'-{name}', ascending[::-1]))
+            for sort, expected in sorts:
+                with self.subTest(sort=sort):
+                    forward, pages, backward = self.walk(sort)
+                    self.assertEqual(forward, expected)
+                    self.assertEqual(backward, pages)
+
+    def test_sort_keys_follow_changes(self):
+        """Тест обновления ключей сортировки при изменениях"""
+        task = Task.objects.get(name='Task 000')
+        stale = Task.objects.get(pk=task.pk)
+        status = Status.objects.get(name='New')
+        status.name = 'Open'
+        status.save()
+        self.user2.first_name = 'Bea'
+        self.user2.save()
+        stale.description = 'Saved with the keys loaded before'
+        stale.save()
+        bulk.set_executor(Task.objects.filter(pk=task.pk), self.user2)
+        bulk.set_status(
+            Task.objects.filter(name='Task 001'),
+            Status.objects.get(name='Done')
+        )
+        for name in ('status', 'executor', 'author'):
+            with self.subTest(sort=name):
+                self.assertEqual(self.walk(name)[0], self.expected(name))
+
+    def test_unknown_sort_is_ignored(self):
+        """Тест что неизвестная сортировка игнорируется"""
+        expected = list(
+            Task.objects.order_by('created_at', 'id')
+            .values_list('pk', flat=True)[:50]
+        )
+        for sort in ('description', '-status_name', 'executor_id'):
+            with self.subTest(sort=sort):
+                response = self.client.get(
+                    reverse('tasks_index'), {'sort': sort}
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.context['sort'], 'created')
+                self.assertEqual(
+                    [task.pk for task in response.context['tasks']],
+                    expected,
+                )
+
+    def test_headers_toggle_direction(self):
+        """Тест что заголовок колонки меняет направление сортировки"""
+        response = self.client.get(reverse('tasks_index'))
+        self.assertContains(response, '?sort=name"')
+        self.assertContains(response, '?sort=-created"')
+        self.assertContains(response, '?sort=status"')
+        self.assertContains(response, '?sort=executor"')
+        self.assertContains(response, '?sort=author"')
+
+        response = self.client.get(
+            reverse('tasks_index'), {'sort': 'name', 'status': ''}
+        )
+        self.assertContains(response, '?sort=-name&amp;status="')
+        self.assertContains(response, '?sort=created&amp;status="')
+        self.assertContains(response, 'name="sort" value="name"')
+
+
+class TaskFacetTest(TestCase):
+    def setUp(self):
+        self.user1 = User.objects.create_user(username='user1')
+        self.user2 = User.objects.create_user(username='user2')
+        self.status_new = Status.objects.create(name='New')
+        self.status_done = Status.objects.create(name='Done')
+        self.label_bug = Label.objects.create(name='Bug')
+        self.label_ui = Label.objects.create(name='UI')
+        tasks = [
+            ('Fix login', self.status_new, self.user1, [self.label_bug]),
+            ('Fix menu', self.status_new, self.user2, [self.label_ui]),
+            ('Old bug', self.status_done, self.user1, [self.label_bug]),
+            ('Draft', self.status_new, None, []),
+        ]
+        for name, status, executor, labels in tasks:
+            task = Task.objects.create(
+                name=name,
+                status=status,
+                author=self.user1,
+                executor=executor
+            )
+            task.labels.set(labels)
+
+    def get_filterset(self, **data):
+        filterset = TaskFilter(
+            data=data,
+            queryset=Task.objects.all(),
+            request=SimpleNamespace(user=self.user1),
+        )
+        self.assertTrue(filterset.is_valid())
+        return filterset
+
+    def test_unfiltered_facets_from_counters(self):
+        """Тест счётчиков вариантов без фильтров одним запросом"""
+        filterset = self.get_filterset()
+        with self.assertNumQueries(1):
+            facets = get_facets(filterset)
+        self.assertEqual(facets['status'], {
+            self.status_new.id: 3,
+            self.status_done.id: 1,
+        })
+        # Autocomplete fields render no option until one is selected
+        self.assertEqual(facets['executor'], {})
+        self.assertEqual(facets['labels'], {})
+
+    def test_facets_of_selected_options_only(self):
+        """Тест счётчиков только выбранных вариантов автодополнения"""
+        filterset = self.get_filterset(
+            executor=self.user1.id,
+            labels=[self.label_bug.id, self.label_ui.id],
+        )
+        with self.assertNumQueries(3):
+            facets = get_facets(filterset)
+        self.assertEqual(facets['executor'], {self.user1.id: 2})
+        self.assertEqual(facets['labels'], {self.label_bug.id: 2})
+        self.assertEqual(facets['status'], {
+            self.status_new.id: 1,
+            self.status_done.id: 1,
+        })
+
+    def test_facet_ignores_its_own_filter(self):
+        """Тест счётчиков вариантов при остальных активных фильтрах"""
+        filterset = self.get_filterset(
+            status=self.status_new.id,
+            executor=self.user2.id,
+        )
+        # Statuses and the selected executor grouped, no label selected
+        with self.assertNumQueries(2):
+            facets = get_facets(filterset)
+        self.assertEqual(facets['status'], {self.status_new.id: 1})
+        self.assertEqual(facets['executor'], {self.user2.id: 1})
+        self.assertEqual(facets['labels'], {})
+
+    def test_facets_match_filtered_counts(self):
+        """Тест совпадения счётчиков с числом задач после выбора варианта"""
+        data = {
+            'search': 'fix',
+            'status': self.status_new.id,
+            'executor': self.user1.id,
+            'labels': [self.label_bug.id],
+            'self_tasks': True,
+        }
+        filterset = self.get_filterset(**data)
+        with self.assertNumQueries(3):
+            facets = get_facets(filterset)
+        options = {
+            'status': [self.status_new, self.status_done],
+            'executor': [self.user1],
+            'labels': [self.label_bug],
+        }
+        for name, objects in options.items():
+            for obj in objects:
+                with self.subTest(field=name, option=str(obj)):
+                    value = [obj.id] if name == 'labels' else obj.id
+                    expected = self.get_filterset(
+                        **{**data, name: value}
+                    ).qs.count()
+                    self.assertEqual(
+                        facets[name].get(obj.id, 0),
+                        expected
+                    )
+
+    def test_counts_shown_in_filter_form(self):
+        """Тест отображения счётчиков рядом с вариантами фильтра"""
+        self.client.force_login(self.user1)
+        response = self.client.get(
+            reverse('tasks_index'),
+            {'labels': [self.label_ui.id]}
+        )
+        self.assertContains(response, 'New (1)')
+        self.assertContains(response, 'Done (0)')
+        self.assertContains(response, 'UI (1)')
+        self.assertNotContains(response, 'Bug (')
+
+
+class TaskFilterIndexesTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.status = Status.objects.create(name='New')
+        self.label = Label.objects.create(name='Bug')
+        task = Task.objects.create(
+            name='Task',
+            status=self.status,
+            author=self.user,
+            executor=self.user
+        )
+        task.labels.add(self.label)
+
+    def test_explain_every_filter_combination(self):
+        """Тест что каждая комбинация фильтров использует индекс"""
+        out = StringIO()
+        call_command('explain_task_filters', '--check', stdout=out)
+        output = out.getvalue()
+        self.assertIn('no filters', output)
+        self.assertIn('status, executor, labels, self_tasks', output)
+        self.assertIn('Every filter combination is served by an index', output)
+
+    def test_explain_sorted_page(self):
+        """Тест что сортировка по убыванию читается из индекса"""
+        out = StringIO()
+        call_command('explain_task_filters', '--sort=-executor', stdout=out)
+        no_filters = out.getvalue().split('\n\n')[0]
+        self.assertIn('task_executor_name_idx', no_filters)
+        self.assertNotIn('sorted before LIMIT', no_filters)
+
+    def test_explain_without_tasks(self):
+        """Тест команды без задач"""
+        Task.objects.all().delete()
+        with self.assertRaises(CommandError):
+            call_command('explain_task_filters', stdout=StringIO())
+
+
+class TaskChoiceCacheTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123',
+            first_name='Test',
+            last_name='User'
+        )
+        self.status = Status.objects.create(name='New')
+        self.client.force_login(self.user)
+
+    def test_form_choices_are_cached(self):
+        """Тест что списки выбора формы берутся из кеша"""
+        self.client.get(reverse('task_create'))
+        with self.assertNumQueries(0):
+            form = TaskForm()
+            form.as_p()
+
+    def test_filter_choices_are_cached(self):
+        """Тест что фильтр берет значения из кеша"""
+        self.client.get(reverse('tasks_index'))
+        with self.assertNumQueries(0):
+            filterset = TaskFilter(data={'status': self.status.id})
+            self.assertTrue(filterset.is_valid())
+            filterset.form.as_p()
+
+    def test_cache_invalidated_on_save_and_delete(self):
+        """Тест сброса кеша при изменении статусов"""
+        self.client.get(reverse('task_create'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            status = Status.objects.create(name='Fresh status')
+            self.status.name = 'Renamed status'
+            self.status.save()
+        response = self.client.get(reverse('task_create'))
+        self.assertContains(response, 'Fresh status')
+        self.assertContains(response, 'Renamed status')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            status.delete()
+        response = self.client.get(reverse('task_create'))
+        self.assertNotContains(response, 'Fresh status')
+
+    def test_login_keeps_user_choices(self):
+        """Тест что вход пользователя не сбрасывает кеш"""
+        version = get_choices_version(User)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.login(username='testuser', password='testpass123')
+        self.assertEqual(get_choices_version(User), version)
+
+    def test_cache_invalidated_on_commit(self):
+        """Тест что кеш сбрасывается только после фиксации транзакции"""
+        version = get_choices_version(Status)
+        with self.captureOnCommitCallbacks(execute=True):
+            Status.objects.create(name='Fresh status')
+            # Read before the commit: cached under the current version
+            self.assertEqual(get_choices_version(Status), version)
+        self.assertNotEqual(get_choices_version(Status), version)
+
+    def test_cache_holds_labels_only(self):
+        """Тест что в кеше хранятся только ключи и подписи"""
+        self.assertEqual(
+            get_choices(Status.objects.all()),
+            [(self.status.pk, 'New')]
+        )
+
+
+class TaskAutocompleteWidgetTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='author',
+            first_name='Ann',
+            last_name='Author'
+        )
+        self.executor = User.objects.create_user(
+            username='executor',
+            first_name='Eve',
+            last_name='Executor'
+        )
+        self.status = Status.objects.create(name='New')
+        self.label = Label.objects.create(name='Bug')
+        Label.objects.create(name='Feature')
+        self.task = Task.objects.create(
+            name='Task',
+            status=self.status,
+            author=self.user,
+            executor=self.executor
+        )
+        self.task.labels.add(self.label)
+        self.client.force_login(self.user)
+
+    def test_create_form_renders_no_users_or_labels(self):
+        """Тест что форма создания не выводит всех пользователей и метки"""
+        response = self.client.get(reverse('task_create'))
+        self.assertContains(response, 'data-autocomplete-url="/users/')
+        self.assertContains(response, 'data-autocomplete-url="/labels/')
+        self.assertNotContains(response, 'Eve Executor')
+        self.assertNotContains(response, 'Feature')
+
+    def test_update_form_renders_selected_values(self):
+        """Тест что форма изменения выводит только выбранные значения"""
+        response = self.client.get(
+            reverse('task_update', args=[self.task.pk])
+        )
+        self.assertContains(
+            response,
+            f'<option value="{self.executor.pk}" selected>Eve Executor',
+        )
+        self.assertContains(
+            response, f'<option value="{self.label.pk}" selected>Bug'
+        )
+        form = response.context['form']
+        self.assertNotIn('Ann Author', str(form['executor']))
+        self.assertNotIn('Feature', str(form['labels']))
+
+    def test_create_with_fetched_values(self):
+        """Тест создания задачи с подгруженными значениями"""
+        response = self.client.post(reverse('task_create'), {
+            'name': 'New task',
+            'status': self.status.pk,
+            'executor': self.user.pk,
+            'labels': [self.label.pk],
+        })
+        self.assertEqual(response.status_code, 302)
+        task = Task.objects.get(name='New task')
+        self.assertEqual(task.executor, self.user)
+        self.assertEqual(list(task.labels.all()), [self.label])
+
+    def test_invalid_filter_value(self):
+        """Тест фильтра с несуществующим значением"""
+        response = self.client.get(
+            reverse('tasks_index'), {'executor': 'nobody', 'labels': '0'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.context['filter'].is_valid())
+
+
+class TaskExportTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='author',
+            password='testpass123',
+            first_name='John',
+            last_name='Doe'
+        )
+        self.status_new = Status.objects.create(name='New')
+        self.status_done = Status.objects.create(name='Done')
+        self.label = Label.objects.create(name='Bug')
+        self.task = Task.objects.create(
+            name='Exported task',
+            description='Line one',
+            status=self.status_new,
+            author=self.user,
+            executor=self.user
+        )
+        self.task.labels.add(self.label)
+        Task.objects.create(
+            name='Finished task',
+            status=self.status_done,
+            author=self.user
+        )
+        self.client.force_login(self.user)
+
+    def get_content(self, response):
+        self.assertIsInstance(response, StreamingHttpResponse)
+        return b''.join(response.streaming_content).decode()
+
+    def test_export_requires_login(self):
+        """Тест что экспорт требует авторизации"""
+        self.client.logout()
+        response = self.client.get(reverse('tasks_export'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_export_csv_with_filter(self):
+        """Тест экспорта в CSV с фильтром"""
+        response = self.client.get(
+            reverse('tasks_export'),
+            {'format': 'csv', 'status': self.status_new.id}
+        )
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        rows = list(csv.DictReader(StringIO(self.get_content(response))))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['name'], 'Exported task')
+        self.assertEqual(rows[0]['status'], 'New')
+        self.assertEqual(rows[0]['executor'], 'author')
+        self.assertEqual(rows[0]['labels'], 'Bug')
+
+    def test_export_jsonl(self):
+        """Тест экспорта в JSONL"""
+        response = self.client.get(reverse('tasks_export'), {'format': 'jsonl'})
+        lines = self.get_content(response).splitlines()
+        tasks = [json.loads(line) for line in lines]
+        self.assertEqual(
+            [task['name'] for task in tasks],
+            ['Exported task', 'Finished task']
+        )
+        self.assertEqual(tasks[0]['labels'], ['Bug'])
+        self.assertIsNone(tasks[1]['executor'])
+
+    def test_export_fetches_labels_in_batches(self):
+        """Тест что метки загружаются пачками"""
+        Task.objects.bulk_create([
+            Task(name=f'Bulk {index}', status=self.status_new, author=self.user)
+            for index in range(30)
+        ])
+        response = self.client.get(reverse('tasks_export'))
+        with CaptureQueriesContext(connection) as queries:
+            content = self.get_content(response)
+        self.assertEqual(len(content.splitlines()), 33)
+        self.assertLessEqual(len(queries), 2)
+
+    def test_export_unknown_format(self):
+        """Тест неизвестного формата экспорта"""
+        response = self.client.get(reverse('tasks_export'), {'format': 'xls'})
+        self.assertEqual(response.status_code, 400)
+
+
+class TaskImportTest(TestCase):
+    def setUp(self):
+        self.user1 = User.objects.create_user(
+            username='user1',
+            password='password123',
+            first_name='John',
+            last_name='Doe'
+        )
+        self.user2 = User.objects.create_user(
+            username='user2',
+            password='password123',
+            first_name='Jane',
+            last_name='Smith'
+        )
+        self.status = Status.objects.create(name='New')
+        self.label_bug = Label.objects.create(name='Bug')
+        self.label_feature = Label.objects.create(name='Feature')
+
+    def write_file(self, suffix, content):
+        file = tempfile.NamedTemporaryFile(
+            'w', suffix=suffix, delete=False, encoding='utf-8'
+        )
+        with file:
+            file.write(content)
+        self.addCleanup(os.remove, file.name)
+        return file.name
+
+    def import_tasks(self, path, *args):
+        out, err = StringIO(), StringIO()
+        call_command('import_tasks', path, *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_import_csv(self):
+        """Тест импорта задач из CSV"""
+        path = self.write_file('.csv', (
+            'name,description,status,author,executor,labels\n'
+            'First,Text,New,user1,user2,"Bug, Feature"\n'
+            'Second,,New,user2,,\n'
+            'Third,,New,user1,user1,Bug\n'
+        ))
+        out, err = self.import_tasks(path, '--batch-size', '2')
+
+        self.assertIn('Imported 3 tasks, skipped 0 rows', out)
+        self.assertIn('rows/s', out)
+        first = Task.objects.get(name='First')
+        self.assertEqual(first.author, self.user1)
+        self.assertEqual(first.executor, self.user2)
+        self.assertEqual(
+            set(first.labels.all()), {self.label_bug, self.label_feature}
+        )
+        self.assertIsNone(Task.objects.get(name='Second').executor)
+
+    def test_import_jsonl_skips_invalid_rows(self):
+        """Тест что строки с ошибками пропускаются"""
+        rows = [
+            {'name': 'Valid', 'status': 'New', 'author': 'user1',
+             'labels': ['Bug']},
+            {'name': 'Bad status', 'status': 'Missing', 'author': 'user1'},
+            {'name': 'Bad author', 'status': 'New', 'author': 'nobody'},
+            {'name': 'Bad label', 'status': 'New', 'author': 'user1',
+             'labels': ['Unknown']},
+        ]
+        path = self.write_file(
+            '.jsonl', '\n'.join(json.dumps(row) for row in rows)
+        )
+        out, err = self.import_tasks(path)
+
+        self.assertIn('Imported 1 tasks, skipped 3 rows', out)
+        self.assertIn('Row 2: unknown status', err)
+        self.assertIn('Row 3: unknown author', err)
+        self.assertIn('Row 4: unknown labels Unknown', err)
+        self.assertEqual(
+            list(Task.objects.values_list('name', flat=True)), ['Valid']
+        )
+
+    def test_import_jsonl_skips_malformed_lines(self):
+        """Тест что некорректные строки JSONL пропускаются"""
+        valid = json.dumps({'name': 'Valid', 'status': 'New',
+                            'author': 'user1'})
+        path = self.write_file(
+            '.jsonl', '\n'.join(['{"name": ', '[1]', valid])
+        )
+        out, err = self.import_tasks(path, '--batch-size=1')
+
+        self.assertIn('Imported 1 tasks, skipped 2 rows', out)
+        self.assertIn('Row 1: line 1: invalid JSON', err)
+        self.assertIn('Row 2: line 2: not a JSON object', err)
+        self.assertEqual(
+            list(Task.objects.values_list('name', flat=True)), ['Valid']
+        )
+
+    def test_import_jsonl_skips_fields_of_other_types(self):
+        """Тест что поля JSONL не строкового типа пропускаются"""
+        rows = [
+            {'name': 'Valid', 'status': 'New', 'author': 'user1',
+             'labels': ['Bug']},
+            {'name': 123, 'status': 'New', 'author': 'user1'},
+            {'name': 'Bad labels', 'status': 'New', 'author': 'user1',
+             'labels': 5},
+            {'name': 'Bad label', 'status': 'New', 'author': 'user1',
+             'labels': ['Bug', 7]},
+            {'name': 'Bad status', 'status': {'name': 'New'},
+             'author': 'user1'},
+        ]
+        path = self.write_file(
+            '.jsonl', '\n'.join(json.dumps(row) for row in rows)
+        )
+        out, err = self.import_tasks(path)
+
+        self.assertIn('Imported 1 tasks, skipped 4 rows', out)
+        self.assertIn('Row 2: line 2: invalid name', err)
+        self.assertIn('Row 3: line 3: invalid labels', err)
+        self.assertIn('Row 4: line 4: invalid labels', err)
+        self.assertIn('Row 5: line 5: invalid status', err)
+        self.assertEqual(
+            list(Task.objects.values_list('name', flat=True)), ['Valid']
+        )
+
+    def test_import_creates_missing_statuses_and_labels(self):
+        """Тест создания недостающих статусов и меток"""
+        path = self.write_file('.csv', (
+            'name,status,author,labels\n'
+            'Task,Imported status,user1,Imported label\n'
+        ))
+        self.import_tasks(path, '--create-missing')
+
+        task = Task.objects.get(name='Task')
+        self.assertEqual(task.status.name, 'Imported status')
+        self.assertEqual(
+            list(task.labels.values_list('name', flat=True)),
+            ['Imported label']
+        )
+
+    def test_import_uses_one_lookup_per_batch(self):
+        """Тест что справочники загружаются один раз на пачку"""
+        path = self.write_file(
+            '.csv',
+            'name,status,author,executor,labels\n'
+            + 'Task,New,user1,user2,Bug\n' * 50
+        )
+        with CaptureQueriesContext(connection) as queries:
+            self.import_tasks(path, '--batch-size', '25')
+        self.assertEqual(Task.objects.count(), 50)
+        selects = [
+            query for query in queries.captured_queries
+            if query['sql'].startswith('SELECT')
+        ]
+        self.assertEqual(len(selects), 6)
+        self.assertEqual(
+            set(Task.objects.values_list(
+                'status_name', 'author_name', 'executor_name'
+            )),
+            {('New', str(self.user1), str(self.user2))}
+        )
+
+    def test_import_export_round_trip(self):
+        """Тест импорта файла, полученного экспортом"""
+        task = Task.objects.create(
+            name='Round trip',
+            status=self.status,
+            author=self.user1,
+            executor=self.user2
+        )
+        task.labels.add(self.label_bug, self.label_feature)
+        self.client.force_login(self.user1)
+        response = self.client.get(reverse('tasks_export'))
+        path = self.write_file(
+            '.csv', b''.join(response.streaming_content).decode()
+        )
+        task.delete()
+
+        self.import_tasks(path)
+
+        imported = Task.objects.get(name='Round trip')
+        self.assertEqual(imported.executor, self.user2)
+        self.assertEqual(imported.labels.count(), 2)
+
+    def test_import_unknown_format(self):
+        """Тест неизвестного формата файла"""
+        path = self.write_file('.txt', '')
+        with self.assertRaises(CommandError):
+            self.import_tasks(path)
+
+
+class TaskBulkActionTest(TestCase):
+    def setUp(self):
+        self.user1 = User.objects.create_user(
+            username='user1',
+            password='password123'
+        )
+        self.user2 = User.objects.create_user(
+            username='user2',
+            password='password123'
+        )
+        self.status_new = Status.objects.create(name='New')
+        self.status_done = Status.objects.create(name='Done')
+        self.label_bug = Label.objects.create(name='Bug')
+        self.label_feature = Label.objects.create(name='Feature')
+        self.own_tasks = [
+            Task.objects.create(
+                name=f'Own {index}',
+                status=self.status_new,
+                author=self.user1
+            )
+            for index in range(3)
+        ]
+        self.other_task = Task.objects.create(
+            name='Other',
+            status=self.status_new,
+            author=self.user2
+        )
+        self.all_ids = [task.id for task in self.own_tasks] + [
+            self.other_task.id
+        ]
+        self.client.force_login(self.user1)
+
+    def post(self, **data):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('tasks_bulk'), data)
+        self.assertEqual(response.status_code, 302)
+        return [query['sql'] for query in queries.captured_queries]
+
+    def count_statements(self, queries, statement, table):
+        pattern = re.compile(rf'{statement}\b[^"]*"{table}"')
+        return len([sql for sql in queries if pattern.match(sql)])
+
+    def test_set_status_in_one_update(self):
+        """Тест массовой смены статуса одним UPDATE"""
+        queries = self.post(
+            tasks=self.all_ids,
+            action='set_status',
+            status=self.status_done.id
+        )
+        self.assertEqual(
+            self.count_statements(queries, 'UPDATE', 'tasks_task'), 1
+        )
+        self.assertEqual(
+            Task.objects.filter(status=self.status_done).count(), 4
+        )
+
+    def test_set_executor(self):
+        """Тест массовой смены исполнителя"""
+        self.post(
+            tasks=self.all_ids[:2],
+            action='set_executor',
+            executor=self.user2.id
+        )
+        self.assertEqual(Task.objects.filter(executor=self.user2).count(), 2)
+
+    def test_add_and_remove_labels(self):
+        """Тест массового добавления и удаления меток"""
+        self.own_tasks[0].labels.add(self.label_bug)
+        queries = self.post(
+            tasks=self.all_ids,
+            action='add_labels',
+            labels=[self.label_bug.id, self.label_feature.id]
+        )
+        self.assertEqual(
+            self.count_statements(queries, 'INSERT', 'tasks_task_labels'), 1
+        )
+        self.assertEqual(Task.labels.through.objects.count(), 8)
+
+        queries = self.post(
+            tasks=self.all_ids,
+            action='remove_labels',
+            labels=[self.label_bug.id]
+        )
+        self.assertEqual(
+            self.count_statements(queries, 'DELETE', 'tasks_task_labels'), 1
+        )
+        self.assertFalse(self.label_bug.tasks.exists())
+        self.assertEqual(self.label_feature.tasks.count(), 4)
+
+    def test_delete_only_own_tasks(self):
+        """Тест что массово удаляются только свои задачи"""
+        self.post(tasks=self.all_ids, action='delete')
+        self.assertEqual(list(Task.objects.all()), [self.other_task])
+
+    def test_action_requires_value(self):
+        """Тест что действие требует значение"""
+        response = self.client.post(
+            reverse('tasks_bulk'),
+            {'tasks': self.all_ids, 'action': 'set_status'},
+            follow=True
+        )
+        self.assertContains(response, _('Choose a status'))
+        self.assertFalse(Task.objects.filter(status=self.status_done).exists())
+
+    def test_redirects_back_to_filtered_list(self):
+        """Тест возврата к отфильтрованному списку"""
+        next_url = reverse('tasks_index') + f'?status={self.status_new.id}'
+        response = self.client.post(reverse('tasks_bulk'), {
+            'tasks': self.all_ids,
+            'action': 'set_executor',
+            'next': next_url,
+        })
+        self.assertRedirects(response, next_url)
+
+        response = self.client.post(reverse('tasks_bulk'), {
+            'tasks': self.all_ids,
+            'action': 'set_executor',
+            'next': 'https://example.com/',
+        })
+        self.assertRedirects(response, reverse('tasks_index'))
+
+
+class TaskConditionalGetTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='user1',
+            password='password123'
+        )
+        self.status = Status.objects.create(name='New')
+        self.label = Label.objects.create(name='Bug')
+        self.task = Task.objects.create(
+            name='Task',
+            status=self.status,
+            author=self.user
+        )
+        self.client.force_login(self.user)
+        self.url = reverse('tasks_index')
+        # The first response sets the CSRF cookie that forms depend on
+        self.client.get(self.url)
+
+    def get_etag(self, url=None):
+        response = self.client.get(url or self.url)
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def assertNotModified(self, etag, url=None):
+        response = self.client.get(url or self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def assertModified(self, etag, url=None):
+        response = self.client.get(url or self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_not_modified(self):
+        """Тест ответа 304 для неизменившегося списка задач"""
+        response = self.client.get(self.url)
+        self.assertIn('private', response['Cache-Control'])
+        self.assertNotModified(response['ETag'])
+
+    def test_task_change(self):
+        """Тест что изменение задачи обновляет ETag"""
+        etag = self.get_etag()
+        self.task.name = 'Renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.save()
+        self.assertModified(etag)
+
+    def test_related_name_change(self):
+        """Тест что переименование статуса обновляет ETag"""
+        etag = self.get_etag()
+        self.status.name = 'Renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.status.save()
+        self.assertModified(etag)
+
+    def test_bulk_label_change(self):
+        """Тест что массовое добавление метки обновляет ETag"""
+        etag = self.get_etag()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('tasks_bulk'), {
+                'tasks': [self.task.id],
+                'action': 'add_labels',
+                'labels': [self.label.id],
+            })
+        self.client.get(self.url)
+        self.assertModified(etag)
+
+    def test_freshness_costs_no_query(self):
+        """Тест что ответ 304 не считает задачи"""
+        etag = self.get_etag()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertNotModified(etag)
+        self.assertFalse(
+            [query for query in queries if 'tasks_task' in query['sql']]
+        )
+
+    def test_filterset_built_once(self):
+        """Тест что выбранные метки загружаются один раз"""
+        url = self.url + f'?labels={self.label.id}'
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        selected = [
+            query for query in queries
+            if query['sql'].startswith('SELECT "labels_label"')
+        ]
+        self.assertEqual(len(selected), 1)
+
+    def test_etag_depends_on_filter(self):
+        """Тест что ETag зависит от фильтра"""
+        etag = self.get_etag()
+        filtered = self.url + f'?status={self.status.id}'
+        self.assertModified(etag, filtered)
+
+    def test_pending_messages_skip_not_modified(self):
+        """Тест что страница с сообщениями всегда отдаётся целиком"""
+        etag = self.get_etag()
+        self.client.post(reverse('task_update', args=[self.task.id]), {
+            'name': self.task.name,
+            'status': self.status.id,
+        })
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, _('Task successfully updated'))
+
+    def test_detail_not_modified(self):
+        """Тест ответа 304 для страницы задачи"""
+        url = reverse('task_detail', args=[self.task.id])
+        etag = self.get_etag(url)
+        self.assertNotModified(etag, url)
+        self.task.labels.add(self.label)
+        self.task.save()
+        self.assertModified(etag, url)
+
+
+class TaskSearchTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='user1',
+            password='password123'
+        )
+        self.status_new = Status.objects.create(name='New')
+        self.status_done = Status.objects.create(name='Done')
+        self.in_name = Task.objects.create(
+            name='Fix login page',
+            description='Users see an error',
+            status=self.status_new,
+            author=self.user
+        )
+        self.in_description = Task.objects.create(
+            name='Release',
+            description='Deploy after the login fix is merged',
+            status=self.status_done,
+            author=self.user
+        )
+        Task.objects.create(
+            name='Write docs',
+            status=self.status_new,
+            author=self.user
+        )
+        self.client.force_login(self.user)
+
+    def search(self, **params):
+        response = self.client.get(reverse('tasks_index'), params)
+        self.assertEqual(response.status_code, 200)
+        return list(response.context['tasks'])
+
+    def test_ranked_by_relevance(self):
+        """Тест поиска с ранжированием по релевантности"""
+        self.assertEqual(
+            self.search(search='login'),
+            [self.in_name, self.in_description]
+        )
+
+    def test_prefix_and_all_terms(self):
+        """Тест поиска по префиксу и всем словам запроса"""
+        self.assertEqual(self.search(search='LOG FIX'), [
+            self.in_name, self.in_description
+        ])
+        self.assertEqual(self.search(search='login docs'), [])
+
+    def test_combines_with_filters(self):
+        """Тест поиска вместе с фильтром по статусу"""
+        self.assertEqual(
+            self.search(search='login', status=self.status_done.id),
+            [self.in_description]
+        )
+
+    def test_index_follows_changes(self):
+        """Тест обновления индекса при изменении и удалении задач"""
+        self.in_name.name = 'Fix signup page'
+        self.in_name.save()
+        self.assertEqual(self.search(search='signup'), [self.in_name])
+        self.assertEqual(self.search(search='login'), [self.in_description])
+        self.in_description.delete()
+        self.assertEqual(self.search(search='login'), [])
+
+    def test_query_syntax_is_escaped(self):
+        """Тест что спецсимволы запроса не ломают поиск"""
+        for query in ['"login', 'login AND OR', 'NEAR(login', '*', "l'o"]:
+            with self.subTest(query=query):
+                self.search(search=query)
+
+    def test_pages_keep_rank_order(self):
+        """Тест постраничного вывода результатов поиска"""
+        Task.objects.bulk_create([
+            Task(
+                name=f'Login task {index}',
+                status=self.status_new,
+                author=self.user
+            )
+            for index in range(60)
+        ])
+        response = self.client.get(reverse('tasks_index'), {'search': 'login'})
+        first = list(response.context['tasks'])
+        cursor = response.context['page_obj'].next_cursor
+        second = self.search(search='login', after=cursor)
+        self.assertEqual(len(first) + len(second), 62)
+        self.assertEqual(second[-1], self.in_description)
+
+    @skipUnless(
+        connection.vendor == 'postgresql',
+        'Needs DATABASE_URL pointing to PostgreSQL'
+    )
+    def test_pages_keep_tied_ranks(self):
+        """Тест что страницы поиска не теряют задачи с равным рангом"""
+        Task.objects.bulk_create([
+            Task(
+                name=f'Login task {index}',
+                description=' '.join(['login'] * (index % 7)),
+                status=self.status_new,
+                author=self.user
+            )
+            for index in range(150)
+        ])
+        found, params = [], {'search': 'login'}
+        while True:
+            response = self.client.get(reverse('tasks_index'), params)
+            page = response.context['page_obj']
+            found.extend(task.pk for task in page)
+            if not page.has_next():
+                break
+            params = {'search': 'login', 'after': page.next_cursor}
+        expected = list(
+            search_tasks(Task.objects.all(), 'login')
+            .order_by(f'-{SEARCH_RANK}', 'created_at', 'id')
+            .values_list('pk', flat=True)
+        )
+        self.assertEqual(found, expected)
+
+
+class TaskCounterTest(TestCase):
+    def setUp(self):
+        self.user1 = User.objects.create_user(
+            username='user1',
+            password='password123'
+        )
+        self.user2 = User.objects.create_user(
+            username='user2',
+            password='password123'
+        )
+        self.status_new = Status.objects.create(name='New')
+        self.status_done = Status.objects.create(name='Done')
+        self.label_bug = Label.objects.create(name='Bug')
+        self.label_feature = Label.objects.create(name='Feature')
+        self.client.force_login(self.user1)
+
+    def assertCountersCorrect(self):
+        call_command(
+            'rebuild_task_counters',
+            check=True,
+            stdout=StringIO(),
+            stderr=StringIO()
+        )
+
+    def create_task(self, **data):
+        self.client.post(reverse('task_create'), {
+            'name': 'Task',
+            'status': self.status_new.id,
+            **data,
+        })
+        return Task.objects.latest('id')
+
+    def test_task_views_keep_counters(self):
+        """Тест счётчиков при создании, изменении и удалении задачи"""
+        task = self.create_task(
+            executor=self.user2.id,
+            labels=[self.label_bug.id, self.label_feature.id]
+        )
+        self.assertEqual(counters.get_counts(TaskCounter.STATUS), {
+            self.status_new.id: 1
+        })
+        self.assertEqual(
+            counters.get_count(TaskCounter.EXECUTOR, self.user2.id), 1
+        )
+        self.assertEqual(
+            counters.get_count(TaskCounter.LABEL, self.label_bug.id), 1
+        )
+        self.assertCountersCorrect()
+
+        self.client.post(reverse('task_update', args=[task.id]), {
+            'name': 'Task',
+            'status': self.status_done.id,
+            'labels': [self.label_feature.id],
+        })
+        self.assertEqual(counters.get_counts(TaskCounter.STATUS), {
+            self.status_new.id: 0,
+            self.status_done.id: 1,
+        })
+        self.assertEqual(
+            counters.get_count(TaskCounter.LABEL, self.label_bug.id), 0
+        )
+        self.assertEqual(
+            counters.get_count(TaskCounter.EXECUTOR, self.user2.id), 0
+        )
+        self.assertCountersCorrect()
+
+        self.client.post(reverse('task_delete', args=[task.id]))
+        self.assertFalse(Task.objects.exists())
+        self.assertEqual(
+            counters.get_count(TaskCounter.LABEL, self.label_feature.id), 0
+        )
+        self.assertCountersCorrect()
+
+    def test_stale_instances_keep_counters(self):
+        """Тест счётчиков при сохранении перечитанной и устаревшей задачи"""
+        task = self.create_task()
+        stale = Task.objects.get(pk=task.pk)
+        task.status = self.status_done
+        task.save()
+        # Changed and saved meanwhile through another instance
+        stale.status = self.status_done
+        stale.executor = self.user2
+        stale.save()
+        self.assertCountersCorrect()
+
+        task.status = self.status_new
+        task.refresh_from_db()
+        task.executor = None
+        task.save()
+        self.assertEqual(counters.get_counts(TaskCounter.STATUS), {
+            self.status_new.id: 0,
+            self.status_done.id: 1,
+        })
+        self.assertEqual(
+            counters.get_count(TaskCounter.EXECUTOR, self.user2.id), 0
+        )
+        self.assertCountersCorrect()
+
+    def test_m2m_changes_from_both_sides(self):
+        """Тест счётчиков меток при изменении связей с обеих сторон"""
+        task = self.create_task()
+        self.label_bug.tasks.add(task)
+        task.labels.add(self.label_bug, self.label_feature)
+        task.labels.remove(self.label_feature, self.label_feature)
+        self.assertCountersCorrect()
+        self.label_bug.tasks.clear()
+        self.assertEqual(
+            counters.get_count(TaskCounter.LABEL, self.label_bug.id), 0
+        )
+        self.assertCountersCorrect()
+
+    def test_bulk_actions_keep_counters(self):
+        """Тест счётчиков при массовых действиях"""
+        tasks = [self.create_task(name=f'Task {index}') for index in range(3)]
+        ids = [task.id for task in tasks]
+        url = reverse('tasks_bulk')
+        actions = [
+            {'action': 'set_status', 'status': self.status_done.id},
+            {'action': 'set_executor', 'executor': self.user2.id},
+            {'action': 'add_labels', 'labels': [self.label_bug.id]},
+            {
+                'action': 'add_labels',
+                'labels': [self.label_bug.id, self.label_feature.id],
+            },
+            {'action': 'remove_labels', 'labels': [self.label_bug.id]},
+            {'action': 'set_executor', 'executor': ''},
+        ]
+        for data in actions:
+            with self.subTest(**data):
+                self.client.post(url, {'tasks': ids[1:], **data})
+                self.assertCountersCorrect()
+        self.assertEqual(
+            counters.get_count(TaskCounter.LABEL, self.label_feature.id), 2
+        )
+
+        self.client.post(url, {'tasks': ids, 'action': 'delete'})
+        self.assertEqual(
+            counters.get_count(TaskCounter.AUTHOR, self.user1.id), 0
+        )
+        self.assertCountersCorrect()
+
+    def test_import_keeps_counters(self):
+        """Тест счётчиков при импорте задач"""
+        file = tempfile.NamedTemporaryFile(
+            'w', suffix='.csv', delete=False, encoding='utf-8'
+        )
+        with file:
+            file.write(
+                'name,status,author,executor,labels\n'
+                'One,New,user1,user2,"Bug, Feature"\n'
+                'Two,Done,user2,,Bug\n'
+            )
+        self.addCleanup(os.remove, file.name)
+        call_command('import_tasks', file.name, stdout=StringIO())
+        self.assertEqual(
+            counters.get_count(TaskCounter.LABEL, self.label_bug.id), 2
+        )
+        self.assertCountersCorrect()
+
+    def test_rebuild(self):
+        """Тест пересчёта счётчиков по частям"""
+        for index in range(5):
+            self.create_task(name=f'Task {index}', labels=[self.label_bug.id])
+        TaskCounter.objects.update(count=100)
+        with self.assertRaises(CommandError):
+            self.assertCountersCorrect()
+
+        call_command('rebuild_task_counters', chunk_size=2, stdout=StringIO())
+        self.assertEqual(
+            counters.get_count(TaskCounter.LABEL, self.label_bug.id), 5
+        )
+        self.assertCountersCorrect()
+
+    def test_reading_counts_is_one_query(self):
+        """Тест что чтение счётчиков не зависит от числа задач"""
+        for index in range(5):
+            self.create_task(name=f'Task {index}')
+        with self.assertNumQueries(1):
+            counts = counters.get_counts(TaskCounter.AUTHOR)
+        self.assertEqual(counts, {self.user1.id: 5})
+
+
+class TaskDashboardTest(TestCase):
+    def setUp(self):
+        self.user1 = User.objects.create_user(
+            username='user1',
+            password='password123'
+        )
+        self.user2 = User.objects.create_user(
+            username='user2',
+            password='password123'
+        )
+        self.status_new = Status.objects.create(name='New')
+        self.status_done = Status.objects.create(name='Done')
+        self.client.force_login(self.user1)
+
+    def get_dashboard(self):
+        response = self.client.get(reverse('index'))
+        self.assertEqual(response.status_code, 200)
+        return response.context['dashboard']
+
+    def test_dashboard_counts(self):
+        """Тест сводки задач по статусам"""
+        Task.objects.create(
+            name='Mine', status=self.status_new,
+            author=self.user1, executor=self.user1
+        )
+        Task.objects.create(
+            name='Assigned', status=self.status_done,
+            author=self.user2, executor=self.user1
+        )
+        Task.objects.create(
+            name='Authored', status=self.status_done,
+            author=self.user1, executor=self.user2
+        )
+        Task.objects.create(
+            name='Foreign', status=self.status_new, author=self.user2
+        )
+        dashboard = self.get_dashboard()
+        self.assertEqual(dashboard['assigned'], 2)
+        self.assertEqual(dashboard['authored'], 2)
+        self.assertEqual(
+            [
+                (row['status'], row['assigned'], row['authored'])
+                for row in dashboard['by_status']
+            ],
+            [(self.status_new, 1, 1), (self.status_done, 1, 1)]
+        )
+        self.assertEqual(
+            [task.name for task in dashboard['recent']],
+            ['Authored', 'Assigned', 'Mine']
+        )
+
+    def test_anonymous_sees_landing(self):
+        """Тест главной страницы без входа"""
+        self.client.logout()
+        response = self.client.get(reverse('index'))
+        self.assertNotIn('dashboard', response.context)
+
+    def test_dashboard_is_cached(self):
+        """Тест что сводка берётся из кеша до изменения задач"""
+        Task.objects.create(
+            name='Task', status=self.status_new, author=self.user1
+        )
+        self.get_dashboard()
+        with self.assertNumQueries(2):
+            dashboard = self.get_dashboard()
+        self.assertEqual(dashboard['authored'], 1)
+
+    def test_task_changes_invalidate_dashboard(self):
+        """Тест сброса сводки автора и исполнителя при изменении задачи"""
+        with self.captureOnCommitCallbacks(execute=True):
+            task = Task.objects.create(
+                name='Task', status=self.status_new, author=self.user2
+            )
+        self.assertEqual(self.get_dashboard()['assigned'], 0)
+
+        task.executor = self.user1
+        with self.captureOnCommitCallbacks(execute=True):
+            task.save()
+        self.assertEqual(self.get_dashboard()['assigned'], 1)
+
+        task.executor = self.user2
+        with self.captureOnCommitCallbacks(execute=True):
+            task.save()
+        self.assertEqual(self.get_dashboard()['assigned'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk.set_executor(Task.objects.filter(pk=task.pk), self.user1)
+        self.assertEqual(self.get_dashboard()['assigned'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk.set_status(
+                Task.objects.filter(pk=task.pk), self.status_done
+            )
+        self.assertEqual(
+            self.get_dashboard()['by_status'][0]['status'],
+            self.status_done
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk.delete(Task.objects.filter(pk=task.pk))
+        self.assertEqual(self.get_dashboard()['assigned'], 0)
+
+    def test_dashboard_invalidated_on_commit(self):
+        """Тест что сводка сбрасывается только после коммита"""
+        version = get_dashboard_version(self.user1.pk)
+        with self.captureOnCommitCallbacks() as callbacks:
+            Task.objects.create(
+                name='Task', status=self.status_new, author=self.user2,
+                executor=self.user1
+            )
+            self.assertEqual(get_dashboard_version(self.user1.pk), version)
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(get_dashboard_version(self.user1.pk), version)
+
+    def test_status_rename_refreshes_dashboard(self):
+        """Тест обновления сводки при переименовании статуса"""
+        Task.objects.create(
+            name='Task', status=self.status_new, author=self.user1
+        )
+        self.get_dashboard()
+        self.status_new.name = 'Open'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.status_new.save()
+        row = self.get_dashboard()['by_status'][0]
+        self.assertEqual(row['status'].name, 'Open')
+
+
+@override_settings(ROOT_URLCONF='task_manager.urls_async')
+class TaskAsyncViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='user1',
+            password='password123'
+        )
+        self.status_new = Status.objects.create(name='New')
+        self.status_done = Status.objects.create(name='Done')
+        self.label = Label.objects.create(name='Bug')
+        self.task_new = Task.objects.create(
+            name='New task',
+            status=self.status_new,
+            author=self.user
+        )
+        self.task_new.labels.add(self.label)
+        self.task_done = Task.objects.create(
+            name='Done task',
+            status=self.status_done,
+            author=self.user
+        )
+
+    async def test_task_list(self):
+        """Тест асинхронного списка задач с фильтром"""
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(
+            reverse('tasks_index'),
+            {'status': self.status_new.id}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['tasks']), [self.task_new])
+        self.assertContains(response, 'Bug')
+        self.assertIn('filter', response.context)
+
+    async def test_task_list_invalid_cursor(self):
+        """Тест ошибки 404 для неверного курсора страницы"""
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(
+            reverse('tasks_index'),
+            {'after': 'broken'}
+        )
+        self.assertEqual(response.status_code, 404)
+
+    async def test_task_detail(self):
+        """Тест асинхронной страницы задачи"""
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(
+            reverse('task_detail', kwargs={'pk': self.task_new.pk})
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'New task')
+        response = await self.async_client.get(
+            reverse('task_detail', kwargs={'pk': self.task_done.pk + 1})
+        )
+        self.assertEqual(response.status_code, 404)
+
+    async def test_login_required(self):
+        """Тест перенаправления гостя на страницу входа"""
+        response = await self.async_client.get(reverse('tasks_index'))
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response.url.startswith(reverse('login')))
+
+    async def test_not_modified(self):
+        """Тест ответа 304 асинхронного списка задач"""
+        await self.async_client.aforce_login(self.user)
+        url = reverse('tasks_index')
+        # The first response sets the CSRF cookie
+        await self.async_client.get(url)
+        response = await self.async_client.get(url)
+        etag = response['ETag']
+        response = await self.async_client.get(
+            url,
+            headers={'If-None-Match': etag}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_same_queries_as_sync(self):
+        """Тест что асинхронный список стоит столько же запросов"""
+        url = reverse('tasks_index')
+        async_get = async_to_sync(self.async_client.get)
+        self.client.force_login(self.user)
+        async_to_sync(self.async_client.aforce_login)(self.user)
+        with self.settings(ROOT_URLCONF='task_manager.urls'):
+            self.client.get(url)
+            with CaptureQueriesContext(connection) as sync_queries:
+                self.client.get(url)
+        async_get(url)
+        with CaptureQueriesContext(connection) as async_queries:
+            async_get(url)
+        self.assertEqual(len(async_queries), len(sync_queries))
@@ -7,6 +7,8 @@ from task_manager.tasks import views
 urlpatterns = [
     path('', views.TaskListView.as_view(), name='tasks_index'),
     path('create/', views.TaskCreateView.as_view(), name='task_create'),
+    path('export/', views.TaskExportView.as_view(), name='tasks_export'),
+    path('bulk/', views.TaskBulkActionView.as_view(), name='tasks_bulk'),
     path(
         '<int:pk>/update/',
         views.TaskUpdateView.as_view(),
@@ -1,28 +1,45 @@
 from django.contrib import messages
+from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
+from django.http import HttpResponseBadRequest, StreamingHttpResponse
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
+from django.utils.http import url_has_allowed_host_and_scheme
 from django.utils.translation import gettext_lazy as _
+from django.views import View
 from django.views.generic import CreateView, DeleteView, DetailView, UpdateView
-from django_filters.views import FilterView
+from django_filters.views import FilterMixin, FilterView
 
-from task_manager.tasks.filters import TaskFilter
-from task_manager.tasks.forms import TaskForm
+from task_manager.labels.models import Label
+from task_manager.mixins import (
+    AsyncDetailMixin,
+    AsyncListMixin,
+    ConditionalGetMixin,
+    ObjectCacheMixin,
+)
+from task_manager.pagination import KeysetPaginationMixin
+from task_manager.statuses.models import Status
+from task_manager.tasks import bulk
+from task_manager.tasks.export import EXPORT_CHUNK_SIZE, EXPORT_FORMATS
+from task_manager.tasks.facets import get_facets
+from task_manager.tasks.filters import TASK_SORTS, TaskFilter
+from task_manager.tasks.forms import TaskBulkActionForm, TaskForm
 from task_manager.tasks.models import Task
+from task_manager.tasks.search import SEARCH_RANK
+
+User = get_user_model()
 
 TASKS_URL = reverse_lazy('tasks_index')
 
 
-class TaskListView(LoginRequiredMixin, FilterView):  
-    model = Task
-    template_name = 'tasks/index.html'
-    context_object_name = 'tasks'
-    filterset_class = TaskFilter  
-    ordering = ['created_at']
+class TaskFilterMixin(FilterMixin):
+    filterset_class = TaskFilter
 
     def get_queryset(self):
-        return Task.objects.select_related('author', 'executor', 'status')
+        return Task.objects.select_related(
+            'author', 'executor', 'status'
+        ).prefetch_related('labels')
 
     def get_filterset_kwargs(self, filterset_class):
         kwargs = super().get_filterset_kwargs(filterset_class)
@@ -31,15 +48,115 @@ class TaskListView(LoginRequiredMixin, FilterView):
         return kwargs
 
 
-class TaskDetailView(LoginRequiredMixin, DetailView):
+class TaskListView(
+    LoginRequiredMixin,
+    ConditionalGetMixin,
+    KeysetPaginationMixin,
+    TaskFilterMixin,
+    FilterView
+    ):
+    model = Task
+    template_name = 'tasks/index.html'
+    context_object_name = 'tasks'
+    ordering = ['created_at']
+    keyset_ordering = TASK_SORTS['created']
+    keyset_sorts = TASK_SORTS
+    default_sort = 'created'
+    freshness_models = (Task, Status, Label, User)
+    use_replica = True
+    facets = None
+
+    def get_keyset_ordering(self, queryset):
+        # Best matches first while searching, unless sorted by a column
+        if (
+            SEARCH_RANK in queryset.query.annotations
+            and self.get_sort() is None
+        ):
+            return [f'-{SEARCH_RANK}', *self.keyset_ordering]
+        return super().get_keyset_ordering(queryset)
+
+    def get_facets(self):
+        if self.facets is None and self.filterset.is_valid():
+            self.facets = get_facets(self.filterset)
+        return self.facets
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['bulk_form'] = TaskBulkActionForm()
+        facets = self.get_facets()
+        if facets is not None:
+            self.filterset.set_facets(facets)
+        return context
+
+
+class AsyncTaskListView(AsyncListMixin, TaskListView):
+    def get_object_list(self):
+        self.filterset = self.get_filterset(self.get_filterset_class())
+        if not self.filterset.is_valid():
+            return self.filterset.queryset.none()
+        # Unlike get_context_data(), this runs outside the event loop
+        self.get_facets()
+        return self.filterset.qs
+
+    def get_context_data(self, **kwargs):
+        return super().get_context_data(filter=self.filterset, **kwargs)
+
+
+class TaskExportView(LoginRequiredMixin, TaskFilterMixin, View):
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get('format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return HttpResponseBadRequest(_('Unknown export format'))
+        content_type, stream = EXPORT_FORMATS[export_format]
+
+        filterset = self.get_filterset(self.get_filterset_class())
+        if filterset.is_valid():
+            tasks = filterset.qs
+        else:
+            tasks = filterset.queryset.none()
+        tasks = tasks.order_by('created_at', 'id').iterator(
+            chunk_size=EXPORT_CHUNK_SIZE
+        )
+
+        response = StreamingHttpResponse(
+            stream(tasks),
+            content_type=content_type
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="tasks.{export_format}"'
+        )
+        return response
+
+
+class TaskDetailView(
+    LoginRequiredMixin,
+    ConditionalGetMixin,
+    ObjectCacheMixin,
+    DetailView
+    ):
     model = Task
     template_name = 'tasks/detail.html'
     context_object_name = 'task'
+    freshness_models = (Status, Label, User)
+    use_replica = True
+
+    def get_freshness(self):
+        # Label changes touch updated_at too; the page is rendered from
+        # the same fetch
+        return {'last_modified': self.get_object().updated_at}
 
     def get_queryset(self):
+        # The labels of a single task cost one query either way, and only
+        # when the page is rendered rather than answered with 304
         return Task.objects.select_related('author', 'executor', 'status')
 
 
+class AsyncTaskDetailView(AsyncDetailMixin, TaskDetailView):
+    async def aget_freshness(self):
+        task = await self.aget_object()
+        return {'last_modified': task.updated_at}
+
+
 class TaskCreateView(LoginRequiredMixin, SuccessMessageMixin, CreateView):
     model = Task
     form_class = TaskForm
@@ -52,7 +169,12 @@ class TaskCreateView(LoginRequiredMixin, SuccessMessageMixin, CreateView):
         return super().form_valid(form)
 
 
-class TaskUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
+class TaskUpdateView(
+    LoginRequiredMixin,
+    SuccessMessageMixin,
+    ObjectCacheMixin,
+    UpdateView
+    ):
     model = Task
     form_class = TaskForm
     template_name = 'tasks/update.html'
@@ -60,15 +182,20 @@ class TaskUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
     success_message = _('Task successfully updated')
 
 
-class TaskDeleteView(LoginRequiredMixin, SuccessMessageMixin, DeleteView):
+class TaskDeleteView(
+    LoginRequiredMixin,
+    SuccessMessageMixin,
+    ObjectCacheMixin,
+    DeleteView
+    ):
     model = Task
     template_name = 'tasks/delete.html'
     success_url = TASKS_URL
     success_message = _('Task successfully deleted')
+    owner_field = 'author'
 
     def dispatch(self, request, *args, **kwargs):
-        task = self.get_object()
-        if request.user != task.author:
+        if not self.get_object().is_owner:
             messages.error(
                 request,
                 _('A task can only be deleted by its author')
@@ -76,3 +203,54 @@ class TaskDeleteView(LoginRequiredMixin, SuccessMessageMixin, DeleteView):
             return redirect(TASKS_URL)
         return super().dispatch(request, *args, **kwargs)
 
+
+class TaskBulkActionView(LoginRequiredMixin, View):
+    def post(self, request, *args, **kwargs):
+        form = TaskBulkActionForm(request.POST)
+        if not form.is_valid():
+            for errors in form.errors.values():
+                for error in errors:
+                    messages.error(request, error)
+            return self.redirect_back()
+
+        data = form.cleaned_data
+        action = data['action']
+        tasks = Task.objects.filter(pk__in=data['tasks'])
+        if action == form.DELETE:
+            own_tasks = tasks.filter(author=request.user)
+            count = bulk.delete(own_tasks)
+            if count < len(data['tasks']):
+                messages.error(
+                    request,
+                    _('A task can only be deleted by its author')
+                )
+            if count:
+                messages.success(
+                    request,
+                    _('Tasks deleted: %(count)d') % {'count': count}
+                )
+            return self.redirect_back()
+
+        if action == form.SET_STATUS:
+            count = bulk.set_status(tasks, data['status'])
+        elif action == form.SET_EXECUTOR:
+            count = bulk.set_executor(tasks, data['executor'])
+        elif action == form.ADD_LABELS:
+            count = bulk.add_labels(tasks, data['labels'])
+        else:
+            count = bulk.remove_labels(tasks, data['labels'])
+        messages.success(
+            request,
+            _('Tasks updated: %(count)d') % {'count': count}
+        )
+        return self.redirect_back()
+
+    def redirect_back(self):
+        next_url = self.request.POST.get('next')
+        if next_url and url_has_allowed_host_and_scheme(
+            next_url,
+            allowed_hosts={self.request.get_host()},
+            require_https=self.request.is_secure(),
+        ):
+            return redirect(next_url)
+        return redirect(TASKS_URL)
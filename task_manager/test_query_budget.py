@@ -0,0 +1,178 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.dashboard import invalidate_dashboards
+from task_manager.tasks.models import Task
+
+User = get_user_model()
+
+USERS_COUNT = 40
+STATUSES_COUNT = 15
+LABELS_COUNT = 30
+TASKS_COUNT = 300
+LABELS_PER_TASK = 3
+
+
+def seed(users, statuses, labels, tasks):
+    User.objects.bulk_create([
+        User(
+            username=f'seed{index}',
+            first_name=f'First{index}',
+            last_name=f'Last{index}',
+        )
+        for index in range(users)
+    ])
+    Status.objects.bulk_create([
+        Status(name=f'Status {index}') for index in range(statuses)
+    ])
+    Label.objects.bulk_create([
+        Label(name=f'Label {index}') for index in range(labels)
+    ])
+    user_ids = list(User.objects.values_list('id', flat=True))
+    status_ids = list(Status.objects.values_list('id', flat=True))
+    label_ids = list(Label.objects.values_list('id', flat=True))
+    Task.objects.bulk_create([
+        Task(
+            name=f'Seed task {index}',
+            status_id=status_ids[index % len(status_ids)],
+            author_id=user_ids[index % len(user_ids)],
+            executor_id=user_ids[(index + 1) % len(user_ids)],
+        )
+        for index in range(tasks)
+    ])
+    Through = Task.labels.through
+    Through.objects.bulk_create([
+        Through(
+            task_id=task_id,
+            label_id=label_ids[(task_id + offset) % len(label_ids)],
+        )
+        for task_id in Task.objects.values_list('id', flat=True)
+        for offset in range(min(LABELS_PER_TASK, len(label_ids)))
+    ])
+
+
+class QueryBudgetTest(TestCase):
+    """
+    Число SQL-запросов на страницу не должно зависеть от объёма данных.
+    Бюджеты включают загрузку сессии и пользователя; актуальность
+    списков проверяется по версиям в кеше, без запросов.
+    """
+
+    budgets = {
+        'index': 2,
+        'tasks_index': 5,
+        'task_detail': 4,
+        'task_create': 2,
+        # The selected executor and labels, the only options rendered
+        'task_update': 6,
+        'task_delete': 3,
+        'statuses_index': 3,
+        'status_create': 2,
+        'status_update': 3,
+        'status_delete': 3,
+        'labels_index': 3,
+        'label_create': 2,
+        'label_update': 3,
+        'label_delete': 3,
+        'users_index': 3,
+        'user_create': 2,
+        'user_update': 3,
+        'user_delete': 3,
+    }
+
+    # Session and user, plus the object of a detail page
+    not_modified_budgets = {
+        'tasks_index': 2,
+        'task_detail': 3,
+        'statuses_index': 2,
+        'labels_index': 2,
+        'users_index': 2,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(USERS_COUNT, STATUSES_COUNT, LABELS_COUNT, TASKS_COUNT)
+        cls.user = User.objects.get(username='seed0')
+        cls.task = Task.objects.filter(author=cls.user).first()
+        cls.status = Status.objects.first()
+        cls.label = Label.objects.first()
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def get_urls(self):
+        task = {'pk': self.task.pk}
+        status = {'pk': self.status.pk}
+        label = {'pk': self.label.pk}
+        user = {'pk': self.user.pk}
+        return {
+            'index': reverse('index'),
+            'tasks_index': reverse('tasks_index'),
+            'task_detail': reverse('task_detail', kwargs=task),
+            'task_create': reverse('task_create'),
+            'task_update': reverse('task_update', kwargs=task),
+            'task_delete': reverse('task_delete', kwargs=task),
+            'statuses_index': reverse('statuses_index'),
+            'status_create': reverse('status_create'),
+            'status_update': reverse('status_update', kwargs=status),
+            'status_delete': reverse('status_delete', kwargs=status),
+            'labels_index': reverse('labels_index'),
+            'label_create': reverse('label_create'),
+            'label_update': reverse('label_update', kwargs=label),
+            'label_delete': reverse('label_delete', kwargs=label),
+            'users_index': reverse('users_index'),
+            'user_create': reverse('user_create'),
+            'user_update': reverse('user_update', kwargs=user),
+            'user_delete': reverse('user_delete', kwargs=user),
+        }
+
+    def test_every_view_fits_its_budget(self):
+        """Тест бюджета запросов для каждой страницы"""
+        for name, url in self.get_urls().items():
+            with self.subTest(view=name):
+                # Budgets are for the steady state with warm caches
+                self.client.get(url)
+                with self.assertNumQueries(self.budgets[name]):
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+
+    def test_not_modified_fits_its_budget(self):
+        """Тест что ответ 304 не проверяет актуальность запросами"""
+        urls = self.get_urls()
+        for name, budget in self.not_modified_budgets.items():
+            with self.subTest(view=name):
+                # The first response also sets the CSRF cookie
+                self.client.get(urls[name])
+                etag = self.client.get(urls[name])['ETag']
+                with self.assertNumQueries(budget):
+                    response = self.client.get(
+                        urls[name],
+                        HTTP_IF_NONE_MATCH=etag
+                    )
+                self.assertEqual(response.status_code, 304)
+
+    def test_dashboard_rebuild_costs_two_queries(self):
+        """Тест что пересборка сводки стоит двух запросов"""
+        self.client.get(reverse('index'))
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_dashboards([self.user.pk])
+        with self.assertNumQueries(self.budgets['index'] + 2):
+            response = self.client.get(reverse('index'))
+        self.assertGreater(response.context['dashboard']['assigned'], 0)
+
+    def test_task_list_does_not_grow_with_page_size(self):
+        """Тест что метки задач загружаются одним запросом"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('tasks_index'))
+        tasks = response.context['tasks']
+        self.assertGreater(len(tasks), 1)
+        label_queries = [
+            query for query in queries.captured_queries
+            if 'tasks_task_labels' in query['sql']
+        ]
+        self.assertEqual(len(label_queries), 1)
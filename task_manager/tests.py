@@ -0,0 +1,697 @@
+import json
+import tempfile
+import threading
+from io import StringIO
+from pathlib import Path
+from unittest import mock, skipUnless
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    connection,
+    connections,
+    transaction,
+)
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.urls import reverse
+from django.views.generic import TemplateView
+
+from task_manager.autocomplete import AutocompleteView
+from task_manager.cache import (
+    check_shared,
+    get_cache,
+    get_stats,
+    parse_cache_url,
+)
+from task_manager.db import sqlite_options
+from task_manager.labels.models import Label
+from task_manager.middleware import (
+    ReplicaMiddleware,
+    ServerTimingMiddleware,
+    get_pool_stats,
+)
+from task_manager.mixins import AsyncViewMixin
+from task_manager.routers import REPLICA_DB_ALIAS, REPLICA_PIN_COOKIE
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task, TaskCounter
+
+User = get_user_model()
+
+
+class ParseCacheUrlTest(SimpleTestCase):
+    def test_locmem(self):
+        """Тест локального кеша в памяти"""
+        self.assertEqual(parse_cache_url('locmem://tasks'), {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'tasks',
+        })
+
+    def test_file(self):
+        """Тест файлового кеша"""
+        config = parse_cache_url('file:///var/tmp/cache?timeout=60')
+        self.assertEqual(
+            config['BACKEND'],
+            'django.core.cache.backends.filebased.FileBasedCache'
+        )
+        self.assertEqual(config['LOCATION'], '/var/tmp/cache')
+        self.assertEqual(config['TIMEOUT'], 60)
+
+    def test_database(self):
+        """Тест кеша в базе данных"""
+        config = parse_cache_url('db://cache_table?max_entries=500')
+        self.assertEqual(config['LOCATION'], 'cache_table')
+        self.assertEqual(config['OPTIONS'], {'MAX_ENTRIES': 500})
+
+    def test_redis(self):
+        """Тест Redis-совместимого кеша"""
+        config = parse_cache_url(
+            'redis://:secret@cache:6379/1?key_prefix=tm&timeout=none'
+        )
+        self.assertEqual(
+            config['BACKEND'],
+            'django.core.cache.backends.redis.RedisCache'
+        )
+        self.assertEqual(config['LOCATION'], 'redis://:secret@cache:6379/1')
+        self.assertEqual(config['KEY_PREFIX'], 'tm')
+        self.assertIsNone(config['TIMEOUT'])
+
+    def test_unknown_scheme(self):
+        """Тест неизвестной схемы"""
+        with self.assertRaises(ValueError):
+            parse_cache_url('memcached://localhost')
+
+    def test_locmem_refused_for_several_workers(self):
+        """Тест запрета локального кеша при нескольких процессах"""
+        locmem = parse_cache_url('locmem://tasks')
+        self.assertEqual(check_shared(locmem, 1), locmem)
+        with self.assertRaises(ImproperlyConfigured):
+            check_shared(locmem, 4)
+        shared = parse_cache_url('db://cache_table')
+        self.assertEqual(check_shared(shared, 4), shared)
+
+
+@override_settings(CACHE_STATS=True)
+class NamespacedCacheTest(SimpleTestCase):
+    def test_keys_are_namespaced(self):
+        """Тест что ключи разных приложений не пересекаются"""
+        get_cache('tasks').set('key', 'task value')
+        get_cache('labels').set('key', 'label value')
+        self.assertEqual(get_cache('tasks').get('key'), 'task value')
+        self.assertEqual(get_cache('labels').get('key'), 'label value')
+        self.assertEqual(cache.get('tasks:key'), 'task value')
+
+    def test_unknown_namespace(self):
+        """Тест неизвестного пространства имен"""
+        with self.assertRaises(ValueError):
+            get_cache('comments')
+
+    def test_hits_and_misses_are_counted(self):
+        """Тест подсчета попаданий и промахов"""
+        statuses = get_cache('statuses')
+        statuses.get('missing')
+        statuses.set('present', 1)
+        statuses.get('present')
+        statuses.get('present')
+        self.assertEqual(
+            get_stats()['statuses'], {'hits': 2, 'misses': 1}
+        )
+        self.assertEqual(get_stats()['users'], {'hits': 0, 'misses': 0})
+
+    def test_cache_stats_command(self):
+        """Тест команды cache_stats"""
+        get_cache('users').get('missing')
+        get_cache('users').set('present', 1)
+        get_cache('users').get('present')
+        out = StringIO()
+        call_command('cache_stats', '--reset', stdout=out)
+        self.assertIn('50.0%', out.getvalue())
+        self.assertEqual(get_stats()['users'], {'hits': 0, 'misses': 0})
+
+
+class ServerTimingMiddlewareTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='user',
+            password='password123'
+        )
+        self.client.force_login(self.user)
+
+    def test_server_timing_header(self):
+        """Тест заголовка Server-Timing"""
+        with self.assertLogs('task_manager.requests', 'INFO') as logs:
+            response = self.client.get(reverse('statuses_index'))
+        timing = response['Server-Timing']
+        for metric in ('db;', 'view;', 'render;', 'total;'):
+            self.assertIn(metric, timing)
+
+        record = logs.records[-1]
+        self.assertEqual(record.url_name, 'statuses_index')
+        self.assertEqual(record.status_code, 200)
+        self.assertIn(f'db;desc="{record.queries} queries"', timing)
+        self.assertGreater(record.queries, 0)
+
+    def test_async_capable(self):
+        """Тест что middleware не переводит асинхронную цепочку в поток"""
+        async def get_response(request):
+            pass
+
+        for middleware_class in (ServerTimingMiddleware, ReplicaMiddleware):
+            with self.subTest(middleware=middleware_class.__name__):
+                middleware = middleware_class(get_response)
+                self.assertTrue(iscoroutinefunction(middleware))
+                middleware = middleware_class(lambda request: None)
+                self.assertFalse(iscoroutinefunction(middleware))
+
+    @override_settings(ROOT_URLCONF='task_manager.urls_async')
+    async def test_async_server_timing(self):
+        """Тест заголовка Server-Timing асинхронной страницы"""
+        await self.async_client.aforce_login(self.user)
+        with self.assertLogs('task_manager.requests', 'INFO') as logs:
+            response = await self.async_client.get(reverse('statuses_index'))
+        record = logs.records[-1]
+        self.assertEqual(record.url_name, 'statuses_index')
+        self.assertGreater(record.queries, 0)
+        self.assertIn(
+            f'db;desc="{record.queries} queries"',
+            response['Server-Timing']
+        )
+
+    def test_pool_metrics(self):
+        """Тест метрик пула подключений"""
+        with mock.patch(
+            'task_manager.middleware.get_pool_stats',
+            side_effect=[(10, 100.0), (12, 112.5)]
+        ), self.assertLogs('task_manager.requests', 'INFO') as logs:
+            response = self.client.get(reverse('statuses_index'))
+        self.assertIn(
+            'pool;desc="2 checkouts";dur=12.5',
+            response['Server-Timing']
+        )
+        record = logs.records[-1]
+        self.assertEqual(record.pool_checkouts, 2)
+        self.assertEqual(record.pool_wait_ms, 12.5)
+
+    def test_no_pool_metrics_without_pool(self):
+        """Тест отсутствия метрик пула без пула подключений"""
+        if connection.vendor == 'postgresql' and connection.pool:
+            self.skipTest('The database connections are pooled')
+        response = self.client.get(reverse('statuses_index'))
+        self.assertNotIn('pool;', response['Server-Timing'])
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=None)
+    def test_slow_queries_disabled(self):
+        """Тест отключения журнала медленных запросов"""
+        with self.assertNoLogs('task_manager.sql'):
+            self.client.get(reverse('statuses_index'))
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+    def test_slow_queries_logged_with_origin(self):
+        """Тест журнала медленных запросов с местом вызова"""
+        with self.assertLogs('task_manager.sql', 'WARNING') as logs:
+            self.client.get(reverse('tasks_index'))
+        origins = [record.origin for record in logs.records]
+        self.assertTrue(
+            any(origin.startswith('pagination.py:') for origin in origins)
+        )
+        durations = [record.duration_ms for record in logs.records]
+        self.assertEqual(durations, sorted(durations, reverse=True))
+
+
+class AutocompleteViewTest(TestCase):
+    def test_no_search_by_default(self):
+        """Тест что базовое автодополнение не фильтрует объекты"""
+        Label.objects.create(name='bug')
+        view = AutocompleteView(model=Label)
+        queryset = view.get_queryset()
+        self.assertEqual(list(view.search(queryset, 'x')), list(queryset))
+
+
+class AsyncViewMixinTest(SimpleTestCase):
+    async def test_base_context_by_default(self):
+        """Тест контекста по умолчанию асинхронного представления"""
+        class AsyncPage(AsyncViewMixin, TemplateView):
+            template_name = 'index.html'
+
+            def get_context_data(self, **kwargs):
+                return super().get_context_data(answer=42, **kwargs)
+
+        request = RequestFactory().get('/')
+
+        async def auser():
+            return AnonymousUser()
+
+        request.auser = auser
+        response = await AsyncPage.as_view()(request)
+        self.assertEqual(response.context_data['answer'], 42)
+
+
+class SeedDataTest(TestCase):
+    def seed(self, **options):
+        call_command(
+            'seed_data',
+            users=5,
+            statuses=3,
+            labels=8,
+            tasks=60,
+            batch_size=25,
+            stdout=StringIO(),
+            **options
+        )
+        return [
+            (
+                task.name,
+                task.status.name,
+                task.author.username,
+                task.executor.username if task.executor else None,
+                sorted(label.name for label in task.labels.all()),
+            )
+            for task in Task.objects.order_by('id').select_related(
+                'status', 'author', 'executor'
+            ).prefetch_related('labels')
+        ]
+
+    def test_volumes(self):
+        """Тест объёмов сгенерированных данных"""
+        tasks = self.seed()
+        self.assertEqual(len(tasks), 60)
+        self.assertEqual(get_user_model().objects.count(), 5)
+        self.assertTrue(any(labels for *_fields, labels in tasks))
+        self.assertTrue(any(len(labels) > 1 for *_fields, labels in tasks))
+        call_command(
+            'rebuild_task_counters',
+            check=True,
+            stdout=StringIO(),
+            stderr=StringIO()
+        )
+
+    def test_same_seed_same_data(self):
+        """Тест детерминированности генерации"""
+        first = self.seed(seed=7)
+        Task.objects.all().delete()
+        self.assertEqual(self.seed(seed=7), first)
+        Task.objects.all().delete()
+        self.assertNotEqual(self.seed(seed=8), first)
+
+
+class BenchmarkViewsTest(TestCase):
+    def setUp(self):
+        call_command(
+            'seed_data',
+            users=3,
+            statuses=2,
+            labels=3,
+            tasks=20,
+            stdout=StringIO(),
+        )
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.baseline = Path(directory.name) / 'baseline.json'
+
+    def benchmark(self, **options):
+        stdout = StringIO()
+        call_command(
+            'benchmark_views',
+            repeat=1,
+            warmup=1,
+            baseline=self.baseline,
+            stdout=stdout,
+            stderr=StringIO(),
+            **options
+        )
+        return stdout.getvalue()
+
+    def test_report_and_baseline(self):
+        """Тест отчёта и сохранения базовой линии"""
+        output = self.benchmark(save_baseline=True)
+        for name in ('tasks_index', 'task_detail', 'users_index', 'login'):
+            self.assertIn(name, output)
+        report = json.loads(self.baseline.read_text())
+        self.assertEqual(report['dataset']['tasks'], 20)
+        self.assertEqual(report['views']['tasks_index']['status'], 200)
+        self.assertGreater(report['views']['tasks_index']['queries'], 0)
+
+        output = self.benchmark(tolerance=1000)
+        self.assertIn('No regressions', output)
+
+    def test_query_regression(self):
+        """Тест обнаружения роста числа запросов"""
+        self.benchmark(save_baseline=True)
+        report = json.loads(self.baseline.read_text())
+        report['views']['tasks_index']['queries'] = 1
+        self.baseline.write_text(json.dumps(report))
+        with self.assertRaises(CommandError):
+            self.benchmark(tolerance=1000)
+
+
+class BenchmarkAsyncTest(TransactionTestCase):
+    def setUp(self):
+        call_command(
+            'seed_data',
+            users=3,
+            statuses=2,
+            labels=3,
+            tasks=20,
+            stdout=StringIO(),
+        )
+
+    def test_report(self):
+        """Тест сравнения синхронных и асинхронных страниц"""
+        stdout = StringIO()
+        call_command(
+            'benchmark_async',
+            requests=4,
+            workers=2,
+            concurrency=2,
+            delay_ms=0,
+            stdout=stdout,
+        )
+        rows = [line.split() for line in stdout.getvalue().splitlines()[1:]]
+        self.assertEqual(len(rows), 8)
+        for name, mode, _rate, _p50, _p95, errors in rows:
+            with self.subTest(view=name, mode=mode):
+                self.assertEqual(errors, '0')
+
+    def test_missing_user(self):
+        """Тест ошибки для несуществующего пользователя"""
+        with self.assertRaises(CommandError):
+            call_command('benchmark_async', username='nobody')
+
+
+class SqliteTuningTest(SimpleTestCase):
+    alias = 'tuned'
+    databases = {alias}
+    writers = 4
+    readers = 4
+    batches = 20
+    batch_size = 5
+
+    @classmethod
+    def setUpClass(cls):
+        directory = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(directory.cleanup)
+        # A file database of its own: the in-memory test database cannot
+        # use WAL, and thread-local connections each see their own file
+        connections.settings[cls.alias] = {
+            **connections[DEFAULT_DB_ALIAS].settings_dict,
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': str(Path(directory.name) / 'db.sqlite3'),
+            'OPTIONS': sqlite_options(),
+        }
+        cls.addClassCleanup(connections.settings.pop, cls.alias)
+        super().setUpClass()
+        cls.addClassCleanup(cls.close_connection)
+        with connections[cls.alias].schema_editor() as editor:
+            for model in (User, Status, Label, Task):
+                editor.create_model(model)
+        cls.user = User.objects.using(cls.alias).create(username='user')
+        cls.status = Status.objects.using(cls.alias).create(name='New')
+
+    @classmethod
+    def close_connection(cls):
+        connections[cls.alias].close()
+
+    def pragma(self, name):
+        with connections[self.alias].cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_pragmas(self):
+        """Тест настроек SQLite для нового подключения"""
+        self.assertEqual(self.pragma('journal_mode'), 'wal')
+        self.assertEqual(self.pragma('synchronous'), 1)
+        self.assertEqual(self.pragma('busy_timeout'), 5000)
+        self.assertEqual(self.pragma('cache_size'), -20000)
+        self.assertEqual(self.pragma('temp_store'), 2)
+        self.assertEqual(
+            connections[self.alias].transaction_mode,
+            'IMMEDIATE'
+        )
+
+    def run_in_thread(self, target, errors):
+        def run():
+            try:
+                target()
+            except Exception as error:
+                errors.append(error)
+            finally:
+                self.close_connection()
+        return threading.Thread(target=run)
+
+    # bulk_create and update() keep the signal handlers, which write to
+    # the default database, out of the way
+    def write_tasks(self):
+        tasks = Task.objects.using(self.alias)
+        for _ in range(self.batches):
+            with transaction.atomic(using=self.alias):
+                # Read first, then write: the write lock is already held
+                count = tasks.count()
+                created = tasks.bulk_create([
+                    Task(
+                        name=f'Task {count + index}',
+                        status=self.status,
+                        author=self.user,
+                    )
+                    for index in range(self.batch_size)
+                ])
+                tasks.filter(pk=created[0].pk).update(description='Done')
+
+    def read_tasks(self, writing):
+        tasks = Task.objects.using(self.alias)
+        while writing.is_set():
+            list(tasks.select_related('status', 'author')[:50])
+            tasks.filter(description='Done').count()
+
+    def test_parallel_writers_and_readers(self):
+        """Тест параллельной записи и чтения задач без блокировок"""
+        errors = []
+        writing = threading.Event()
+        writing.set()
+        writers = [
+            self.run_in_thread(self.write_tasks, errors)
+            for _ in range(self.writers)
+        ]
+        readers = [
+            self.run_in_thread(lambda: self.read_tasks(writing), errors)
+            for _ in range(self.readers)
+        ]
+        for worker in writers + readers:
+            worker.start()
+        for worker in writers:
+            worker.join()
+        writing.clear()
+        for worker in readers:
+            worker.join()
+
+        self.assertEqual(errors, [])
+        tasks = Task.objects.using(self.alias)
+        self.assertEqual(
+            tasks.count(),
+            self.writers * self.batches * self.batch_size
+        )
+        self.assertEqual(
+            tasks.filter(description='Done').count(),
+            self.writers * self.batches
+        )
+
+
+@skipUnless(
+    connection.vendor == 'postgresql',
+    'Needs DATABASE_URL pointing to PostgreSQL'
+)
+class PostgresqlConnectionTest(TransactionTestCase):
+    def test_health_checks(self):
+        """Тест проверки подключений перед использованием"""
+        if not settings.DATABASE_POOL:
+            self.assertTrue(connection.settings_dict['CONN_HEALTH_CHECKS'])
+            return
+        from psycopg_pool import ConnectionPool
+
+        self.assertEqual(
+            connection.settings_dict['OPTIONS']['pool']['check'],
+            ConnectionPool.check_connection
+        )
+
+    @skipUnless(
+        settings.DATABASE_STATEMENT_TIMEOUT_MS,
+        'Needs DATABASE_STATEMENT_TIMEOUT_MS'
+    )
+    def test_statement_timeout(self):
+        """Тест ограничения времени выполнения запроса"""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT setting::int FROM pg_settings "
+                "WHERE name = 'statement_timeout'"
+            )
+            self.assertEqual(
+                cursor.fetchone()[0],
+                settings.DATABASE_STATEMENT_TIMEOUT_MS
+            )
+
+    @skipUnless(settings.DATABASE_POOL, 'Needs DATABASE_POOL=True')
+    def test_pool(self):
+        """Тест пула подключений и его метрик"""
+        pool = connection.pool
+        self.assertEqual(pool.min_size, settings.DATABASE_POOL_MIN_SIZE)
+        self.assertEqual(pool.max_size, settings.DATABASE_POOL_MAX_SIZE)
+        checkouts, _wait_ms = get_pool_stats()
+        # Each request takes a connection from the pool and gives it back
+        connection.close()
+        response = self.client.get(reverse('users_index'))
+        self.assertIn('pool;desc="', response['Server-Timing'])
+        self.assertGreater(get_pool_stats()[0], checkouts)
+
+    @skipUnless(settings.DATABASE_POOL, 'Needs DATABASE_POOL=True')
+    def test_pool_replaces_broken_connections(self):
+        """Тест замены разорванных подключений пула"""
+        # Drop the other pooled connections server-side, as a restart would
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT pg_terminate_backend(pid) FROM pg_stat_activity '
+                'WHERE datname = current_database() '
+                'AND pid <> pg_backend_pid()'
+            )
+        connection.close()
+        for _ in range(settings.DATABASE_POOL_MAX_SIZE):
+            response = self.client.get(reverse('users_index'))
+            self.assertEqual(response.status_code, 200)
+
+
+class ReplicaRoutingTest(TestCase):
+    databases = {DEFAULT_DB_ALIAS, REPLICA_DB_ALIAS}
+
+    @classmethod
+    def setUpClass(cls):
+        directory = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(directory.cleanup)
+        # A database of its own, so the test tells which one a page read
+        connections.settings[REPLICA_DB_ALIAS] = {
+            **connections[DEFAULT_DB_ALIAS].settings_dict,
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': str(Path(directory.name) / 'replica.sqlite3'),
+            'OPTIONS': {},
+        }
+        cls.addClassCleanup(connections.settings.pop, REPLICA_DB_ALIAS)
+        with connections[REPLICA_DB_ALIAS].schema_editor() as editor:
+            for model in (User, Status, Label, Task, TaskCounter):
+                editor.create_model(model)
+        cls.addClassCleanup(connections[REPLICA_DB_ALIAS].close)
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='user1',
+            password='password123'
+        )
+        cls.status = Status.objects.create(name='Primary status')
+        cls.task = Task.objects.create(
+            name='Primary task',
+            status=cls.status,
+            author=cls.user
+        )
+        # The replica has the user, but lags behind on the rest
+        replica = REPLICA_DB_ALIAS
+        User.objects.using(replica).bulk_create([
+            User(pk=cls.user.pk, username='user1', password=cls.user.password)
+        ])
+        Status.objects.using(replica).bulk_create([
+            Status(pk=cls.status.pk, name='Replica status')
+        ])
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_list_reads_from_replica(self):
+        """Тест чтения списка статусов с реплики"""
+        response = self.client.get(reverse('statuses_index'))
+        self.assertContains(response, 'Replica status')
+        self.assertNotContains(response, 'Primary status')
+
+    def test_detail_reads_from_replica(self):
+        """Тест ошибки 404 для задачи, которой еще нет на реплике"""
+        response = self.client.get(
+            reverse('task_detail', kwargs={'pk': self.task.pk})
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_filter_choices_read_from_replica(self):
+        """Тест чтения вариантов фильтра с реплики"""
+        response = self.client.get(reverse('tasks_index'))
+        self.assertContains(response, 'Replica status')
+        self.assertNotContains(response, 'Primary task')
+        self.client.cookies[REPLICA_PIN_COOKIE] = '1'
+        response = self.client.get(reverse('tasks_index'))
+        self.assertContains(response, 'Primary status')
+        self.assertContains(response, 'Primary task')
+
+    def test_own_write_reads_from_primary(self):
+        """Тест чтения с основной базы после своей записи"""
+        response = self.client.post(
+            reverse('status_create'),
+            {'name': 'New status'}
+        )
+        self.assertEqual(
+            response.cookies[REPLICA_PIN_COOKIE]['max-age'],
+            settings.REPLICA_PIN_SECONDS
+        )
+        self.assertTrue(Status.objects.filter(name='New status').exists())
+        self.assertFalse(
+            Status.objects.using(REPLICA_DB_ALIAS)
+            .filter(name='New status').exists()
+        )
+        response = self.client.get(reverse('statuses_index'))
+        self.assertContains(response, 'New status')
+        self.assertContains(response, 'Primary status')
+
+    def test_lagging_replica_gets_no_etag(self):
+        """Тест что страница с отстающей реплики не получает ETag"""
+        etag = self.client.get(reverse('statuses_index'))['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Status.objects.create(name='Newer status')
+
+        response = self.client.get(
+            reverse('statuses_index'), HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, 'Newer status')
+        self.assertFalse(response.has_header('ETag'))
+
+        # The replica catches up: nothing pins the page it read before
+        Status.objects.using(REPLICA_DB_ALIAS).bulk_create([
+            Status(name='Newer status')
+        ])
+        response = self.client.get(reverse('statuses_index'))
+        self.assertContains(response, 'Newer status')
+
+        # The primary serves the versions it bumped itself
+        self.client.cookies[REPLICA_PIN_COOKIE] = '1'
+        self.assertTrue(
+            self.client.get(reverse('statuses_index')).has_header('ETag')
+        )
+
+    def test_other_views_read_from_primary(self):
+        """Тест чтения с основной базы на остальных страницах"""
+        response = self.client.get(
+            reverse('task_update', kwargs={'pk': self.task.pk})
+        )
+        self.assertContains(response, 'Primary task')
+
+    @override_settings(ROOT_URLCONF='task_manager.urls_async')
+    async def test_async_view_reads_from_replica(self):
+        """Тест чтения асинхронного списка статусов с реплики"""
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse('statuses_index'))
+        self.assertContains(response, 'Replica status')
+        self.assertNotContains(response, 'Primary status')
@@ -0,0 +1,27 @@
+"""
+URL configuration of the ASGI application, see asgi.py.
+
+The read-heavy pages are served by async views on Django's async ORM and
+match before the sync patterns of task_manager.urls, which handle the
+rest of the site.
+"""
+from django.urls import path
+
+from task_manager import urls
+from task_manager.labels.views import AsyncLabelListView
+from task_manager.statuses.views import AsyncStatusListView
+from task_manager.tasks.views import AsyncTaskDetailView, AsyncTaskListView
+from task_manager.users.views import AsyncUsersIndexView
+
+urlpatterns = [
+    path('tasks/', AsyncTaskListView.as_view(), name='tasks_index'),
+    path(
+        'tasks/<int:pk>/',
+        AsyncTaskDetailView.as_view(),
+        name='task_detail'
+        ),
+    path('statuses/', AsyncStatusListView.as_view(), name='statuses_index'),
+    path('labels/', AsyncLabelListView.as_view(), name='labels_index'),
+    path('users/', AsyncUsersIndexView.as_view(), name='users_index'),
+    *urls.urlpatterns,
+]
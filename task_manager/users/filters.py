@@ -0,0 +1,27 @@
+import django_filters
+from django import forms
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+
+from task_manager.users.search import search_users
+
+User = get_user_model()
+
+
+class UserFilter(django_filters.FilterSet):
+    search = django_filters.CharFilter(
+        method='filter_search',
+        label=_('Search'),
+        widget=forms.TextInput(attrs={
+            'class': 'form-control',
+            'type': 'search',
+            'placeholder': _('Username or full name'),
+        })
+    )
+
+    class Meta:
+        model = User
+        fields = []
+
+    def filter_search(self, queryset, name, value):
+        return search_users(queryset, value)
@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils.translation import gettext_lazy as _
 
 
@@ -14,7 +15,22 @@ class User(AbstractUser):
         blank=False,
         verbose_name=_('Last Name')
     )
+    updated_at = models.DateTimeField(
+        _('Updated at'),
+        auto_now=True
+    )
     USERNAME_FIELD = 'username'
 
     def __str__(self):
-        return f'{self.first_name} {self.last_name}'
\ No newline at end of file
+        return f'{self.first_name} {self.last_name}'
+
+    class Meta(AbstractUser.Meta):
+        # Case-insensitive prefix search, see task_manager.autocomplete
+        indexes = [
+            models.Index(Lower('username'), name='user_username_lower_idx'),
+            models.Index(
+                Lower('first_name'),
+                name='user_first_name_lower_idx'
+            ),
+            models.Index(Lower('last_name'), name='user_last_name_lower_idx'),
+        ]
@@ -0,0 +1,26 @@
+from task_manager.autocomplete import MAX_TERM_LENGTH, prefix_q, with_lower
+
+SEARCH_FIELDS = ('username', 'first_name', 'last_name')
+
+
+def search_users(users, term):
+    """
+    Users whose username, first or last name starts with ``term``, or,
+    for a term with spaces, whose first name starts with its first word
+    and last name with the rest. Case-insensitive, each condition a
+    range of an index on LOWER() of its column.
+    """
+    term = term.strip()[:MAX_TERM_LENGTH]
+    if not term:
+        return users
+    users = with_lower(users, *SEARCH_FIELDS)
+    first, _space, rest = term.partition(' ')
+    rest = rest.strip()
+    if rest:
+        return users.filter(
+            prefix_q('first_name', first) & prefix_q('last_name', rest)
+        )
+    condition = prefix_q(SEARCH_FIELDS[0], term)
+    for field in SEARCH_FIELDS[1:]:
+        condition |= prefix_q(field, term)
+    return users.filter(condition)
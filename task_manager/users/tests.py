@@ -1,7 +1,7 @@
 import pytest
 from django.contrib.auth import get_user_model
 from django.contrib.messages import get_messages
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
 from task_manager.statuses.models import Status
@@ -85,4 +85,183 @@ class UserCRUDTests(TestCase):
         self.client.login(username='user1', password='testpass123')  # NOSONAR
         self.client.post(reverse('user_delete', args=[self.user1.pk]))
 
-        self.assertTrue(User.objects.filter(pk=self.user1.pk).exists())
\ No newline at end of file
+        self.assertTrue(User.objects.filter(pk=self.user1.pk).exists())
+
+
+class UserAutocompleteTest(TestCase):
+    def setUp(self):
+        names = [
+            ('jdoe', 'John', 'Doe'),
+            ('jsmith', 'Jane', 'Smith'),
+            ('bob', 'Robert', 'Johnson'),
+            ('alice', 'Alice', 'Brown'),
+        ]
+        self.users = {
+            username: User.objects.create_user(
+                username=username,
+                first_name=first_name,
+                last_name=last_name
+            )
+            for username, first_name, last_name in names
+        }
+        self.client.force_login(self.users['alice'])
+
+    def autocomplete(self, **params):
+        response = self.client.get(reverse('users_autocomplete'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def get_usernames(self, data):
+        usernames = dict(User.objects.values_list('pk', 'username'))
+        return [usernames[result['id']] for result in data['results']]
+
+    def test_prefix_of_username_or_name_ignores_case(self):
+        """Тест поиска по началу логина, имени или фамилии"""
+        data = self.autocomplete(q='JO')
+        self.assertEqual(self.get_usernames(data), ['bob', 'jdoe'])
+        self.assertEqual(data['results'][1]['text'], 'John Doe')
+        self.assertFalse(data['more'])
+
+        self.assertEqual(self.get_usernames(self.autocomplete(q='js')), [
+            'jsmith'
+        ])
+        self.assertEqual(self.get_usernames(self.autocomplete(q='oh')), [])
+
+    def test_full_name(self):
+        """Тест поиска по имени и началу фамилии"""
+        data = self.autocomplete(q='jane sm')
+        self.assertEqual(self.get_usernames(data), ['jsmith'])
+        self.assertEqual(self.get_usernames(self.autocomplete(q='jane d')), [])
+
+    def test_results_are_bounded(self):
+        """Тест ограничения числа результатов"""
+        User.objects.bulk_create([
+            User(username=f'user{index:02}', first_name='U', last_name='U')
+            for index in range(25)
+        ])
+        data = self.autocomplete(q='user')
+        self.assertEqual(len(data['results']), 20)
+        self.assertTrue(data['more'])
+
+        data = self.autocomplete()
+        self.assertEqual(len(data['results']), 20)
+        self.assertEqual(self.get_usernames(data)[:4], [
+            'alice', 'bob', 'jdoe', 'jsmith'
+        ])
+
+    def test_requires_login(self):
+        """Тест что автодополнение требует входа"""
+        self.client.logout()
+        response = self.client.get(reverse('users_autocomplete'))
+        self.assertEqual(response.status_code, 302)
+
+
+class UsersIndexTest(TestCase):
+    def setUp(self):
+        User.objects.bulk_create([
+            User(
+                username=f'user{index:02}',
+                first_name=f'First{index:02}',
+                last_name='Last'
+            )
+            for index in range(60)
+        ])
+        self.author = User.objects.create_user(
+            username='author',
+            first_name='Ann',
+            last_name='Writer'
+        )
+        self.executor = User.objects.get(username='user00')
+        status = Status.objects.create(name='New')
+        for index in range(3):
+            Task.objects.create(
+                name=f'Task {index}',
+                status=status,
+                author=self.author,
+                executor=self.executor if index else None
+            )
+
+    def get_usernames(self, response):
+        return [user.username for user in response.context['users']]
+
+    def test_pages_follow_cursors(self):
+        """Тест постраничного вывода пользователей"""
+        response = self.client.get(reverse('users_index'))
+        first = self.get_usernames(response)
+        self.assertEqual(len(first), 50)
+        cursor = response.context['page_obj'].next_cursor
+        response = self.client.get(reverse('users_index'), {'after': cursor})
+        second = self.get_usernames(response)
+        self.assertEqual(len(second), 11)
+        self.assertFalse(set(first) & set(second))
+        self.assertFalse(response.context['page_obj'].has_next())
+
+    def test_search_by_username_and_full_name(self):
+        """Тест поиска по логину и полному имени"""
+        response = self.client.get(
+            reverse('users_index'), {'search': 'USER0'}
+        )
+        self.assertEqual(len(self.get_usernames(response)), 10)
+
+        response = self.client.get(
+            reverse('users_index'), {'search': 'ann wr'}
+        )
+        self.assertEqual(self.get_usernames(response), ['author'])
+
+        response = self.client.get(
+            reverse('users_index'), {'search': 'nobody'}
+        )
+        self.assertEqual(self.get_usernames(response), [])
+
+    def test_task_counts(self):
+        """Тест числа созданных и назначенных задач"""
+        response = self.client.get(
+            reverse('users_index'), {'search': 'a'}
+        )
+        counts = {
+            user.username: (user.authored_count, user.assigned_count)
+            for user in response.context['users']
+        }
+        self.assertEqual(counts, {'author': (3, 0)})
+        response = self.client.get(
+            reverse('users_index'), {'search': 'user00'}
+        )
+        user = response.context['users'][0]
+        self.assertEqual((user.authored_count, user.assigned_count), (0, 2))
+
+    def test_page_costs_one_query(self):
+        """Тест что страница стоит одного запроса при любом числе данных"""
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('users_index'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'First00 Last')
+
+    def test_etag_follows_task_counts(self):
+        """Тест что ETag меняется вместе с числом задач"""
+        # The first response sets the CSRF cookie that forms depend on
+        self.client.get(reverse('users_index'))
+        etag = self.client.get(reverse('users_index'))['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                reverse('users_index'), HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(
+                name='Task', status=Status.objects.get(), author=self.author
+            )
+        response = self.client.get(
+            reverse('users_index'), HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(ROOT_URLCONF='task_manager.urls_async')
+    async def test_async_search(self):
+        """Тест асинхронного списка пользователей с поиском"""
+        response = await self.async_client.get(
+            reverse('users_index'), {'search': 'ann'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_usernames(response), ['author'])
+        self.assertEqual(response.context['users'][0].authored_count, 3)
+        self.assertIn('filter', response.context)
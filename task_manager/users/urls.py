@@ -5,6 +5,11 @@ from task_manager.users import views
 urlpatterns = [
     path('', views.UsersIndexView.as_view(), name='users_index'),
     path('create/', views.UserCreateView.as_view(), name='user_create'),
+    path(
+        'autocomplete/',
+        views.UserAutocompleteView.as_view(),
+        name='users_autocomplete'
+        ),
     path(
         '<int:pk>/update/',
         views.UserUpdateView.as_view(),
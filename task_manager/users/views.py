@@ -3,23 +3,84 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib.messages.views import SuccessMessageMixin
 from django.db.models import ProtectedError
+from django.db.models.functions import Lower
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
-from django.views.generic import CreateView, DeleteView, ListView, UpdateView
-
+from django.views.generic import CreateView, DeleteView, UpdateView
+from django_filters.views import FilterView
+
+from task_manager.autocomplete import AutocompleteView
+from task_manager.mixins import (
+    AsyncListMixin,
+    ConditionalGetMixin,
+    ObjectCacheMixin,
+)
+from task_manager.pagination import KeysetPaginationMixin
+from task_manager.tasks.counters import annotate_count
+from task_manager.tasks.models import Task, TaskCounter
+from task_manager.users.filters import UserFilter
 from task_manager.users.forms import (
     UserRegistrationForm,
     UserUpdateForm,
 )
+from task_manager.users.search import search_users
 
 User = get_user_model()
 
 
-class UsersIndexView(ListView):
+class UsersIndexView(ConditionalGetMixin, KeysetPaginationMixin, FilterView):
     model = User
+    filterset_class = UserFilter
     template_name = 'users/index.html'
     context_object_name = 'users'
+    keyset_ordering = ['id']
+    use_replica = True
+    # The task counts shown change with the tasks
+    freshness_models = (User, Task)
+
+    def get_queryset(self):
+        return User.objects.only(
+            'username', 'first_name', 'last_name', 'date_joined'
+        )
+
+    def get_filterset_kwargs(self, filterset_class):
+        kwargs = super().get_filterset_kwargs(filterset_class)
+        if kwargs['data'] is None:
+            kwargs['data'] = {}
+        return kwargs
+
+    def get_keyset_paginator(self, queryset, page_size):
+        # Counted for the rows of the page only
+        queryset = annotate_count(
+            queryset, TaskCounter.AUTHOR, 'authored_count'
+        )
+        queryset = annotate_count(
+            queryset, TaskCounter.EXECUTOR, 'assigned_count'
+        )
+        return super().get_keyset_paginator(queryset, page_size)
+
+
+class AsyncUsersIndexView(AsyncListMixin, UsersIndexView):
+    def get_object_list(self):
+        self.filterset = self.get_filterset(self.get_filterset_class())
+        if not self.filterset.is_valid():
+            return self.filterset.queryset.none()
+        return self.filterset.qs
+
+    def get_context_data(self, **kwargs):
+        return super().get_context_data(filter=self.filterset, **kwargs)
+
+
+class UserAutocompleteView(AutocompleteView):
+    model = User
+    ordering = [Lower('username')]
+
+    def get_queryset(self):
+        return super().get_queryset().only('first_name', 'last_name')
+
+    def search(self, queryset, term):
+        return search_users(queryset, term)
 
 
 class UserCreateView(SuccessMessageMixin, CreateView):
@@ -33,6 +94,7 @@ class UserUpdateView(
     LoginRequiredMixin,
     UserPassesTestMixin,
     SuccessMessageMixin,
+    ObjectCacheMixin,
     UpdateView
     ):
     model = User
@@ -40,9 +102,10 @@ class UserUpdateView(
     template_name = 'users/update.html'
     success_url = reverse_lazy('users_index')
     success_message = _('User updated successfully')
+    owner_field = 'pk'
 
     def test_func(self):
-        return self.request.user == self.get_object()
+        return self.get_object().is_owner
 
     def handle_no_permission(self):
         if not self.request.user.is_authenticated:
@@ -62,15 +125,17 @@ class UserDeleteView(
     LoginRequiredMixin,
     UserPassesTestMixin,
     SuccessMessageMixin,
+    ObjectCacheMixin,
     DeleteView
     ):
     model = User
     template_name = 'users/delete.html'
     success_url = reverse_lazy('users_index')
     success_message = _('User deleted successfully')
+    owner_field = 'pk'
 
     def test_func(self):
-        return self.request.user == self.get_object()
+        return self.get_object().is_owner
     
     def handle_no_permission(self):
         if not self.request.user.is_authenticated:
@@ -8,10 +8,18 @@ from django.utils.translation import gettext_lazy as _
 from django.views import View
 from django.views.generic import TemplateView
 
+from task_manager.tasks.dashboard import get_dashboard
+
 
 class IndexView(TemplateView):
     template_name = 'index.html'
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if self.request.user.is_authenticated:
+            context['dashboard'] = get_dashboard(self.request.user)
+        return context
+
 
 class LoginView(View):
     def get(self, request, *args, **kwargs):